@@ -0,0 +1,42 @@
+from typing import Any
+
+from pymongo import AsyncMongoClient
+
+from config import DATABASE_NAME, MONGODB_MAX_POOL_SIZE, MONGODB_MIN_POOL_SIZE, MONGODB_URI
+
+
+_asyncClient: AsyncMongoClient | None = None
+
+
+def getAsyncClient() -> AsyncMongoClient:
+    global _asyncClient
+    if _asyncClient is None:
+        _asyncClient = AsyncMongoClient(
+            MONGODB_URI,
+            maxPoolSize=MONGODB_MAX_POOL_SIZE,
+            minPoolSize=MONGODB_MIN_POOL_SIZE,
+        )
+    return _asyncClient
+
+
+async def connectAsyncClient() -> AsyncMongoClient:
+    client = getAsyncClient()
+    await client.aconnect()
+    return client
+
+
+async def closeAsyncClient() -> None:
+    global _asyncClient
+    if _asyncClient is not None:
+        await _asyncClient.close()
+        _asyncClient = None
+
+
+def getAsyncDatabase() -> Any:
+    client = getAsyncClient()
+    return client[DATABASE_NAME]
+
+
+async def getDataVersion() -> int:
+    doc = await getAsyncDatabase().meta.find_one({"_id": "dataVersion"})
+    return int(doc["version"]) if doc else 0
@@ -0,0 +1,99 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional
+
+
+@dataclass
+class CacheEntry:
+    body: bytes
+    etag: str
+    expiresAt: float
+
+
+def buildCacheKey(endpoint: str, params: Mapping[str, Any]) -> str:
+    """Key an entry by endpoint plus its normalized, sorted query parameters."""
+    parts = [f"{name}={params[name]}" for name in sorted(params) if params[name] is not None]
+    return f"{endpoint}?{'&'.join(parts)}"
+
+
+def snapToTile(value: float, tileDeg: float) -> float:
+    """Snap a coordinate to a geo tile so nearby queries share one entry."""
+    if tileDeg <= 0:
+        return value
+    return round(round(value / tileDeg) * tileDeg, 10)
+
+
+class ResponseCache:
+    """Bounded LRU cache of serialized responses with a per-entry TTL.
+
+    Entries hold the encoded body and its ETag so hits skip both the query
+    and the serialization. Hit, miss, eviction and expiration counters are
+    kept for sizing.
+    """
+
+    def __init__(self, maxEntries: int, ttlSeconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.maxEntries = max(1, int(maxEntries))
+        self.ttlSeconds = float(ttlSeconds)
+        self._clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expiresAt <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key: str, body: bytes) -> CacheEntry:
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        entry = CacheEntry(body=body, etag=etag, expiresAt=self._clock() + self.ttlSeconds)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxEntries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def invalidate(self, prefix: Optional[str] = None) -> int:
+        """Drop every entry, or only those whose key starts with ``prefix``."""
+        if prefix is None:
+            removed = len(self._entries)
+            self._entries.clear()
+        else:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            removed = len(keys)
+        self.invalidations += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxEntries": self.maxEntries,
+            "ttlSeconds": self.ttlSeconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,73 @@
+"""Fail when importing the backend app gets slower than a budget.
+
+Runs ``python -X importtime -c "import main"`` in a fresh interpreter a few
+times, takes the fastest cumulative time for ``main`` and compares it with
+IMPORT_TIME_BUDGET_MS. The heaviest imports are printed to help track down a
+regression.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1000"))
+IMPORT_TIME_RUNS = int(os.getenv("IMPORT_TIME_RUNS", "3"))
+
+# Heavy libraries the serving path must not import at startup.
+FORBIDDEN_MODULES = ("matplotlib", "pandas", "sklearn", "joblib")
+
+_linePattern = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def measureImportTime(module: str = "main") -> Tuple[float, Dict[str, float]]:
+    """Return (cumulative ms for ``module``, cumulative ms per top-level import)."""
+    backendDir = Path(__file__).resolve().parent
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=backendDir,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    totals: Dict[str, float] = {}
+    moduleMs = 0.0
+    for line in completed.stderr.splitlines():
+        match = _linePattern.match(line)
+        if not match:
+            continue
+        cumulativeUs, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        totals[name] = cumulativeUs / 1000.0
+        if name == module and len(indent) == 1:
+            moduleMs = cumulativeUs / 1000.0
+    return moduleMs, totals
+
+
+def main() -> None:
+    runs: List[float] = []
+    totals: Dict[str, float] = {}
+    for _ in range(IMPORT_TIME_RUNS):
+        moduleMs, totals = measureImportTime()
+        runs.append(moduleMs)
+    best = min(runs)
+
+    print(f"backend import time: best {best:.1f} ms over {len(runs)} runs (budget {IMPORT_TIME_BUDGET_MS:.0f} ms)")
+    print("heaviest imports (cumulative ms):")
+    for name, value in sorted(totals.items(), key=lambda item: item[1], reverse=True)[:10]:
+        print(f"  {value:8.1f}  {name}")
+
+    loaded = sorted(name for name in totals if name.split(".")[0] in FORBIDDEN_MODULES)
+    if loaded:
+        print(f"[FAIL] heavy modules imported at startup: {', '.join(loaded[:10])}")
+        sys.exit(1)
+    if best > IMPORT_TIME_BUDGET_MS:
+        print("[FAIL] backend import time is over budget")
+        sys.exit(1)
+    print("[OK] backend import time within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,29 @@
 import os
+from pathlib import Path
 
 
 MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
 DATABASE_NAME = os.getenv("MONGODB_DB", "safe-zone")
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "1000"))
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "1000"))
+DEFAULT_NEARBY_RADIUS_METERS = float(os.getenv("DEFAULT_NEARBY_RADIUS_METERS", "2000"))
+MAX_NEARBY_RADIUS_METERS = float(os.getenv("MAX_NEARBY_RADIUS_METERS", "50000"))
+CLEAN_DATA_DIR = Path(
+    os.getenv("CLEAN_DATA_DIR", str(Path(__file__).resolve().parents[1] / "data-engineering" / "clean-data"))
+)
+SPATIAL_INDEX_CELL_DEG = float(os.getenv("SPATIAL_INDEX_CELL_DEG", "0.01"))
+SPATIAL_INDEX_REFRESH_SECONDS = float(os.getenv("SPATIAL_INDEX_REFRESH_SECONDS", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "300"))
+CACHE_VERSION_CHECK_SECONDS = float(os.getenv("CACHE_VERSION_CHECK_SECONDS", "5"))
+# POST /cache/invalidate requires this value in X-Admin-Token; unset disables the route.
+CACHE_ADMIN_TOKEN = os.getenv("CACHE_ADMIN_TOKEN", "")
+NEARBY_CACHE_TILE_DEG = float(os.getenv("NEARBY_CACHE_TILE_DEG", "0.0001"))
+READINESS_TIMEOUT_SECONDS = float(os.getenv("READINESS_TIMEOUT_SECONDS", "2"))
+HEATMAP_MAX_ZOOM = int(os.getenv("HEATMAP_MAX_ZOOM", "16"))
+HEATMAP_TILE_SIZE = int(os.getenv("HEATMAP_TILE_SIZE", "32"))
+ROUTE_RISK_WEIGHT = float(os.getenv("ROUTE_RISK_WEIGHT", "2.0"))
+ROUTE_MAX_ALTERNATIVES = int(os.getenv("ROUTE_MAX_ALTERNATIVES", "5"))
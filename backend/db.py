@@ -18,3 +18,15 @@ def getClient() -> MongoClient:
 def getDatabase() -> Any:
     client = getClient()
     return client[DATABASE_NAME]
+
+
+def bumpDataVersion(client: MongoClient) -> int:
+    """Record that collection data changed so backend caches drop stale entries."""
+    meta = client[DATABASE_NAME].meta
+    doc = meta.find_one_and_update(
+        {"_id": "dataVersion"},
+        {"$inc": {"version": 1}},
+        upsert=True,
+        return_document=True,
+    )
+    return int(doc["version"])
@@ -0,0 +1,70 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def toGeoJsonPoint(location: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a ``{lat, lng}`` location into a GeoJSON Point.
+
+    GeoJSON points are what the 2dsphere indexes on ``location`` expect.
+    Values that are already GeoJSON are returned unchanged.
+    """
+    if location.get("type") == "Point":
+        return location
+    return {
+        "type": "Point",
+        "coordinates": [float(location["lng"]), float(location["lat"])],
+    }
+
+
+def toLatLng(location: Dict[str, Any]) -> Dict[str, float]:
+    """Read either a GeoJSON Point or a legacy ``{lat, lng}`` object."""
+    if location.get("type") == "Point":
+        lng, lat = location["coordinates"][:2]
+        return {"lat": float(lat), "lng": float(lng)}
+    return {"lat": float(location["lat"]), "lng": float(location["lng"])}
+
+
+def boundingBoxPolygon(minLat: float, minLng: float, maxLat: float, maxLng: float) -> Dict[str, Any]:
+    if minLat >= maxLat or minLng >= maxLng:
+        raise ValueError("Bounding box must satisfy minLat < maxLat and minLng < maxLng")
+    ring: List[List[float]] = [
+        [minLng, minLat],
+        [maxLng, minLat],
+        [maxLng, maxLat],
+        [minLng, maxLat],
+        [minLng, minLat],
+    ]
+    return {"type": "Polygon", "coordinates": [ring]}
+
+
+def buildGeoNearPipeline(
+    lat: Optional[float],
+    lng: Optional[float],
+    radiusMeters: Optional[float],
+    bbox: Optional[Tuple[float, float, float, float]],
+    limit: int,
+) -> List[Dict[str, Any]]:
+    """Build a ``$geoNear`` pipeline sorted by distance from (lat, lng).
+
+    With a bounding box the search is restricted by ``$geoWithin`` and the
+    origin defaults to the box centre when no point is given.
+    """
+    query: Dict[str, Any] = {}
+    if bbox is not None:
+        minLat, minLng, maxLat, maxLng = bbox
+        query["location"] = {"$geoWithin": {"$geometry": boundingBoxPolygon(minLat, minLng, maxLat, maxLng)}}
+        if lat is None or lng is None:
+            lat = (minLat + maxLat) / 2.0
+            lng = (minLng + maxLng) / 2.0
+    if lat is None or lng is None:
+        raise ValueError("lat and lng are required unless a bounding box is given")
+
+    geoNear: Dict[str, Any] = {
+        "near": {"type": "Point", "coordinates": [float(lng), float(lat)]},
+        "distanceField": "distanceMeters",
+        "key": "location",
+        "spherical": True,
+        "query": query,
+    }
+    if radiusMeters is not None and bbox is None:
+        geoNear["maxDistance"] = float(radiusMeters)
+    return [{"$geoNear": geoNear}, {"$limit": limit}]
@@ -1,81 +1,628 @@
+import time
+
+_importStart = time.perf_counter()
+
+import asyncio
+import hmac
 import sys
-from typing import List
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Type
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
 
-from config import DATABASE_NAME
-from db import getDatabase
+from async_db import (
+    closeAsyncClient,
+    connectAsyncClient,
+    getAsyncClient,
+    getAsyncDatabase,
+    getDataVersion,
+)
+from cache import ResponseCache, buildCacheKey, snapToTile
+from config import (
+    CACHE_ADMIN_TOKEN,
+    CACHE_MAX_ENTRIES,
+    CACHE_TTL_SECONDS,
+    CACHE_VERSION_CHECK_SECONDS,
+    CLEAN_DATA_DIR,
+    DATABASE_NAME,
+    DEFAULT_NEARBY_RADIUS_METERS,
+    DEFAULT_PAGE_SIZE,
+    HEATMAP_MAX_ZOOM,
+    HEATMAP_TILE_SIZE,
+    MAX_NEARBY_RADIUS_METERS,
+    MAX_PAGE_SIZE,
+    NEARBY_CACHE_TILE_DEG,
+    READINESS_TIMEOUT_SECONDS,
+    ROUTE_MAX_ALTERNATIVES,
+    ROUTE_RISK_WEIGHT,
+    SPATIAL_INDEX_CELL_DEG,
+    SPATIAL_INDEX_REFRESH_SECONDS,
+)
+from geo import buildGeoNearPipeline, toLatLng
 from models import (
     Alert,
     ApiResponse,
+    NearbyAlert,
+    NearbySafeSpot,
+    Page,
     SafeSpot,
+    SosRiskBatchRequest,
     SosRiskRequest,
+    UnsafeScoreBatchRequest,
     UnsafeScoreRequest,
     User,
 )
+from pagination import buildProjection, fetchPage
+from startup import StartupState
 
 from pathlib import Path
 
 projectRoot = Path(__file__).resolve().parents[1]
-modelAiSrc = projectRoot / "model-ai" / "model_ai"
-if str(modelAiSrc) not in sys.path:
-    sys.path.insert(0, str(modelAiSrc))
+modelAiRoot = projectRoot / "model-ai"
+if str(modelAiRoot) not in sys.path:
+    sys.path.insert(0, str(modelAiRoot))
 
-from inference import getSosRiskScore, getUnsafeZoneScore  # type: ignore
+from model_ai.inference import (  # type: ignore
+    _parseTimestamp,
+    getSosRiskScore,
+    getSosRiskScoresBatch,
+    getUnsafeZoneScore,
+    getUnsafeZoneScoresBatch,
+    loadModels,
+    validTimestamps,
+    warmUp,
+)
+from model_ai.routing import getRoadNetwork, loadRoadNetwork, snapRiskWeight  # type: ignore
+from model_ai.spatial_index import JsonSpatialIndex  # type: ignore
+from model_ai.tile_pyramid import TilePyramid  # type: ignore
 
 
-app = FastAPI(title="SAFE-ZONE Backend", version="1.0.0")
+alertIndex = JsonSpatialIndex(CLEAN_DATA_DIR / "alerts.json", cellSizeDeg=SPATIAL_INDEX_CELL_DEG)
+safeSpotIndex = JsonSpatialIndex(CLEAN_DATA_DIR / "safe-spots.json", cellSizeDeg=SPATIAL_INDEX_CELL_DEG)
+_lastSpatialRefresh = 0.0
+_heatmapPyramid: Optional[TilePyramid] = None
+# Serializes pyramid builds; the generation discards a build started before a reset.
+_heatmapBuildLock = threading.Lock()
+_heatmapGeneration = 0
 
+responseCache = ResponseCache(maxEntries=CACHE_MAX_ENTRIES, ttlSeconds=CACHE_TTL_SECONDS)
+_cachedDataVersion: Optional[int] = None
+_lastVersionCheck = 0.0
 
-@app.get("/alerts", response_model=ApiResponse)
-async def getAlerts() -> ApiResponse:
-    db = getDatabase()
-    cursor = db.alerts.find({})
-    alerts = [
-        Alert(
-            id=str(doc["id"]),
-            type=doc["type"],
-            severity=doc["severity"],
-            timestamp=doc["timestamp"],
-            location={"lat": doc["location"]["lat"], "lng": doc["location"]["lng"]},
-            description=doc["description"],
+
+def _spatialRefreshDue(force: bool = False) -> bool:
+    global _lastSpatialRefresh
+    now = time.monotonic()
+    if not force and now - _lastSpatialRefresh < SPATIAL_INDEX_REFRESH_SECONDS:
+        return False
+    _lastSpatialRefresh = now
+    return True
+
+
+def _reloadSpatialIndexes() -> Tuple[bool, bool]:
+    """Blocking part of a refresh: reload changed index files and re-feed the route risk layer."""
+    alertsChanged, safeSpotsChanged = alertIndex.refresh(), safeSpotIndex.refresh()
+    if alertsChanged:
+        _setRoadNetworkAlerts()
+    return alertsChanged, safeSpotsChanged
+
+
+def _applySpatialRefresh(alertsChanged: bool, safeSpotsChanged: bool) -> None:
+    if alertsChanged or safeSpotsChanged:
+        responseCache.invalidate("/nearest")
+    if alertsChanged:
+        _resetHeatmapPyramid()
+        responseCache.invalidate("/routes")
+
+
+def _refreshSpatialIndexes(force: bool = False) -> None:
+    if _spatialRefreshDue(force):
+        _applySpatialRefresh(*_reloadSpatialIndexes())
+
+
+async def _refreshSpatialIndexesAsync() -> None:
+    """Request-path refresh: the file stat, reload and risk re-feed run on a worker thread.
+
+    The due check stays on the event loop, so at most one reload is in
+    flight per interval; cache invalidation also stays on the loop, which
+    owns the response cache.
+    """
+    if not _spatialRefreshDue():
+        return
+    _applySpatialRefresh(*await asyncio.to_thread(_reloadSpatialIndexes))
+
+
+def _resetHeatmapPyramid() -> None:
+    global _heatmapPyramid, _heatmapGeneration
+    _heatmapGeneration += 1
+    _heatmapPyramid = None
+    responseCache.invalidate("/heatmap")
+
+
+def _indexedAlerts() -> Tuple[List[Dict[str, Any]], List[Dict[str, float]]]:
+    """Indexed alert documents with their locations; docs without a usable location are skipped."""
+    index = alertIndex.index
+    docs: List[Dict[str, Any]] = []
+    locations: List[Dict[str, float]] = []
+    for pointId in index.ids():
+        doc = index.payload(pointId)
+        try:
+            location = toLatLng(doc["location"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        docs.append(doc)
+        locations.append(location)
+    return docs, locations
+
+
+def _setRoadNetworkAlerts() -> None:
+    """Feed the indexed alerts to the route risk layer, if a road graph is loaded."""
+    network = getRoadNetwork(load=False)
+    if network is None:
+        return
+    _, locations = _indexedAlerts()
+    network.setAlertLocations(
+        [location["lat"] for location in locations],
+        [location["lng"] for location in locations],
+    )
+
+
+def _syncRoadNetworkAlerts() -> None:
+    _setRoadNetworkAlerts()
+    responseCache.invalidate("/routes")
+
+
+def _loadRoadNetwork() -> None:
+    loadRoadNetwork()
+    _syncRoadNetworkAlerts()
+
+
+def _precomputeRouteRisk() -> None:
+    """Fill every hour bucket of the edge risk table before traffic arrives."""
+    network = getRoadNetwork(load=False)
+    if network is not None:
+        network.riskLayer.precompute()
+
+
+def _buildHeatmapPyramid() -> TilePyramid:
+    """Aggregate every indexed alert, weighted by its unsafe-zone score.
+
+    Alerts without a valid timestamp cannot be scored and are left out; a
+    missing severity scores as medium. Concurrent callers share one build.
+    Raises FileNotFoundError when the models are not trained.
+    """
+    global _heatmapPyramid
+    with _heatmapBuildLock:
+        if _heatmapPyramid is not None:
+            return _heatmapPyramid
+        generation = _heatmapGeneration
+        docs, locations = _indexedAlerts()
+        timestamps = [doc.get("timestamp") for doc in docs]
+        rows = [
+            (location, timestamp, doc.get("severity") if isinstance(doc.get("severity"), str) else None)
+            for location, timestamp, doc, valid in zip(locations, timestamps, docs, validTimestamps(timestamps))
+            if valid
+        ]
+        points = [(location["lat"], location["lng"], timestamp, severity) for location, timestamp, severity in rows]
+        scores = [result["unsafeScore"] for result in getUnsafeZoneScoresBatch(points)]
+        pyramid = TilePyramid.build(
+            [point[0] for point in points],
+            [point[1] for point in points],
+            scores,
+            maxZoom=HEATMAP_MAX_ZOOM,
+            tileSize=HEATMAP_TILE_SIZE,
         )
-        for doc in cursor
-    ]
-    return ApiResponse(success=True, message="Alerts loaded", data=alerts)
+        if generation == _heatmapGeneration:
+            _heatmapPyramid = pyramid
+        return pyramid
+
+
+async def _syncCacheWithDataVersion() -> None:
+    """Drop cached responses once seed_db or a migration bumps the data version."""
+    global _cachedDataVersion, _lastVersionCheck
+    now = time.monotonic()
+    if now - _lastVersionCheck < CACHE_VERSION_CHECK_SECONDS:
+        return
+    _lastVersionCheck = now
+    version = await getDataVersion()
+    if _cachedDataVersion is not None and version != _cachedDataVersion:
+        responseCache.invalidate()
+    _cachedDataVersion = version
+
+
+async def _cachedResponse(
+    request: Request,
+    key: str,
+    build: Callable[[], Awaitable[ApiResponse]],
+    checkDataVersion: bool = True,
+) -> Response:
+    if checkDataVersion:
+        await _syncCacheWithDataVersion()
+    entry = responseCache.get(key)
+    if entry is None:
+        payload = await build()
+        entry = responseCache.set(key, payload.model_dump_json().encode("utf-8"))
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == entry.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+startupState = StartupState(startedAt=_importStart)
+startupState.record("imports", _importStart)
+_modelsWarm = False
+
+
+async def _pingDatabase() -> None:
+    await asyncio.wait_for(getAsyncClient().admin.command("ping"), timeout=READINESS_TIMEOUT_SECONDS)
+
+
+async def _warmUpWorker() -> None:
+    """Preload indexes, models and the road graph off the event loop.
+
+    Runs after startup so liveness answers immediately; readiness stays false
+    until this finishes.
+    """
+    global _modelsWarm
+    await startupState.runStep("spatialIndexes", lambda: asyncio.to_thread(_refreshSpatialIndexes, True))
+    if await startupState.runStep("models.load", lambda: asyncio.to_thread(loadModels)):
+        _modelsWarm = await startupState.runStep("models.warmup", lambda: asyncio.to_thread(warmUp))
+        await startupState.runStep("heatmap.pyramid", lambda: asyncio.to_thread(_buildHeatmapPyramid))
+    await startupState.runStep("routing.graph", lambda: asyncio.to_thread(_loadRoadNetwork))
+    if _modelsWarm:
+        await startupState.runStep("routing.risk", lambda: asyncio.to_thread(_precomputeRouteRisk))
+    await startupState.runStep("db.ping", _pingDatabase)
+    startupState.finish()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    await startupState.runStep("db.connect", connectAsyncClient)
+    warmUpTask = asyncio.create_task(_warmUpWorker())
+    try:
+        yield
+    finally:
+        warmUpTask.cancel()
+        await closeAsyncClient()
+
+
+app = FastAPI(title="SAFE-ZONE Backend", version="1.0.0", lifespan=lifespan)
+
+
+def _alertFromDoc(doc: Dict[str, Any]) -> Alert:
+    return Alert(
+        id=str(doc["id"]),
+        type=doc["type"],
+        severity=doc["severity"],
+        timestamp=doc["timestamp"],
+        location=toLatLng(doc["location"]),
+        description=doc["description"],
+    )
+
+
+def _safeSpotFromDoc(doc: Dict[str, Any]) -> SafeSpot:
+    return SafeSpot(
+        id=str(doc["id"]),
+        name=doc["name"],
+        type=doc["type"],
+        address=doc["address"],
+        location=toLatLng(doc["location"]),
+    )
+
+
+def _userFromDoc(doc: Dict[str, Any]) -> User:
+    return User(
+        id=str(doc["id"]),
+        name=doc["name"],
+        phone=doc["phone"],
+        email=doc["email"],
+    )
+
+
+def _projectDoc(doc: Dict[str, Any], projection: Dict[str, int]) -> Dict[str, Any]:
+    item = {name: doc.get(name) for name in projection if name != "_id"}
+    if item.get("id") is not None:
+        item["id"] = str(item["id"])
+    if isinstance(item.get("location"), dict):
+        item["location"] = toLatLng(item["location"])
+    return item
+
+
+async def _loadPage(
+    collection: Any,
+    model: Type[BaseModel],
+    fromDoc: Callable[[Dict[str, Any]], BaseModel],
+    limit: int,
+    after: Optional[str],
+    fields: Optional[str],
+) -> Page:
+    try:
+        projection = buildProjection(fields, list(model.model_fields))
+        docs, nextCursor = await fetchPage(collection, limit, after, projection)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if projection is None:
+        items: List[Any] = [fromDoc(doc) for doc in docs]
+    else:
+        items = [_projectDoc(doc, projection) for doc in docs]
+    return Page(items=items, nextCursor=nextCursor)
+
+
+@app.get("/alerts", response_model=ApiResponse)
+async def getAlerts(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+) -> Response:
+    async def build() -> ApiResponse:
+        db = getAsyncDatabase()
+        page = await _loadPage(db.alerts, Alert, _alertFromDoc, limit, after, fields)
+        return ApiResponse(success=True, message="Alerts loaded", data=page)
+
+    key = buildCacheKey("/alerts", {"limit": limit, "after": after, "fields": fields})
+    return await _cachedResponse(request, key, build)
 
 
 @app.get("/safe-spots", response_model=ApiResponse)
-async def getSafeSpots() -> ApiResponse:
-    db = getDatabase()
-    cursor = db.safespots.find({})
-    spots = [
-        SafeSpot(
-            id=str(doc["id"]),
-            name=doc["name"],
-            type=doc["type"],
-            address=doc["address"],
-            location={"lat": doc["location"]["lat"], "lng": doc["location"]["lng"]},
-        )
-        for doc in cursor
+async def getSafeSpots(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+) -> Response:
+    async def build() -> ApiResponse:
+        db = getAsyncDatabase()
+        page = await _loadPage(db.safespots, SafeSpot, _safeSpotFromDoc, limit, after, fields)
+        return ApiResponse(success=True, message="Safe spots loaded", data=page)
+
+    key = buildCacheKey("/safe-spots", {"limit": limit, "after": after, "fields": fields})
+    return await _cachedResponse(request, key, build)
+
+
+async def _loadNearby(
+    collection: Any,
+    fromDoc: Callable[[Dict[str, Any]], BaseModel],
+    nearbyModel: Type[BaseModel],
+    lat: Optional[float],
+    lng: Optional[float],
+    radius: float,
+    minLat: Optional[float],
+    minLng: Optional[float],
+    maxLat: Optional[float],
+    maxLng: Optional[float],
+    limit: int,
+) -> List[BaseModel]:
+    bboxValues = (minLat, minLng, maxLat, maxLng)
+    if any(value is not None for value in bboxValues) and any(value is None for value in bboxValues):
+        raise HTTPException(status_code=400, detail="minLat, minLng, maxLat and maxLng must be given together")
+    bbox = None if minLat is None else (minLat, minLng, maxLat, maxLng)
+    try:
+        pipeline = buildGeoNearPipeline(lat, lng, radius, bbox, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    cursor = await collection.aggregate(pipeline)
+    return [
+        nearbyModel(**fromDoc(doc).model_dump(), distanceMeters=doc["distanceMeters"])
+        async for doc in cursor
     ]
-    return ApiResponse(success=True, message="Safe spots loaded", data=spots)
 
 
-@app.get("/users", response_model=ApiResponse)
-async def getUsers() -> ApiResponse:
-    db = getDatabase()
-    cursor = db.users.find({})
-    users = [
-        User(
-            id=str(doc["id"]),
-            name=doc["name"],
-            phone=doc["phone"],
-            email=doc["email"],
+@app.get("/alerts/near", response_model=ApiResponse)
+async def getAlertsNear(
+    request: Request,
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    radius: float = Query(DEFAULT_NEARBY_RADIUS_METERS, gt=0, le=MAX_NEARBY_RADIUS_METERS),
+    minLat: Optional[float] = Query(None, ge=-90, le=90),
+    minLng: Optional[float] = Query(None, ge=-180, le=180),
+    maxLat: Optional[float] = Query(None, ge=-90, le=90),
+    maxLng: Optional[float] = Query(None, ge=-180, le=180),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> Response:
+    if lat is not None and lng is not None:
+        lat, lng = snapToTile(lat, NEARBY_CACHE_TILE_DEG), snapToTile(lng, NEARBY_CACHE_TILE_DEG)
+
+    async def build() -> ApiResponse:
+        db = getAsyncDatabase()
+        alerts = await _loadNearby(
+            db.alerts, _alertFromDoc, NearbyAlert, lat, lng, radius, minLat, minLng, maxLat, maxLng, limit
         )
-        for doc in cursor
-    ]
-    return ApiResponse(success=True, message="Users loaded", data=users)
+        return ApiResponse(success=True, message="Nearby alerts loaded", data=alerts)
+
+    params = {
+        "lat": lat,
+        "lng": lng,
+        "radius": radius,
+        "limit": limit,
+        "minLat": minLat,
+        "minLng": minLng,
+        "maxLat": maxLat,
+        "maxLng": maxLng,
+    }
+    return await _cachedResponse(request, buildCacheKey("/alerts/near", params), build)
+
+
+@app.get("/safe-spots/near", response_model=ApiResponse)
+async def getSafeSpotsNear(
+    request: Request,
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    radius: float = Query(DEFAULT_NEARBY_RADIUS_METERS, gt=0, le=MAX_NEARBY_RADIUS_METERS),
+    minLat: Optional[float] = Query(None, ge=-90, le=90),
+    minLng: Optional[float] = Query(None, ge=-180, le=180),
+    maxLat: Optional[float] = Query(None, ge=-90, le=90),
+    maxLng: Optional[float] = Query(None, ge=-180, le=180),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> Response:
+    if lat is not None and lng is not None:
+        lat, lng = snapToTile(lat, NEARBY_CACHE_TILE_DEG), snapToTile(lng, NEARBY_CACHE_TILE_DEG)
+
+    async def build() -> ApiResponse:
+        db = getAsyncDatabase()
+        spots = await _loadNearby(
+            db.safespots, _safeSpotFromDoc, NearbySafeSpot, lat, lng, radius, minLat, minLng, maxLat, maxLng, limit
+        )
+        return ApiResponse(success=True, message="Nearby safe spots loaded", data=spots)
+
+    params = {
+        "lat": lat,
+        "lng": lng,
+        "radius": radius,
+        "limit": limit,
+        "minLat": minLat,
+        "minLng": minLng,
+        "maxLat": maxLat,
+        "maxLng": maxLng,
+    }
+    return await _cachedResponse(request, buildCacheKey("/safe-spots/near", params), build)
+
+
+def _nearestFromIndex(
+    index: Any,
+    fromDoc: Callable[[Dict[str, Any]], BaseModel],
+    nearbyModel: Type[BaseModel],
+    lat: float,
+    lng: float,
+    k: int,
+    maxRadiusKm: Optional[float],
+) -> List[BaseModel]:
+    items: List[BaseModel] = []
+    for _, distanceKm, doc in index.nearest(lat, lng, k, maxRadiusKm):
+        try:
+            item = fromDoc(doc)
+        except (KeyError, TypeError, ValueError):
+            # One malformed document must not fail the whole lookup.
+            continue
+        items.append(nearbyModel(**item.model_dump(), distanceMeters=distanceKm * 1000.0))
+    return items
+
+
+@app.get("/nearest", response_model=ApiResponse)
+async def getNearest(
+    request: Request,
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    k: int = Query(5, ge=1, le=100),
+    radius: Optional[float] = Query(None, gt=0, le=MAX_NEARBY_RADIUS_METERS),
+) -> Response:
+    """Nearest alerts and safe spots from the in-process spatial indexes.
+
+    Served from memory without a Mongo round-trip, for the SOS hot path.
+    """
+    await _refreshSpatialIndexesAsync()
+    lat, lng = snapToTile(lat, NEARBY_CACHE_TILE_DEG), snapToTile(lng, NEARBY_CACHE_TILE_DEG)
+
+    async def build() -> ApiResponse:
+        maxRadiusKm = radius / 1000.0 if radius is not None else None
+        alerts = _nearestFromIndex(alertIndex.index, _alertFromDoc, NearbyAlert, lat, lng, k, maxRadiusKm)
+        spots = _nearestFromIndex(
+            safeSpotIndex.index, _safeSpotFromDoc, NearbySafeSpot, lat, lng, k, maxRadiusKm
+        )
+        return ApiResponse(success=True, message="Nearest points loaded", data={"alerts": alerts, "safeSpots": spots})
+
+    # Served from the spatial indexes, so refreshes of those invalidate it instead.
+    key = buildCacheKey("/nearest", {"lat": lat, "lng": lng, "k": k, "radius": radius})
+    return await _cachedResponse(request, key, build, checkDataVersion=False)
+
+
+@app.get("/heatmap/{z}/{x}/{y}", response_model=ApiResponse)
+async def getHeatmapTile(request: Request, z: int, x: int, y: int) -> Response:
+    """Sum/count heatmap cells of one slippy-map tile.
+
+    Tiles are cut from a pyramid built once from the alert index, so panning
+    only slices precomputed aggregates.
+    """
+    await _refreshSpatialIndexesAsync()
+    if not 0 <= z <= HEATMAP_MAX_ZOOM:
+        raise HTTPException(status_code=400, detail=f"z must be between 0 and {HEATMAP_MAX_ZOOM}")
+    if not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(status_code=400, detail=f"Tile {z}/{x}/{y} is outside the world")
+
+    async def build() -> ApiResponse:
+        pyramid = _heatmapPyramid
+        if pyramid is None:
+            try:
+                pyramid = await asyncio.to_thread(_buildHeatmapPyramid)
+            except FileNotFoundError as exc:
+                raise HTTPException(status_code=503, detail="Heatmap unavailable: models are not loaded") from exc
+        return ApiResponse(success=True, message="Heatmap tile loaded", data=pyramid.tile(z, x, y))
+
+    # Built from the alert index, which invalidates these entries when it changes.
+    return await _cachedResponse(request, f"/heatmap/{z}/{x}/{y}", build, checkDataVersion=False)
+
+
+@app.get("/routes/alternatives", response_model=ApiResponse)
+async def getRouteAlternatives(
+    request: Request,
+    fromLat: float = Query(..., ge=-90, le=90),
+    fromLng: float = Query(..., ge=-180, le=180),
+    toLat: float = Query(..., ge=-90, le=90),
+    toLng: float = Query(..., ge=-180, le=180),
+    k: int = Query(3, ge=1, le=ROUTE_MAX_ALTERNATIVES),
+    departureTime: Optional[str] = None,
+    riskWeight: float = Query(ROUTE_RISK_WEIGHT, ge=0),
+) -> Response:
+    """Up to k alternative routes on the road graph, cheapest first.
+
+    With a departureTime, edges cost length + riskWeight * risk for that hour;
+    without trained models the routes fall back to plain length and each item
+    reports riskWeighted False. riskWeight is snapped to the nearest configured
+    level (ROUTE_RISK_WEIGHT_LEVELS), which also keys the cache.
+    """
+    network = getRoadNetwork(load=False)
+    if network is None:
+        raise HTTPException(status_code=503, detail="Road graph not loaded")
+    hour = None
+    if departureTime is not None:
+        try:
+            hour = _parseTimestamp(departureTime).hour
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=f"Invalid ISO timestamp: {departureTime}") from exc
+    fromLat, fromLng = snapToTile(fromLat, NEARBY_CACHE_TILE_DEG), snapToTile(fromLng, NEARBY_CACHE_TILE_DEG)
+    toLat, toLng = snapToTile(toLat, NEARBY_CACHE_TILE_DEG), snapToTile(toLng, NEARBY_CACHE_TILE_DEG)
+    riskWeight = snapRiskWeight(riskWeight)
+
+    async def build() -> ApiResponse:
+        routes = await asyncio.to_thread(
+            network.alternatives, fromLat, fromLng, toLat, toLng, k, hour, riskWeight
+        )
+        items = [
+            {
+                "cost": route["distance"],
+                "lengthKm": route["lengthKm"],
+                "path": route["path"],
+                "riskWeighted": route["riskWeighted"],
+            }
+            for route in routes
+        ]
+        return ApiResponse(success=True, message="Route alternatives computed", data=items)
+
+    params = {
+        "fromLat": fromLat,
+        "fromLng": fromLng,
+        "toLat": toLat,
+        "toLng": toLng,
+        "k": k,
+        "hour": hour,
+        "riskWeight": riskWeight,
+    }
+    # Depends on the road graph and alert index only; alert refreshes invalidate it.
+    return await _cachedResponse(request, buildCacheKey("/routes/alternatives", params), build, checkDataVersion=False)
+
+
+@app.get("/users", response_model=ApiResponse)
+async def getUsers(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+) -> ApiResponse:
+    db = getAsyncDatabase()
+    page = await _loadPage(db.users, User, _userFromDoc, limit, after, fields)
+    return ApiResponse(success=True, message="Users loaded", data=page)
 
 
 @app.get("/unsafe-score", response_model=ApiResponse)
@@ -92,6 +639,19 @@ async def getUnsafeScoreEndpoint(request: UnsafeScoreRequest) -> ApiResponse:
     return ApiResponse(success=True, message="Unsafe score computed", data=result)
 
 
+@app.post("/unsafe-score/batch", response_model=ApiResponse)
+async def postUnsafeScoreBatch(request: UnsafeScoreBatchRequest) -> ApiResponse:
+    points = [
+        (point.lat, point.lng, point.timestamp, point.severity or "medium")
+        for point in request.points
+    ]
+    try:
+        results = getUnsafeZoneScoresBatch(points)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return ApiResponse(success=True, message="Unsafe scores computed", data=results)
+
+
 @app.post("/sos-risk", response_model=ApiResponse)
 async def postSosRisk(request: SosRiskRequest) -> ApiResponse:
     try:
@@ -107,10 +667,65 @@ async def postSosRisk(request: SosRiskRequest) -> ApiResponse:
     return ApiResponse(success=True, message="SOS risk computed", data=result)
 
 
+@app.post("/sos-risk/batch", response_model=ApiResponse)
+async def postSosRiskBatch(request: SosRiskBatchRequest) -> ApiResponse:
+    reports = [
+        (report.description, report.lat, report.lng, report.timestamp, report.severity or "high")
+        for report in request.reports
+    ]
+    results = getSosRiskScoresBatch(reports)
+    failed = sum(1 for item in results if "error" in item)
+    return ApiResponse(
+        success=True,
+        message=f"SOS risk computed ({len(results) - failed} ok, {failed} failed)",
+        data=results,
+    )
+
+
+@app.get("/cache/stats", response_model=ApiResponse)
+async def getCacheStats() -> ApiResponse:
+    return ApiResponse(success=True, message="Cache stats", data=responseCache.stats())
+
+
+@app.post("/cache/invalidate", response_model=ApiResponse)
+async def postCacheInvalidate(
+    prefix: Optional[str] = None,
+    adminToken: Optional[str] = Header(None, alias="X-Admin-Token"),
+) -> ApiResponse:
+    if not CACHE_ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Cache invalidation is disabled")
+    if adminToken is None or not hmac.compare_digest(adminToken, CACHE_ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    removed = responseCache.invalidate(prefix)
+    return ApiResponse(success=True, message="Cache invalidated", data={"removed": removed})
+
+
+@app.get("/health/live", response_model=ApiResponse)
+async def healthLive() -> ApiResponse:
+    return ApiResponse(success=True, message="alive", data={"startup": startupState.summary()})
+
+
+@app.get("/health/ready", response_model=ApiResponse)
+async def healthReady() -> Response:
+    databaseReachable = True
+    try:
+        await _pingDatabase()
+    except Exception:
+        databaseReachable = False
+    checks = {"startupFinished": startupState.finished, "modelsWarm": _modelsWarm, "database": databaseReachable}
+    ready = all(checks.values())
+    payload = ApiResponse(
+        success=ready,
+        message="ready" if ready else "not ready",
+        data={"checks": checks, "startup": startupState.summary()},
+    )
+    return JSONResponse(status_code=200 if ready else 503, content=payload.model_dump())
+
+
 @app.get("/health", response_model=ApiResponse)
 async def healthCheck() -> ApiResponse:
-    db = getDatabase()
-    collectionNames = db.list_collection_names()
+    db = getAsyncDatabase()
+    collectionNames = await db.list_collection_names()
     return ApiResponse(
         success=True,
         message="OK",
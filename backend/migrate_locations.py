@@ -0,0 +1,36 @@
+from pymongo import MongoClient, UpdateOne
+
+from config import DATABASE_NAME, MONGODB_URI
+from db import bumpDataVersion
+from geo import toGeoJsonPoint
+
+
+def migrateCollection(client: MongoClient, name: str, batchSize: int = 1000) -> int:
+    """Rewrite legacy ``{lat, lng}`` locations as GeoJSON Points in place."""
+    collection = client[DATABASE_NAME][name]
+    legacyFilter = {"location.lat": {"$exists": True}, "location.type": {"$exists": False}}
+    migrated = 0
+    operations = []
+    for doc in collection.find(legacyFilter, {"location": 1}):
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"location": toGeoJsonPoint(doc["location"])}}))
+        if len(operations) >= batchSize:
+            migrated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        migrated += collection.bulk_write(operations, ordered=False).modified_count
+    print(f"[INFO] Migrated {migrated} docs in {DATABASE_NAME}.{name} to GeoJSON locations")
+    return migrated
+
+
+def main() -> None:
+    client = MongoClient(MONGODB_URI)
+    try:
+        migrated = migrateCollection(client, "alerts") + migrateCollection(client, "safespots")
+        if migrated:
+            bumpDataVersion(client)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ from typing import Any, List, Optional
 
 from pydantic import BaseModel, Field
 
+from config import MAX_BATCH_SIZE
+
 
 class Location(BaseModel):
     lat: float
@@ -25,6 +27,14 @@ class SafeSpot(BaseModel):
     location: Location
 
 
+class NearbyAlert(Alert):
+    distanceMeters: float
+
+
+class NearbySafeSpot(SafeSpot):
+    distanceMeters: float
+
+
 class User(BaseModel):
     id: str
     name: str
@@ -32,6 +42,11 @@ class User(BaseModel):
     email: str
 
 
+class Page(BaseModel):
+    items: List[Any]
+    nextCursor: Optional[str] = None
+
+
 class ApiResponse(BaseModel):
     success: bool
     message: str
@@ -46,8 +61,16 @@ class SosRiskRequest(BaseModel):
     severity: Optional[str] = Field(default="high")
 
 
+class SosRiskBatchRequest(BaseModel):
+    reports: List[SosRiskRequest] = Field(..., max_length=MAX_BATCH_SIZE)
+
+
 class UnsafeScoreRequest(BaseModel):
     lat: float
     lng: float
     timestamp: str
     severity: Optional[str] = Field(default="medium")
+
+
+class UnsafeScoreBatchRequest(BaseModel):
+    points: List[UnsafeScoreRequest] = Field(..., max_length=MAX_BATCH_SIZE)
@@ -0,0 +1,54 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+def parseCursor(after: Optional[str]) -> Optional[ObjectId]:
+    if not after:
+        return None
+    try:
+        return ObjectId(after)
+    except (InvalidId, TypeError) as exc:
+        raise ValueError(f"Invalid cursor: {after}") from exc
+
+
+def buildProjection(fields: Optional[str], allowedFields: Sequence[str]) -> Optional[Dict[str, int]]:
+    """Turn a comma-separated ``fields`` parameter into a Mongo projection.
+
+    ``_id`` is always kept because it is the pagination key.
+    """
+    if not fields:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in allowedFields]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    projection = {name: 1 for name in requested}
+    projection["_id"] = 1
+    return projection
+
+
+async def fetchPage(
+    collection: Any,
+    limit: int,
+    after: Optional[str] = None,
+    projection: Optional[Dict[str, int]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Return one page of documents ordered by ``_id`` plus the next cursor.
+
+    Pages are keyed on the always-indexed ``_id`` so each page is an index
+    range scan regardless of collection size. One extra document is read to
+    decide whether a next page exists.
+    """
+    query: Dict[str, Any] = {}
+    afterId = parseCursor(after)
+    if afterId is not None:
+        query["_id"] = {"$gt": afterId}
+    cursor = collection.find(query, projection).sort("_id", 1).limit(limit + 1)
+    docs = [doc async for doc in cursor]
+    nextCursor: Optional[str] = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        nextCursor = str(docs[-1]["_id"])
+    return docs, nextCursor
@@ -4,6 +4,8 @@ from pathlib import Path
 from pymongo import MongoClient
 
 from config import DATABASE_NAME, MONGODB_URI
+from db import bumpDataVersion
+from geo import toGeoJsonPoint
 
 
 def getProjectRoot() -> Path:
@@ -14,7 +16,7 @@ def getCleanDataDir() -> Path:
     return getProjectRoot() / "data-engineering" / "clean-data"
 
 
-def seedCollection(client: MongoClient, name: str, fileName: str) -> None:
+def seedCollection(client: MongoClient, name: str, fileName: str, geoJson: bool = False) -> None:
     db = client[DATABASE_NAME]
     path = getCleanDataDir() / fileName
     if not path.exists():
@@ -27,6 +29,10 @@ def seedCollection(client: MongoClient, name: str, fileName: str) -> None:
     if not data:
         print(f"[INFO] No documents in {path}, skipping.")
         return
+    if geoJson:
+        for doc in data:
+            if isinstance(doc.get("location"), dict):
+                doc["location"] = toGeoJsonPoint(doc["location"])
     collection = db[name]
     collection.delete_many({})
     result = collection.insert_many(data)
@@ -36,9 +42,10 @@ def seedCollection(client: MongoClient, name: str, fileName: str) -> None:
 def main() -> None:
     client = MongoClient(MONGODB_URI)
     try:
-        seedCollection(client, "alerts", "alerts.json")
-        seedCollection(client, "safespots", "safe-spots.json")
+        seedCollection(client, "alerts", "alerts.json", geoJson=True)
+        seedCollection(client, "safespots", "safe-spots.json", geoJson=True)
         seedCollection(client, "users", "users.json")
+        bumpDataVersion(client)
     finally:
         client.close()
 
@@ -0,0 +1,47 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict
+
+
+# uvicorn configures handlers for this logger, so startup lines show up in
+# the worker log without extra logging setup.
+logger = logging.getLogger("uvicorn.error")
+
+
+@dataclass
+class StartupState:
+    """Timings and outcome of each startup step, used for readiness."""
+
+    startedAt: float = field(default_factory=time.perf_counter)
+    timingsMs: Dict[str, float] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    finished: bool = False
+
+    def record(self, name: str, startedAt: float) -> None:
+        self.timingsMs[name] = (time.perf_counter() - startedAt) * 1000.0
+
+    async def runStep(self, name: str, step: Callable[[], Awaitable[Any]]) -> bool:
+        stepStart = time.perf_counter()
+        try:
+            await step()
+        except Exception as exc:
+            self.errors[name] = f"{exc.__class__.__name__}: {exc}"
+            logger.warning("Startup step %s failed: %s", name, self.errors[name])
+            return False
+        finally:
+            self.record(name, stepStart)
+        return True
+
+    def finish(self) -> None:
+        self.finished = True
+        self.timingsMs["total"] = (time.perf_counter() - self.startedAt) * 1000.0
+        breakdown = ", ".join(f"{name}={value:.1f}ms" for name, value in self.timingsMs.items())
+        logger.info("Startup finished (%s)", breakdown)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "finished": self.finished,
+            "timingsMs": {name: round(value, 1) for name, value in self.timingsMs.items()},
+            "errors": dict(self.errors),
+        }
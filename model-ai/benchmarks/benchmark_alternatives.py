@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from benchmarks.benchmark_routing import buildGridGraph
+from model_ai.road_graph import RoadGraph
+from model_ai.shortest_path import dijkstra, kShortestPaths
+
+
+def edgeIdsByEnds(graph: RoadGraph) -> Dict[Tuple[int, int], int]:
+    return {
+        (source, target): edge
+        for edge, (source, target) in enumerate(zip(graph.sources.tolist(), graph.targets.tolist()))
+    }
+
+
+def penaltyAlternatives(
+    graph: RoadGraph,
+    edgeIds: Dict[Tuple[int, int], int],
+    source: int,
+    target: int,
+    k: int,
+    penalty: float = 1.5,
+) -> List[list]:
+    """Baseline: k separate Dijkstra runs, inflating the edges of each path found."""
+    weights = graph.weights.copy()
+    paths = []
+    for _ in range(k):
+        _, path = dijkstra(graph.withWeights(weights), source, target)
+        if not path:
+            break
+        paths.append(path)
+        for node, nextNode in zip(path, path[1:]):
+            weights[edgeIds[(node, nextNode)]] *= penalty
+    return paths
+
+
+def main(side: int = 150, k: int = 5, queries: int = 5) -> None:
+    graph = buildGridGraph(side)
+    graph.adjacencyLists()
+    graph.reverse()[0].adjacencyLists()
+    generator = np.random.default_rng(3)
+    pairs = generator.integers(0, graph.nodeCount, (queries, 2))
+    edgeIds = edgeIdsByEnds(graph)
+
+    start = time.perf_counter()
+    for source, target in pairs:
+        kShortestPaths(graph, int(source), int(target), k)
+    sharedSeconds = (time.perf_counter() - start) / queries
+
+    start = time.perf_counter()
+    for source, target in pairs:
+        dijkstra(graph, int(source), int(target))
+    singleSeconds = (time.perf_counter() - start) / queries
+
+    start = time.perf_counter()
+    for source, target in pairs:
+        penaltyAlternatives(graph, edgeIds, int(source), int(target), k)
+    penaltySeconds = (time.perf_counter() - start) / queries
+
+    print("Alternative routes benchmark:")
+    print("-----------------------------")
+    print(f"nodes: {graph.nodeCount}, edges: {graph.edgeCount}, k: {k}")
+    print(f"one Dijkstra: {singleSeconds * 1000:.1f} ms/query")
+    print(f"k separate Dijkstra runs (penalty method): {penaltySeconds * 1000:.1f} ms/query")
+    print(f"Yen with shared reverse tree: {sharedSeconds * 1000:.1f} ms/query")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
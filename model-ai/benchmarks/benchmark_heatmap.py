@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from model_ai.heatmap import computeHeatmap
+from utils import generateDummyHeatmap
+
+
+def main(pointCount: int = 1_000_000, gridSize: int = 256, repeats: int = 5) -> None:
+    generator = np.random.default_rng(42)
+    lats = generator.uniform(12.85, 13.05, pointCount)
+    lngs = generator.uniform(77.45, 77.75, pointCount)
+    scores = generator.random(pointCount)
+    points = np.column_stack([lats, lngs, scores])
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        computeHeatmap(lats, lngs, scores, gridSize)
+        timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    generateDummyHeatmap(points, gridSize=gridSize)
+    wrapperSeconds = time.perf_counter() - start
+
+    print("Heatmap benchmark:")
+    print("------------------")
+    print(f"points: {pointCount}, grid: {gridSize}x{gridSize}")
+    print(f"computeHeatmap best of {repeats}: {min(timings) * 1000:.1f} ms")
+    print(f"generateDummyHeatmap (array input, list output): {wrapperSeconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import math
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.benchmark_routing import buildGridGraph
+from model_ai.landmarks import altSearch, buildLandmarkTable, loadLandmarkTable, saveLandmarkTable
+from model_ai.shortest_path import aStar
+
+
+def main(side: int = 300, queries: int = 50, landmarkCount: int = 16) -> None:
+    graph = buildGridGraph(side)
+    graph.adjacencyLists()
+
+    start = time.perf_counter()
+    table = buildLandmarkTable(graph, landmarkCount)
+    buildSeconds = time.perf_counter() - start
+
+    generator = np.random.default_rng(7)
+    pairs = [(int(source), int(target)) for source, target in generator.integers(0, graph.nodeCount, (queries, 2))]
+    print("Landmark (ALT) benchmark:")
+    print("-------------------------")
+    print(f"nodes: {graph.nodeCount}, edges: {graph.edgeCount}, landmarks: {landmarkCount}")
+    print(f"preprocessing: {buildSeconds:.1f} s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        saveLandmarkTable(table, Path(directory) / "road_graph.landmarks")
+        start = time.perf_counter()
+        mapped = loadLandmarkTable(Path(directory) / "road_graph.landmarks")
+        print(f"load (memory-mapped): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        searches = (
+            ("aStar", lambda source, target: aStar(graph, source, target)),
+            ("alt", lambda source, target: altSearch(graph, table, source, target)),
+            ("alt (mmap)", lambda source, target: altSearch(graph, mapped, source, target)),
+        )
+        baseline = []
+        for name, search in searches:
+            start = time.perf_counter()
+            costs = [search(source, target)[0] for source, target in pairs]
+            elapsed = time.perf_counter() - start
+            if not baseline:
+                baseline = costs
+            assert all(math.isclose(cost, expected, rel_tol=1e-6) for cost, expected in zip(costs, baseline))
+            print(f"{name}: {elapsed / queries * 1000:.2f} ms/query")
+        del mapped
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
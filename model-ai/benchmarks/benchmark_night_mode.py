@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from inference.night_mode_predictor import predictNightMode, predictNightModeBatch
+
+
+def main(contextCount: int = 1_000_000, loopCount: int = 20_000, repeats: int = 5) -> None:
+    generator = np.random.default_rng(42)
+    columns = {
+        "unsafeProbability": generator.random(contextCount),
+        "incidentScore": generator.random(contextCount),
+        "userPreference": generator.random(contextCount),
+        "hour": generator.integers(0, 24, contextCount),
+    }
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predictNightModeBatch(columns)
+        timings.append(time.perf_counter() - start)
+    batchSeconds = min(timings)
+
+    contexts = [
+        {name: values[index].item() for name, values in columns.items()} for index in range(loopCount)
+    ]
+    start = time.perf_counter()
+    for context in contexts:
+        predictNightMode(context)
+    loopSeconds = time.perf_counter() - start
+
+    print("Night mode benchmark:")
+    print("---------------------")
+    print(f"predictNightModeBatch best of {repeats}: {batchSeconds * 1000:.1f} ms for {contextCount} contexts")
+    print(f"  {contextCount / batchSeconds / 1e6:.1f}M contexts/s")
+    print(f"predictNightMode loop: {loopCount / loopSeconds / 1e6:.2f}M contexts/s ({loopCount} contexts)")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from model_ai.road_graph import RoadGraph
+from model_ai.shortest_path import aStar, bidirectionalDijkstra, dijkstra
+
+
+def buildGridGraph(side: int, spacingDeg: float = 0.0005, seed: int = 42) -> RoadGraph:
+    """side x side street grid with jittered intersections and uneven costs."""
+    generator = np.random.default_rng(seed)
+    rows, cols = np.divmod(np.arange(side * side), side)
+    lats = 12.90 + rows * spacingDeg + generator.uniform(-0.1, 0.1, rows.size) * spacingDeg
+    lngs = 77.50 + cols * spacingDeg + generator.uniform(-0.1, 0.1, cols.size) * spacingDeg
+    nodes = np.arange(side * side).reshape(side, side)
+    sources = np.concatenate([nodes[:, :-1].ravel(), nodes[:-1, :].ravel()])
+    targets = np.concatenate([nodes[:, 1:].ravel(), nodes[1:, :].ravel()])
+    graph = RoadGraph.fromEdges(lats, lngs, sources, targets, undirected=True)
+    return graph.withWeights(graph.lengthsKm * generator.uniform(1.0, 1.5, graph.edgeCount))
+
+
+def main(side: int = 500, queries: int = 10) -> None:
+    start = time.perf_counter()
+    graph = buildGridGraph(side)
+    graph.adjacencyLists()
+    graph.reverse()[0].adjacencyLists()
+    buildSeconds = time.perf_counter() - start
+
+    generator = np.random.default_rng(7)
+    pairs = generator.integers(0, graph.nodeCount, (queries, 2))
+    print("Routing benchmark:")
+    print("------------------")
+    print(f"nodes: {graph.nodeCount}, edges: {graph.edgeCount}, build: {buildSeconds * 1000:.0f} ms")
+    for name, search in (("dijkstra", dijkstra), ("aStar", aStar), ("bidirectional", bidirectionalDijkstra)):
+        start = time.perf_counter()
+        for source, target in pairs:
+            search(graph, int(source), int(target))
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {elapsed / queries * 1000:.1f} ms/query")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
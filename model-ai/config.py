@@ -20,6 +20,10 @@ class SafeRouteConfig:
 
     minSafeRouteScore: float = 0.5
     maxRouteLengthKm: float = 25.0
+    # Lambda in edge cost = length + lambda * risk when a departure time is given
+    riskWeight: float = 2.0
+    # Graphs built from candidate routes when no city graph is loaded, reused per candidate set
+    fallbackNetworkCacheSize: int = 16
 
 
 @dataclass
@@ -45,6 +49,18 @@ class SosRiskConfig:
     mediumRiskThreshold: float = 0.4
     triggerPromptThreshold: float = 0.6
 
+    # Streaming: flush a micro-batch at this many contexts or this many seconds
+    streamBatchSize: int = 256
+    streamMaxDelaySeconds: float = 0.05
+
+    # Per-device rolling telemetry used to derive sudden stops and dwell time
+    deviceWindowSize: int = 16
+    deviceTtlSeconds: float = 900.0
+    stopSpeedKmh: float = 3.0
+    suddenStopDecelKmhPerS: float = 8.0
+    # Distance from the last safe spot at which that feature reaches ~0.63 of its maximum
+    safeDistanceScaleKm: float = 2.0
+
 
 unsafeZoneConfig = UnsafeZoneConfig()
 safeRouteConfig = SafeRouteConfig()
@@ -1,4 +1,6 @@
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
+
+import numpy as np
 
 from config import nightModeConfig
 from logging_utils import logError
@@ -39,6 +41,56 @@ def _computeNightModeScore(context: Dict[str, Any]) -> float:
     return normalizeScore(score, 0.0, 1.5)
 
 
+def nightWindowMask(hours: Any) -> np.ndarray:
+    """True for hours inside the configured night window, which may wrap midnight."""
+    hours = np.asarray(hours)
+    startHour, endHour = nightModeConfig.nightStartHour, nightModeConfig.nightEndHour
+    if startHour > endHour:
+        return (hours >= startHour) | (hours < endHour)
+    return (hours >= startHour) & (hours < endHour)
+
+
+def _hourColumn(values: Any) -> np.ndarray:
+    """Hours as an int64 array; None, or NaN from a DataFrame, reads as hour 0 like ``predictNightMode``."""
+    hours = np.atleast_1d(np.asarray(values))
+    if hours.dtype == object:
+        hours = np.where(np.equal(hours, None), 0, hours).astype(float)
+    if hours.dtype.kind == "f":
+        hours = np.nan_to_num(hours, nan=0.0)
+    return hours.astype(np.int64)
+
+
+def predictNightModeBatch(columns: Mapping[str, Any]) -> Dict[str, Any]:
+    """Night-mode scores for whole columns of contexts at once.
+
+    ``columns`` maps ``unsafeProbability``, ``incidentScore``,
+    ``userPreference`` and ``hour`` to equal-length arrays (a dict of arrays
+    or a DataFrame); missing columns take the ``predictNightMode`` defaults
+    of 0, 0, 0.5 and 0, and a scalar applies to every row (all-scalar input
+    gives one-element arrays). Returns ``score`` and ``shouldEnable`` arrays
+    plus the ``threshold``.
+    """
+    arrays = {
+        name: np.asarray(columns[name], dtype=float) if name in columns else np.asarray(default, dtype=float)
+        for name, default in (("unsafeProbability", 0.0), ("incidentScore", 0.0), ("userPreference", 0.5))
+    }
+    hours = _hourColumn(columns["hour"]) if "hour" in columns else np.zeros(1, dtype=np.int64)
+    shape = np.broadcast_shapes(hours.shape, *(array.shape for array in arrays.values()))
+
+    score = nightModeConfig.unsafeZoneWeight * arrays["unsafeProbability"]
+    score = score + nightModeConfig.incidentWeight * arrays["incidentScore"]
+    score = score + nightModeConfig.preferenceWeight * arrays["userPreference"]
+    score = np.broadcast_to(score, shape) + nightModeConfig.lateNightBonus * nightWindowMask(hours)
+    # Same as normalizeScore(score, 0.0, 1.5).
+    score /= 1.5
+    np.clip(score, 0.0, 1.0, out=score)
+    return {
+        "score": score,
+        "shouldEnable": score >= nightModeConfig.triggerThreshold,
+        "threshold": nightModeConfig.triggerThreshold,
+    }
+
+
 def predictNightMode(context: Dict[str, Any]) -> Dict[str, Any]:
     try:
         score = _computeNightModeScore(context)
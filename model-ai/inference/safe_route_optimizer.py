@@ -1,8 +1,24 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from config import safeRouteConfig
 from logging_utils import logError
-from utils import buildRouteGraph, dijkstraShortestPath, haversineDistanceKm
+from model_ai.memo import LruCache
+from model_ai.road_graph import graphFromPolylines
+from model_ai.routing import RoadNetwork, getRoadNetwork, routeEndpoints
+from utils import haversineDistanceKm, parseTimestamp
+
+
+_fallbackNetworks = LruCache(safeRouteConfig.fallbackNetworkCacheSize)
+
+
+def _fallbackNetwork(candidateRoutes: List[List[Dict[str, Any]]]) -> RoadNetwork:
+    """Network over the candidates themselves, reused so its risk table is too."""
+    key = tuple(tuple((float(point["lat"]), float(point["lng"])) for point in route) for route in candidateRoutes)
+    network = _fallbackNetworks.get(key)
+    if network is None:
+        network = RoadNetwork(graphFromPolylines(candidateRoutes)[0])
+        _fallbackNetworks.put(key, network)
+    return network
 
 
 def _routeLengthKm(route: List[Dict[str, Any]]) -> float:
@@ -27,7 +43,19 @@ def _lengthToSafetyScore(lengthKm: float) -> float:
     return normalized
 
 
-def optimizeSafeRoute(candidateRoutes: List[List[Dict[str, Any]]]) -> Dict[str, Any]:
+def optimizeSafeRoute(
+    candidateRoutes: List[List[Dict[str, Any]]],
+    departureTime: Optional[str] = None,
+    riskWeight: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Rank candidate routes and route between their ends on the road graph.
+
+    With a ``departureTime`` the graph search minimises
+    length + riskWeight * risk for that hour instead of plain length, and
+    each candidate is ranked by that cost along its own snapped polyline
+    (``riskCost``). If the risk layer is unavailable the search uses plain
+    length and ``riskWeighted`` is False.
+    """
     try:
         if not candidateRoutes:
             return {
@@ -37,31 +65,46 @@ def optimizeSafeRoute(candidateRoutes: List[List[Dict[str, Any]]]) -> Dict[str,
                 "graphUsed": False,
             }
 
-        graph = buildRouteGraph(candidateRoutes)
+        network = getRoadNetwork()
+        roadNetworkUsed = network is not None
+        if network is None:
+            # No city graph on disk: route over the candidates themselves.
+            network = _fallbackNetwork(candidateRoutes)
+        departure = parseTimestamp(departureTime)
+        hour = departure.hour if departure else None
+        if riskWeight is None:
+            riskWeight = safeRouteConfig.riskWeight
+        graphResults = routeEndpoints(network, candidateRoutes, hour=hour, riskWeight=riskWeight)
+        riskWeighted = any(result["riskWeighted"] for result in graphResults)
+        # Candidates sharing endpoints share graphDistance, so rank each on its own geometry.
+        routeCosts = (
+            [network.polylineCost(route, hour=hour, riskWeight=riskWeight)["cost"] for route in candidateRoutes]
+            if riskWeighted
+            else None
+        )
 
         routeSummaries = []
         for index, route in enumerate(candidateRoutes):
             lengthKm = _routeLengthKm(route)
             safetyScore = _lengthToSafetyScore(lengthKm)
 
-            if len(route) >= 2:
-                startNode = (float(route[0]["lat"]), float(route[0]["lng"]))
-                endNode = (float(route[-1]["lat"]), float(route[-1]["lng"]))
-                graphDistance, graphPath = dijkstraShortestPath(graph, startNode, endNode)
-            else:
-                graphDistance, graphPath = float("inf"), []
-
             routeSummaries.append(
                 {
                     "index": index,
                     "lengthKm": lengthKm,
                     "safetyScore": safetyScore,
-                    "graphDistance": graphDistance,
-                    "graphPath": graphPath,
+                    "graphDistance": graphResults[index]["distance"],
+                    "graphLengthKm": graphResults[index]["lengthKm"],
+                    "graphPath": graphResults[index]["path"],
                 }
             )
+            if routeCosts is not None:
+                routeSummaries[-1]["riskCost"] = routeCosts[index]
 
-        routeSummaries.sort(key=lambda item: (-item["safetyScore"], item["lengthKm"]))
+        if riskWeighted:
+            routeSummaries.sort(key=lambda item: (item["riskCost"], item["lengthKm"]))
+        else:
+            routeSummaries.sort(key=lambda item: (-item["safetyScore"], item["lengthKm"]))
         bestSummary = routeSummaries[0]
 
         bestIndex = bestSummary["index"]
@@ -75,6 +118,8 @@ def optimizeSafeRoute(candidateRoutes: List[List[Dict[str, Any]]]) -> Dict[str,
             "bestRoute": bestRoute,
             "routes": routeSummaries,
             "graphUsed": True,
+            "roadNetworkUsed": roadNetworkUsed,
+            "riskWeighted": riskWeighted,
         }
     except Exception as error:
         logError("optimizeSafeRoute failed", error)
@@ -1,17 +1,75 @@
-from typing import Any, Dict, List
+import asyncio
+import math
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
 
 from config import sosRiskConfig
 from logging_utils import logError
-from utils import getSosRiskModel, normalizeScore
+from utils import getDeviceStateStore, getSosRiskModel, normalizeScore, parseTimestamp
+
+
+# Numeric device timestamps above this are epoch milliseconds, not seconds.
+_EPOCH_MILLISECONDS_FLOOR = 1e11
+
+
+def _sampleTime(value: Any) -> Optional[float]:
+    """Device time in epoch seconds, or None when absent or unreadable."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value) / 1000.0 if value >= _EPOCH_MILLISECONDS_FLOOR else float(value)
+    timestamp = parseTimestamp(value)
+    return timestamp.timestamp() if timestamp else None
+
+
+def recordSosSample(context: Dict[str, Any]) -> bool:
+    """Add a context carrying ``deviceId`` to the device store; False if it has none.
+
+    Scoring only reads the store, so each telemetry sample should be
+    recorded exactly once, before the contexts that should see it are scored.
+    """
+    deviceId = context.get("deviceId")
+    if deviceId is None:
+        return False
+    locationObject = context.get("location") or {}
+    lat = locationObject.get("lat", context.get("lat"))
+    lng = locationObject.get("lng", context.get("lng"))
+    getDeviceStateStore().addSample(
+        deviceId,
+        _sampleTime(context.get("timestamp")),
+        float(context.get("speedKmh", 0.0)),
+        lat=None if lat is None else float(lat),
+        lng=None if lng is None else float(lng),
+        unsafeProbability=context.get("unsafeProbability"),
+    )
+    return True
 
 
 def _extractRiskFeatures(context: Dict[str, Any]) -> List[float]:
+    deviceId = context.get("deviceId")
+    deviceFeatures = (getDeviceStateStore().features(deviceId) if deviceId is not None else None) or {}
     speedKmh = float(context.get("speedKmh", 0.0))
-    suddenStop = 1.0 if context.get("suddenStop", False) else 0.0
+    if context.get("suddenStop") is None:
+        suddenStop = deviceFeatures.get("suddenStop", 0.0)
+    else:
+        suddenStop = 1.0 if context["suddenStop"] else 0.0
     unsafeProbability = float(context.get("unsafeProbability", 0.0))
     timeInAppSeconds = float(context.get("timeInAppSeconds", 0.0)) / 600.0
+    dwellTime = deviceFeatures.get("dwellSeconds", 0.0) / 600.0
+    distanceFromSafeKm = deviceFeatures.get("distanceFromSafeKm", math.nan)
+    # Saturating in [0, 1): a few km from safety matters, a hundred more barely adds.
+    distanceFromSafe = 0.0 if math.isnan(distanceFromSafeKm) else 1.0 - math.exp(
+        -distanceFromSafeKm / sosRiskConfig.safeDistanceScaleKm
+    )
 
-    return [speedKmh / 80.0, suddenStop, unsafeProbability, timeInAppSeconds]
+    return [
+        speedKmh / 80.0,
+        suddenStop,
+        unsafeProbability,
+        timeInAppSeconds,
+        dwellTime,
+        distanceFromSafe,
+    ]
 
 
 def _riskLevel(score: float) -> str:
@@ -22,39 +80,169 @@ def _riskLevel(score: float) -> str:
     return "low"
 
 
+def _thresholds() -> Dict[str, float]:
+    return {
+        "high": sosRiskConfig.highRiskThreshold,
+        "medium": sosRiskConfig.mediumRiskThreshold,
+        "prompt": sosRiskConfig.triggerPromptThreshold,
+    }
+
+
+def _riskResult(score: float) -> Dict[str, Any]:
+    return {
+        "riskScore": score,
+        "riskLevel": _riskLevel(score),
+        "shouldPromptSos": score >= sosRiskConfig.triggerPromptThreshold,
+        "thresholds": _thresholds(),
+    }
+
+
+def _errorResult() -> Dict[str, Any]:
+    return {
+        "riskScore": 0.0,
+        "riskLevel": "low",
+        "shouldPromptSos": False,
+        "thresholds": _thresholds(),
+        "error": "sos risk prediction error",
+    }
+
+
 def predictSosRisk(context: Dict[str, Any]) -> Dict[str, Any]:
     try:
         model = getSosRiskModel()
         features = _extractRiskFeatures(context)
         rawProbability = float(model.predictProba(features))
-        score = normalizeScore(rawProbability, 0.0, 1.0)
-
-        level = _riskLevel(score)
-        shouldPromptSos = score >= sosRiskConfig.triggerPromptThreshold
-
-        return {
-            "riskScore": score,
-            "riskLevel": level,
-            "shouldPromptSos": shouldPromptSos,
-            "thresholds": {
-                "high": sosRiskConfig.highRiskThreshold,
-                "medium": sosRiskConfig.mediumRiskThreshold,
-                "prompt": sosRiskConfig.triggerPromptThreshold,
-            },
-        }
+        return _riskResult(normalizeScore(rawProbability, 0.0, 1.0))
     except Exception as error:
         logError("predictSosRisk failed", error)
-        return {
-            "riskScore": 0.0,
-            "riskLevel": "low",
-            "shouldPromptSos": False,
-            "thresholds": {
-                "high": sosRiskConfig.highRiskThreshold,
-                "medium": sosRiskConfig.mediumRiskThreshold,
-                "prompt": sosRiskConfig.triggerPromptThreshold,
-            },
-            "error": "sos risk prediction error",
-        }
+        return _errorResult()
+
+
+def predictSosRiskBatch(contexts: Sequence[Dict[str, Any]], record: bool = False) -> List[Dict[str, Any]]:
+    """``predictSosRisk`` for many contexts with one vectorized model call.
+
+    A context whose features cannot be read gets the error result without
+    failing the rest; ``deviceId`` is copied into each result when present.
+    With ``record`` each context is passed to ``recordSosSample`` just before
+    its features are read, so it sees the device's earlier samples in order.
+    """
+    rows: List[List[float]] = []
+    validIndexes: List[int] = []
+    results: List[Dict[str, Any]] = []
+    for index, context in enumerate(contexts):
+        try:
+            if record:
+                recordSosSample(context)
+            rows.append(_extractRiskFeatures(context))
+            validIndexes.append(index)
+            results.append({})
+        except Exception as error:
+            logError("predictSosRisk failed", error)
+            results.append(_errorResult())
+    if rows:
+        try:
+            scores = np.clip(getSosRiskModel().predictProbaBatch(np.array(rows, dtype=float)), 0.0, 1.0).tolist()
+            for index, score in zip(validIndexes, scores):
+                results[index] = _riskResult(score)
+        except Exception as error:
+            logError("predictSosRiskBatch failed", error)
+            for index in validIndexes:
+                results[index] = _errorResult()
+    for context, result in zip(contexts, results):
+        if isinstance(context, dict) and "deviceId" in context:
+            result["deviceId"] = context["deviceId"]
+    return results
+
+
+def streamSosRisk(
+    contexts: Iterable[Dict[str, Any]],
+    batchSize: Optional[int] = None,
+    maxDelaySeconds: Optional[float] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Score a stream of sensor contexts in micro-batches, results in input order.
+
+    A batch is scored when it holds ``batchSize`` contexts or its first
+    context is ``maxDelaySeconds`` old. The generator only reads the next
+    context when the consumer asks for more results, so a slow consumer
+    slows the source and at most one batch is held in memory. The age check
+    runs as contexts arrive, since a blocking iterator cannot be
+    interrupted; use ``streamSosRiskAsync`` for flushes on a timer. Each
+    context is a telemetry sample and is recorded in the device store.
+    """
+    batchSize = batchSize or sosRiskConfig.streamBatchSize
+    maxDelaySeconds = sosRiskConfig.streamMaxDelaySeconds if maxDelaySeconds is None else maxDelaySeconds
+    batch: List[Dict[str, Any]] = []
+    startedAt = 0.0
+    for context in contexts:
+        if not batch:
+            startedAt = time.monotonic()
+        batch.append(context)
+        if len(batch) >= batchSize or time.monotonic() - startedAt >= maxDelaySeconds:
+            yield from predictSosRiskBatch(batch, record=True)
+            batch = []
+    if batch:
+        yield from predictSosRiskBatch(batch, record=True)
+
+
+_STREAM_END = object()
+
+
+async def streamSosRiskAsync(
+    contexts: AsyncIterable[Dict[str, Any]],
+    batchSize: Optional[int] = None,
+    maxDelaySeconds: Optional[float] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Async ``streamSosRisk``: a batch is also flushed when its timer expires.
+
+    The source is drained into a queue of at most ``batchSize`` contexts; when
+    the consumer falls behind the queue fills and reading from the source
+    pauses, so memory stays at roughly two batches however fast devices
+    report. Errors raised by the source are re-raised after the contexts
+    read before them have been scored.
+    """
+    batchSize = batchSize or sosRiskConfig.streamBatchSize
+    maxDelaySeconds = sosRiskConfig.streamMaxDelaySeconds if maxDelaySeconds is None else maxDelaySeconds
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=batchSize)
+
+    async def produce() -> None:
+        # Not in a finally: once cancelled the consumer has stopped reading and
+        # a put on a full queue would never return.
+        try:
+            async for context in contexts:
+                await queue.put(context)
+        except Exception:
+            await queue.put(_STREAM_END)
+            raise
+        await queue.put(_STREAM_END)
+
+    producer = asyncio.create_task(produce())
+    try:
+        finished = False
+        while not finished:
+            context = await queue.get()
+            if context is _STREAM_END:
+                break
+            batch = [context]
+            deadline = loop.time() + maxDelaySeconds
+            while len(batch) < batchSize:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    context = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if context is _STREAM_END:
+                    finished = True
+                    break
+                batch.append(context)
+            for result in predictSosRiskBatch(batch, record=True):
+                yield result
+        await producer
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
 
 
 def getMockSosRiskInput() -> Dict[str, Any]:
@@ -1,7 +1,12 @@
-from typing import Any, Dict, List, Tuple
+import math
+import uuid
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
 
 from config import unsafeZoneConfig
 from logging_utils import logError
+from model_ai.heatmap import HeatmapAccumulator
 from utils import generateDummyHeatmap, getUnsafeZoneModel, parseTimestamp
 
 
@@ -22,57 +27,161 @@ def _extractFeatures(locationItem: Dict[str, Any]) -> List[float]:
     return [normalizedHour, recentIncidents, crowdScore, 1.0]
 
 
-def predictUnsafeZones(locations: List[Dict[str, Any]]) -> Dict[str, Any]:
-    try:
-        model = getUnsafeZoneModel()
-        alertList: List[Dict[str, Any]] = []
-        scoreList: List[Dict[str, Any]] = []
-        heatmapPoints: List[Tuple[float, float, float]] = []
-
-        for index, locationItem in enumerate(locations):
-            locationObject = locationItem.get("location", {})
-            latValue = float(locationObject.get("lat", 0.0))
-            lngValue = float(locationObject.get("lng", 0.0))
-
-            featureVector = _extractFeatures(locationItem)
-            unsafeProbability = float(model.predictProba(featureVector))
-            isUnsafe = unsafeProbability >= unsafeZoneConfig.probabilityThreshold
-
-            alertId = locationItem.get("id") or f"unsafe-{index}"
-            timestampValue = locationItem.get("timestamp")
-            descriptionValue = locationItem.get("description") or "Unsafe zone detected by model"
-
-            alert = {
-                "id": alertId,
-                "type": unsafeZoneConfig.defaultAlertType,
-                "severity": unsafeZoneConfig.defaultSeverity if isUnsafe else "medium",
-                "timestamp": timestampValue,
-                "location": {"lat": latValue, "lng": lngValue},
-                "description": descriptionValue,
-            }
-            alertList.append(alert)
-
-            scoreList.append(
+def unsafeZoneFeatureMatrix(hours: Any, recentIncidents: Any, crowdScores: Any) -> np.ndarray:
+    """(N, 4) model features: normalized hour, incidents, crowd score and a bias column."""
+    hours = np.asarray(hours, dtype=float).reshape(-1)
+    features = np.ones((hours.size, 4), dtype=float)
+    features[:, 0] = hours / 23.0
+    features[:, 1] = np.broadcast_to(np.asarray(recentIncidents, dtype=float), hours.shape)
+    features[:, 2] = np.broadcast_to(np.asarray(crowdScores, dtype=float), hours.shape)
+    return features
+
+
+class UnsafeZoneBatch:
+    """Columnar unsafe-zone predictions; per-item dicts are built on first access.
+
+    ``probabilities`` and ``isUnsafe`` are arrays aligned with ``lats`` and
+    ``lngs``. Callers that only need the numbers never pay for ``alerts``,
+    ``scores`` or ``heatmap``.
+    """
+
+    def __init__(
+        self,
+        lats: np.ndarray,
+        lngs: np.ndarray,
+        probabilities: np.ndarray,
+        ids: Optional[Sequence[Any]] = None,
+        timestamps: Optional[Sequence[Any]] = None,
+        descriptions: Optional[Sequence[Any]] = None,
+    ) -> None:
+        self.lats = lats
+        self.lngs = lngs
+        self.probabilities = probabilities
+        self.isUnsafe = probabilities >= unsafeZoneConfig.probabilityThreshold
+        self._ids = ids
+        self._timestamps = timestamps
+        self._descriptions = descriptions
+        self._alerts: Optional[List[Dict[str, Any]]] = None
+        self._scores: Optional[List[Dict[str, Any]]] = None
+        self._heatmap: Optional[Dict[str, Any]] = None
+
+    def __len__(self) -> int:
+        return int(self.probabilities.size)
+
+    def _column(self, values: Optional[Sequence[Any]]) -> Sequence[Any]:
+        return values if values is not None else [None] * len(self)
+
+    @property
+    def ids(self) -> List[Any]:
+        return [alertId or f"unsafe-{index}" for index, alertId in enumerate(self._column(self._ids))]
+
+    @property
+    def alerts(self) -> List[Dict[str, Any]]:
+        if self._alerts is None:
+            self._alerts = [
                 {
                     "id": alertId,
-                    "unsafeProbability": unsafeProbability,
-                    "isUnsafe": isUnsafe,
+                    "type": unsafeZoneConfig.defaultAlertType,
+                    "severity": unsafeZoneConfig.defaultSeverity if isUnsafe else "medium",
+                    "timestamp": timestamp,
+                    "location": {"lat": lat, "lng": lng},
+                    "description": description or "Unsafe zone detected by model",
                 }
+                for alertId, isUnsafe, timestamp, lat, lng, description in zip(
+                    self.ids,
+                    self.isUnsafe.tolist(),
+                    self._column(self._timestamps),
+                    self.lats.tolist(),
+                    self.lngs.tolist(),
+                    self._column(self._descriptions),
+                )
+            ]
+        return self._alerts
+
+    @property
+    def scores(self) -> List[Dict[str, Any]]:
+        if self._scores is None:
+            self._scores = [
+                {"id": alertId, "unsafeProbability": probability, "isUnsafe": isUnsafe}
+                for alertId, probability, isUnsafe in zip(
+                    self.ids, self.probabilities.tolist(), self.isUnsafe.tolist()
+                )
+            ]
+        return self._scores
+
+    @property
+    def heatmap(self) -> Dict[str, Any]:
+        if self._heatmap is None:
+            self._heatmap = generateDummyHeatmap(
+                np.column_stack([self.lats, self.lngs, self.probabilities]),
+                gridSize=unsafeZoneConfig.heatmapGridSize,
+                bounds=unsafeZoneConfig.heatmapBounds,
             )
-
-            heatmapPoints.append((latValue, lngValue, unsafeProbability))
-
-        heatmap = generateDummyHeatmap(
-            heatmapPoints,
-            gridSize=unsafeZoneConfig.heatmapGridSize,
-            bounds=unsafeZoneConfig.heatmapBounds,
+        return self._heatmap
+
+    def toDict(self) -> Dict[str, Any]:
+        return {"alerts": self.alerts, "scores": self.scores, "heatmap": self.heatmap}
+
+
+def predictUnsafeZonesBatch(columns: Mapping[str, Any]) -> UnsafeZoneBatch:
+    """Score columns of locations with one matrix-vector product.
+
+    ``columns`` maps names to equal-length arrays (a dict of arrays or a
+    DataFrame both work): ``lat`` and ``lng`` are required; ``hour``,
+    ``recentIncidents`` and ``crowdScore`` default to 0, 0 and 0.5. An
+    (N, k) ``features`` matrix replaces those three. Optional ``id``,
+    ``timestamp`` and ``description`` columns are carried into the alerts.
+    """
+    lats = np.asarray(columns["lat"], dtype=float).reshape(-1)
+    lngs = np.asarray(columns["lng"], dtype=float).reshape(-1)
+    if lngs.size != lats.size:
+        raise ValueError("lat and lng columns must have the same length")
+    if "features" in columns:
+        features = np.asarray(columns["features"], dtype=float).reshape(lats.size, -1)
+    else:
+        features = unsafeZoneFeatureMatrix(
+            columns["hour"] if "hour" in columns else np.zeros(lats.size),
+            columns["recentIncidents"] if "recentIncidents" in columns else 0.0,
+            columns["crowdScore"] if "crowdScore" in columns else 0.5,
         )
+    return UnsafeZoneBatch(
+        lats,
+        lngs,
+        getUnsafeZoneModel().predictProbaBatch(features),
+        ids=list(columns["id"]) if "id" in columns else None,
+        timestamps=list(columns["timestamp"]) if "timestamp" in columns else None,
+        descriptions=list(columns["description"]) if "description" in columns else None,
+    )
+
+
+def _locationColumns(locations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    rows = [_extractFeatures(locationItem) for locationItem in locations]
+    # Zero padding leaves the dot product unchanged for short custom vectors.
+    features = np.zeros((len(rows), max((len(row) for row in rows), default=4)), dtype=float)
+    for index, row in enumerate(rows):
+        features[index, : len(row)] = row
+    locationObjects = [locationItem.get("location", {}) for locationItem in locations]
+    return {
+        "lat": [float(locationObject.get("lat", 0.0)) for locationObject in locationObjects],
+        "lng": [float(locationObject.get("lng", 0.0)) for locationObject in locationObjects],
+        "features": features,
+        "id": [locationItem.get("id") for locationItem in locations],
+        "timestamp": [locationItem.get("timestamp") for locationItem in locations],
+        "description": [locationItem.get("description") for locationItem in locations],
+    }
+
+
+def _hasFiniteLocation(locationItem: Dict[str, Any]) -> bool:
+    locationObject = locationItem.get("location") or {}
+    try:
+        return math.isfinite(float(locationObject["lat"])) and math.isfinite(float(locationObject["lng"]))
+    except (KeyError, TypeError, ValueError):
+        return False
 
-        return {
-            "alerts": alertList,
-            "scores": scoreList,
-            "heatmap": heatmap,
-        }
+
+def predictUnsafeZones(locations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    try:
+        return predictUnsafeZonesBatch(_locationColumns(locations)).toDict()
     except Exception as error:
         logError("predictUnsafeZones failed", error)
         return {
@@ -83,6 +192,41 @@ def predictUnsafeZones(locations: List[Dict[str, Any]]) -> Dict[str, Any]:
         }
 
 
+def createUnsafeZoneHeatmap() -> HeatmapAccumulator:
+    """Empty live heatmap using the configured grid size and bounds.
+
+    With ``heatmapBounds`` configured its snapshot matches the ``heatmap`` of
+    ``predictUnsafeZones`` on the same locations. Without them there is no
+    data extent to infer, so the grid grows from the first point instead.
+    """
+    gridSize = unsafeZoneConfig.heatmapGridSize
+    if unsafeZoneConfig.heatmapBounds is not None:
+        return HeatmapAccumulator(gridSize, bounds=unsafeZoneConfig.heatmapBounds)
+    return HeatmapAccumulator(gridSize + gridSize % 2)
+
+
+def addUnsafeZonesToHeatmap(
+    heatmap: HeatmapAccumulator, locations: List[Dict[str, Any]]
+) -> List[Optional[Dict[str, Any]]]:
+    """Score only the new locations and fold them into a live heatmap.
+
+    Locations are keyed by ``id``, so re-adding an id moves its point and
+    ``heatmap.remove(id)`` retracts it; a location without one gets a unique
+    ``unsafe-<hex>`` key, returned as its score's ``id``. The result has one
+    entry per location, None where the location has no finite lat and lng.
+    """
+    validIndexes = [index for index, locationItem in enumerate(locations) if _hasFiniteLocation(locationItem)]
+    batch = predictUnsafeZonesBatch(_locationColumns([locations[index] for index in validIndexes]))
+    results: List[Optional[Dict[str, Any]]] = [None] * len(locations)
+    for index, score, lat, lng in zip(validIndexes, batch.scores, batch.lats.tolist(), batch.lngs.tolist()):
+        if not locations[index].get("id"):
+            # Batch fallback ids restart at 0 per call and would overwrite earlier points.
+            score["id"] = f"unsafe-{uuid.uuid4().hex}"
+        heatmap.add(score["id"], lat, lng, score["unsafeProbability"])
+        results[index] = score
+    return results
+
+
 def getMockUnsafeZoneInput() -> List[Dict[str, Any]]:
     return [
         {
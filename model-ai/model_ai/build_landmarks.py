@@ -0,0 +1,29 @@
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from .landmarks import buildLandmarkTable, defaultLandmarkPath, saveLandmarkTable
+from .road_graph import defaultRoadGraphPath, loadRoadGraph
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Precompute ALT landmark distances for a serialized road graph.
+
+    Usage: python -m model_ai.build_landmarks [road_graph.npz] [landmarkCount]
+
+    The table is written next to the graph and must be rebuilt whenever the
+    graph is; a stale table is ignored at query time.
+    """
+    args = sys.argv[1:] if argv is None else argv
+    graphPath = Path(args[0]) if args else defaultRoadGraphPath()
+    count = int(args[1]) if len(args) > 1 else 16
+    graph = loadRoadGraph(graphPath)
+    if graph is None:
+        raise SystemExit(f"No road graph at {graphPath}; run model_ai.build_road_graph first")
+    table = buildLandmarkTable(graph, count)
+    outputPath = saveLandmarkTable(table, defaultLandmarkPath(graphPath if args else None))
+    print(f"Saved {table.landmarkCount} landmarks for {graph.nodeCount} nodes to {outputPath}")
+
+
+if __name__ == "__main__":
+    main()
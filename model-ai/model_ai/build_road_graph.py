@@ -0,0 +1,26 @@
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from .road_graph import defaultRoadGraphPath, graphFromPolylines, saveRoadGraph
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Serialize a road graph from a JSON list of ``[{"lat", "lng"}, ...]`` polylines.
+
+    Usage: python -m model_ai.build_road_graph streets.json [output.npz]
+    """
+    args = sys.argv[1:] if argv is None else argv
+    if not args:
+        raise SystemExit("usage: python -m model_ai.build_road_graph streets.json [output.npz]")
+    polylines = json.loads(Path(args[0]).read_text(encoding="utf-8"))
+    if not isinstance(polylines, list):
+        raise SystemExit(f"Expected a list of polylines in {args[0]}")
+    graph, _ = graphFromPolylines(polylines)
+    outputPath = saveRoadGraph(graph, Path(args[1]) if len(args) > 1 else defaultRoadGraphPath())
+    print(f"Saved road graph ({graph.nodeCount} nodes, {graph.edgeCount} edges) to {outputPath}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from .geo import greatCircleKm
+
+
+class DeviceStateStore:
+    """Rolling window of recent telemetry per device, in flat NumPy arrays.
+
+    Each device owns one slot: a row of ``windowSize``-long ring buffers for
+    sample time and speed, plus per-slot running values from which the
+    derived features are read. ``addSample`` is O(1): it overwrites the
+    oldest ring entry, adjusts the running speed sum and updates
+    deceleration, dwell start, the last known position and the last safe
+    spot in place. Methods are safe to call from several threads.
+
+    Sample timestamps come from the device and only feed deceleration and
+    dwell, so they need only be consistent per device. Idleness is measured
+    on the store's own ``clock`` (``time.monotonic`` by default): devices not
+    heard from for ``ttlSeconds`` of server time are evicted and their slots
+    reused, whatever their devices report.
+    """
+
+    def __init__(
+        self,
+        windowSize: int = 16,
+        ttlSeconds: float = 900.0,
+        initialCapacity: int = 1024,
+        stopSpeedKmh: float = 3.0,
+        suddenStopDecelKmhPerS: float = 8.0,
+        safeProbability: float = 0.3,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if windowSize < 2:
+            raise ValueError("windowSize must be at least 2")
+        if ttlSeconds <= 0:
+            raise ValueError("ttlSeconds must be positive")
+        self.windowSize = int(windowSize)
+        self.ttlSeconds = float(ttlSeconds)
+        self.stopSpeedKmh = float(stopSpeedKmh)
+        self.suddenStopDecelKmhPerS = float(suddenStopDecelKmhPerS)
+        self.safeProbability = float(safeProbability)
+        self._clock = clock
+        self._lock = threading.RLock()
+        capacity = max(1, int(initialCapacity))
+        self._times = np.zeros((capacity, self.windowSize), dtype=float)
+        self._speeds = np.zeros((capacity, self.windowSize), dtype=float)
+        self._heads = np.zeros(capacity, dtype=np.int64)
+        self._counts = np.zeros(capacity, dtype=np.int64)
+        self._speedSums = np.zeros(capacity, dtype=float)
+        self._lastSeen = np.full(capacity, -np.inf)
+        self._decelerations = np.zeros(capacity, dtype=float)
+        self._stoppedSince = np.full(capacity, np.nan)
+        self._lastLats = np.full(capacity, np.nan)
+        self._lastLngs = np.full(capacity, np.nan)
+        self._safeLats = np.full(capacity, np.nan)
+        self._safeLngs = np.full(capacity, np.nan)
+        self._slotById: Dict[str, int] = {}
+        self._idBySlot: List[Optional[str]] = []
+        self._freeSlots: List[int] = []
+        self._lastEviction = -np.inf
+
+    def __len__(self) -> int:
+        return len(self._slotById)
+
+    def __contains__(self, deviceId: object) -> bool:
+        return deviceId in self._slotById
+
+    def _growArrays(self) -> None:
+        capacity = self._heads.size * 2
+        for name in ("_times", "_speeds"):
+            current = getattr(self, name)
+            grown = np.zeros((capacity, self.windowSize), dtype=float)
+            grown[: current.shape[0]] = current
+            setattr(self, name, grown)
+        for name, fill in (
+            ("_heads", 0),
+            ("_counts", 0),
+            ("_speedSums", 0.0),
+            ("_lastSeen", -np.inf),
+            ("_decelerations", 0.0),
+            ("_stoppedSince", np.nan),
+            ("_lastLats", np.nan),
+            ("_lastLngs", np.nan),
+            ("_safeLats", np.nan),
+            ("_safeLngs", np.nan),
+        ):
+            current = getattr(self, name)
+            grown = np.full(capacity, fill, dtype=current.dtype)
+            grown[: current.size] = current
+            setattr(self, name, grown)
+
+    def _allocateSlot(self, deviceId: str) -> int:
+        if self._freeSlots:
+            slot = self._freeSlots.pop()
+            self._idBySlot[slot] = deviceId
+        else:
+            slot = len(self._idBySlot)
+            if slot >= self._heads.size:
+                self._growArrays()
+            self._idBySlot.append(deviceId)
+        self._heads[slot] = 0
+        self._counts[slot] = 0
+        self._speedSums[slot] = 0.0
+        self._decelerations[slot] = 0.0
+        self._stoppedSince[slot] = np.nan
+        self._lastLats[slot] = np.nan
+        self._lastLngs[slot] = np.nan
+        self._safeLats[slot] = np.nan
+        self._safeLngs[slot] = np.nan
+        self._slotById[deviceId] = slot
+        return slot
+
+    def addSample(
+        self,
+        deviceId: str,
+        timestamp: Optional[float],
+        speedKmh: float,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+        unsafeProbability: Optional[float] = None,
+    ) -> None:
+        """Record one sample; a position with low ``unsafeProbability`` becomes the safe spot.
+
+        Without a device ``timestamp`` the sample is placed after the
+        device's previous one by the server time elapsed since it arrived.
+        """
+        deviceId = str(deviceId)
+        speedKmh = float(speedKmh)
+        with self._lock:
+            now = float(self._clock())
+            if now - self._lastEviction >= self.ttlSeconds / 4.0:
+                self.evictIdle(now)
+            slot = self._slotById.get(deviceId)
+            if slot is None:
+                slot = self._allocateSlot(deviceId)
+            count = int(self._counts[slot])
+            head = int(self._heads[slot])
+            previous = (head - 1) % self.windowSize
+            if timestamp is not None:
+                timestamp = float(timestamp)
+            elif count:
+                timestamp = float(self._times[slot, previous]) + now - float(self._lastSeen[slot])
+            else:
+                timestamp = now
+            if count:
+                elapsed = timestamp - self._times[slot, previous]
+                drop = self._speeds[slot, previous] - speedKmh
+                self._decelerations[slot] = drop / elapsed if elapsed > 0 and drop > 0 else 0.0
+            if count == self.windowSize:
+                self._speedSums[slot] -= self._speeds[slot, head]
+            else:
+                self._counts[slot] = count + 1
+            self._times[slot, head] = timestamp
+            self._speeds[slot, head] = speedKmh
+            self._heads[slot] = (head + 1) % self.windowSize
+            self._speedSums[slot] += speedKmh
+            self._lastSeen[slot] = now
+            if speedKmh >= self.stopSpeedKmh:
+                self._stoppedSince[slot] = np.nan
+            elif math.isnan(self._stoppedSince[slot]):
+                self._stoppedSince[slot] = timestamp
+            if lat is not None and lng is not None:
+                self._lastLats[slot] = float(lat)
+                self._lastLngs[slot] = float(lng)
+                if unsafeProbability is not None and float(unsafeProbability) <= self.safeProbability:
+                    self._safeLats[slot] = float(lat)
+                    self._safeLngs[slot] = float(lng)
+
+    def features(self, deviceId: str) -> Optional[Dict[str, float]]:
+        """Derived features at the latest sample; None for an unknown device.
+
+        ``dwellSeconds`` is how long the device has been below
+        ``stopSpeedKmh`` and ``distanceFromSafeKm`` runs from the last known
+        position to the safe spot, NaN until both are known.
+        """
+        with self._lock:
+            slot = self._slotById.get(str(deviceId))
+            if slot is None:
+                return None
+            latest = (int(self._heads[slot]) - 1) % self.windowSize
+            timestamp = float(self._times[slot, latest])
+            speedKmh = float(self._speeds[slot, latest])
+            deceleration = float(self._decelerations[slot])
+            stoppedSince = float(self._stoppedSince[slot])
+            lat, lng = float(self._lastLats[slot]), float(self._lastLngs[slot])
+            safeLat, safeLng = float(self._safeLats[slot]), float(self._safeLngs[slot])
+            meanSpeedKmh = float(self._speedSums[slot] / self._counts[slot])
+            sampleCount = float(self._counts[slot])
+        distanceFromSafeKm = math.nan
+        if not (math.isnan(lat) or math.isnan(safeLat)):
+            distanceFromSafeKm = greatCircleKm(lat, lng, safeLat, safeLng)
+        return {
+            "speedKmh": speedKmh,
+            "meanSpeedKmh": meanSpeedKmh,
+            "decelerationKmhPerS": deceleration,
+            "dwellSeconds": 0.0 if math.isnan(stoppedSince) else timestamp - stoppedSince,
+            "distanceFromSafeKm": distanceFromSafeKm,
+            "suddenStop": float(deceleration >= self.suddenStopDecelKmhPerS and speedKmh < self.stopSpeedKmh),
+            "sampleCount": sampleCount,
+        }
+
+    def recentSpeeds(self, deviceId: str) -> np.ndarray:
+        """Buffered speeds for a device, oldest first."""
+        with self._lock:
+            slot = self._slotById[str(deviceId)]
+            count = int(self._counts[slot])
+            order = (int(self._heads[slot]) - count + np.arange(count)) % self.windowSize
+            return self._speeds[slot, order].copy()
+
+    def remove(self, deviceId: str) -> bool:
+        with self._lock:
+            slot = self._slotById.pop(str(deviceId), None)
+            if slot is None:
+                return False
+            self._idBySlot[slot] = None
+            self._lastSeen[slot] = -np.inf
+            self._freeSlots.append(slot)
+            return True
+
+    def evictIdle(self, now: Optional[float] = None) -> int:
+        """Drop devices idle for more than ``ttlSeconds`` of store clock time; returns how many."""
+        with self._lock:
+            now = float(self._clock()) if now is None else float(now)
+            self._lastEviction = now
+            used = len(self._idBySlot)
+            idleSlots = np.flatnonzero(self._lastSeen[:used] < now - self.ttlSeconds)
+            evicted = 0
+            for slot in idleSlots.tolist():
+                deviceId = self._idBySlot[slot]
+                if deviceId is not None:
+                    self.remove(deviceId)
+                    evicted += 1
+            return evicted
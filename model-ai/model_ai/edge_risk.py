@@ -0,0 +1,160 @@
+import math
+from typing import Callable, Optional
+
+import numpy as np
+
+from .geo import KM_PER_DEGREE
+from .memo import LruCache
+from .road_graph import RoadGraph
+
+
+Scorer = Callable[[np.ndarray], np.ndarray]
+
+DAYS = 7
+HOURS = 24
+MEDIUM_SEVERITY_CODE = 1
+
+
+def alertCountsNear(
+    lats: np.ndarray,
+    lngs: np.ndarray,
+    alertLats: np.ndarray,
+    alertLngs: np.ndarray,
+    radiusKm: float,
+) -> np.ndarray:
+    """Alerts in the 3x3 block of ``radiusKm`` cells around each point.
+
+    Alerts are bucketed into square cells once and each query point sums its
+    nine neighbouring buckets, so the cost is O((points + alerts) log alerts)
+    with no per-point Python work. Every alert within ``radiusKm`` is counted,
+    plus some up to about 2.8x that distance.
+    """
+    lats = np.asarray(lats, dtype=float)
+    counts = np.zeros(lats.size, dtype=np.int64)
+    alertLats = np.asarray(alertLats, dtype=float)
+    if alertLats.size == 0 or lats.size == 0:
+        return counts
+    latCellDeg = radiusKm / KM_PER_DEGREE
+    lngCellDeg = latCellDeg / max(math.cos(math.radians(float(np.mean(alertLats)))), 1e-6)
+
+    def cellKeys(rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        # Offset into non-negative range and pack (row, col) into one int64.
+        return (rows + (1 << 31)) * (1 << 32) + (cols + (1 << 31))
+
+    alertRows = np.floor(alertLats / latCellDeg).astype(np.int64)
+    alertCols = np.floor(np.asarray(alertLngs, dtype=float) / lngCellDeg).astype(np.int64)
+    keys, keyCounts = np.unique(cellKeys(alertRows, alertCols), return_counts=True)
+    rows = np.floor(lats / latCellDeg).astype(np.int64)
+    cols = np.floor(np.asarray(lngs, dtype=float) / lngCellDeg).astype(np.int64)
+    for rowOffset in (-1, 0, 1):
+        for colOffset in (-1, 0, 1):
+            queryKeys = cellKeys(rows + rowOffset, cols + colOffset)
+            positions = np.minimum(np.searchsorted(keys, queryKeys), keys.size - 1)
+            found = keys[positions] == queryKeys
+            counts[found] += keyCounts[positions[found]]
+    return counts
+
+
+def _defaultScorer(features: np.ndarray) -> np.ndarray:
+    from .inference import scoreUnsafeFeatures
+
+    return scoreUnsafeFeatures(features)
+
+
+def hourBucket(hour: int, bucketCount: int) -> int:
+    """Bucket of ``bucketCount`` equal slices of the day that ``hour`` falls in."""
+    return (int(hour) % HOURS) * bucketCount // HOURS
+
+
+class EdgeRiskLayer:
+    """Per-edge risk rates for a road graph, by hour-of-day bucket.
+
+    An edge's risk rate in [0, 1] blends the unsafe-zone score at its
+    midpoint (averaged over the hours of the bucket and the days of the week)
+    with the density of alerts around it. Rates live in one float32
+    ``riskTable`` of edges x buckets, filled a bucket at a time on first use,
+    so memory is fixed at ``4 * edgeCount * bucketCount`` bytes.
+
+    Costs are ``length + riskWeight * risk`` where ``risk`` is the rate times
+    the length, i.e. ``length * (1 + riskWeight * rate)``: never below the
+    length, so the A* great-circle heuristic stays admissible.
+    """
+
+    def __init__(
+        self,
+        graph: RoadGraph,
+        alertLats: Optional[np.ndarray] = None,
+        alertLngs: Optional[np.ndarray] = None,
+        scorer: Optional[Scorer] = None,
+        bucketCount: int = HOURS,
+        unsafeWeight: float = 0.7,
+        alertRadiusKm: float = 0.2,
+        alertDensityScale: float = 3.0,
+        maxWeightedGraphs: int = 8,
+    ) -> None:
+        if not 0.0 <= unsafeWeight <= 1.0:
+            raise ValueError("unsafeWeight must be between 0 and 1")
+        if not 1 <= bucketCount <= HOURS:
+            raise ValueError(f"bucketCount must be between 1 and {HOURS}")
+        self.graph = graph
+        self.bucketCount = bucketCount
+        self.unsafeWeight = unsafeWeight
+        self._scorer = scorer or _defaultScorer
+        sources = graph.sources
+        self._midLats = (graph.lats[sources] + graph.lats[graph.targets]) / 2.0
+        self._midLngs = (graph.lngs[sources] + graph.lngs[graph.targets]) / 2.0
+        if alertLats is None or alertLngs is None:
+            alertLats = alertLngs = np.zeros(0)
+        counts = alertCountsNear(self._midLats, self._midLngs, alertLats, alertLngs, alertRadiusKm)
+        # Saturates towards 1 as alerts pile up; alertDensityScale alerts give ~0.63.
+        self._alertRisk = 1.0 - np.exp(-counts / alertDensityScale)
+        self.riskTable = np.zeros((graph.edgeCount, bucketCount), dtype=np.float32)
+        self._filled = np.zeros(bucketCount, dtype=bool)
+        self._weightedGraphs = LruCache(maxWeightedGraphs)
+
+    def bucketHours(self, bucket: int) -> range:
+        return range(-(-bucket * HOURS // self.bucketCount), -(-(bucket + 1) * HOURS // self.bucketCount))
+
+    def _unsafeScores(self, hours: range) -> np.ndarray:
+        edgeCount = self._midLats.size
+        total = np.zeros(edgeCount, dtype=float)
+        features = np.empty((edgeCount, 5), dtype=float)
+        features[:, 0] = self._midLats
+        features[:, 1] = self._midLngs
+        features[:, 4] = MEDIUM_SEVERITY_CODE
+        for hour in hours:
+            features[:, 2] = hour
+            for day in range(DAYS):
+                features[:, 3] = day
+                total += self._scorer(features)
+        return total / (DAYS * len(hours))
+
+    def riskRates(self, hour: int) -> np.ndarray:
+        """Per-edge risk rates (a float32 column view) for the bucket of ``hour``."""
+        bucket = hourBucket(hour, self.bucketCount)
+        if not self._filled[bucket]:
+            unsafe = self._unsafeScores(self.bucketHours(bucket))
+            self.riskTable[:, bucket] = self.unsafeWeight * unsafe + (1.0 - self.unsafeWeight) * self._alertRisk
+            self._filled[bucket] = True
+        return self.riskTable[:, bucket]
+
+    def precompute(self) -> None:
+        """Fill every bucket now instead of on first use."""
+        for bucket in range(self.bucketCount):
+            self.riskRates(self.bucketHours(bucket)[0])
+
+    def weights(self, hour: int, riskWeight: float) -> np.ndarray:
+        return self.graph.lengthsKm * (1.0 + riskWeight * self.riskRates(hour).astype(float))
+
+    def weightedGraph(self, hour: int, riskWeight: float) -> RoadGraph:
+        """The graph costed for the bucket of ``hour``.
+
+        Recently used (bucket, riskWeight) graphs are kept, with their
+        adjacency lists, so repeated queries pay nothing extra.
+        """
+        key = (hourBucket(hour, self.bucketCount), float(riskWeight))
+        graph = self._weightedGraphs.get(key)
+        if graph is None:
+            graph = self.graph.withWeights(self.weights(hour, riskWeight))
+            self._weightedGraphs.put(key, graph)
+        return graph
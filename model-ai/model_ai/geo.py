@@ -0,0 +1,42 @@
+import math
+
+import numpy as np
+
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = EARTH_RADIUS_KM * np.pi / 180.0
+
+
+def haversineDistanceKm(latOne, lngOne, latTwo, lngTwo) -> np.ndarray:
+    """Vectorized haversine distance in km.
+
+    NumPy counterpart of ``greatCircleKm``, so a query point can be compared
+    against many points at once. Same formula as
+    ``data-engineering/utils/geospatial_utils.haversineDistance``, which
+    cannot be imported here because it pulls in pandas.
+    """
+    phiOne = np.radians(np.asarray(latOne, dtype=float))
+    phiTwo = np.radians(np.asarray(latTwo, dtype=float))
+    deltaPhi = phiTwo - phiOne
+    deltaLambda = np.radians(np.asarray(lngTwo, dtype=float) - np.asarray(lngOne, dtype=float))
+
+    valueA = np.sin(deltaPhi / 2.0) ** 2 + np.cos(phiOne) * np.cos(phiTwo) * np.sin(deltaLambda / 2.0) ** 2
+    valueC = 2.0 * np.arcsin(np.sqrt(np.clip(valueA, 0.0, 1.0)))
+    return EARTH_RADIUS_KM * valueC
+
+
+def greatCircleKm(latOne: float, lngOne: float, latTwo: float, lngTwo: float) -> float:
+    """Scalar haversine for per-node use inside search loops.
+
+    This is the one scalar implementation: ``model-ai/utils.haversineDistanceKm``
+    delegates here. The dependency cannot run the other way because
+    ``utils`` imports the top-level ``config`` and ``models`` modules, which
+    resolve to the backend's own modules once this package is loaded there.
+    """
+    phiOne = math.radians(latOne)
+    phiTwo = math.radians(latTwo)
+    valueA = (
+        math.sin((phiTwo - phiOne) / 2.0) ** 2
+        + math.cos(phiOne) * math.cos(phiTwo) * math.sin(math.radians(lngTwo - lngOne) / 2.0) ** 2
+    )
+    return EARTH_RADIUS_KM * 2.0 * math.asin(math.sqrt(min(1.0, max(0.0, valueA))))
@@ -0,0 +1,278 @@
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+Bounds = Tuple[float, float, float, float]
+
+
+def resolveBounds(lats: np.ndarray, lngs: np.ndarray, bounds: Optional[Bounds] = None) -> Bounds:
+    """Return (minLat, maxLat, minLng, maxLng), inferring from the data when not given."""
+    if bounds is None:
+        minLat, maxLat = float(np.min(lats)), float(np.max(lats))
+        minLng, maxLng = float(np.min(lngs)), float(np.max(lngs))
+    else:
+        minLat, maxLat, minLng, maxLng = (float(value) for value in bounds)
+    if maxLat == minLat:
+        maxLat += 1e-6
+    if maxLng == minLng:
+        maxLng += 1e-6
+    return minLat, maxLat, minLng, maxLng
+
+
+def binPoints(
+    lats: np.ndarray,
+    lngs: np.ndarray,
+    scores: np.ndarray,
+    gridSize: int,
+    bounds: Bounds,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Accumulate per-cell score sums and point counts on a gridSize x gridSize grid.
+
+    Rows follow latitude and columns longitude. Cell edges match the original
+    loop-based heatmap: ``int(fraction * (gridSize - 1))`` clipped to the grid.
+    """
+    minLat, maxLat, minLng, maxLng = bounds
+    rows = ((lats - minLat) / (maxLat - minLat) * (gridSize - 1)).astype(np.int64)
+    cols = ((lngs - minLng) / (maxLng - minLng) * (gridSize - 1)).astype(np.int64)
+    np.clip(rows, 0, gridSize - 1, out=rows)
+    np.clip(cols, 0, gridSize - 1, out=cols)
+    flat = rows * gridSize + cols
+    cellCount = gridSize * gridSize
+    sums = np.bincount(flat, weights=scores, minlength=cellCount).reshape(gridSize, gridSize)
+    counts = np.bincount(flat, minlength=cellCount).reshape(gridSize, gridSize)
+    return sums, counts
+
+
+def meanGrid(sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Per-cell mean score; empty cells are 0."""
+    return np.divide(sums, counts, out=np.zeros_like(sums, dtype=float), where=counts > 0)
+
+
+def computeHeatmap(
+    lats: np.ndarray,
+    lngs: np.ndarray,
+    scores: np.ndarray,
+    gridSize: int,
+    bounds: Optional[Bounds] = None,
+) -> Dict[str, Any]:
+    """Build a mean-score heatmap from coordinate and score arrays.
+
+    Returns ``grid`` (mean), ``sums`` and ``counts`` as ndarrays together with
+    the resolved ``bounds`` and ``gridSize``.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+    scores = np.asarray(scores, dtype=float)
+    if lats.size == 0:
+        zeros = np.zeros((gridSize, gridSize), dtype=float)
+        return {
+            "grid": zeros,
+            "sums": zeros.copy(),
+            "counts": np.zeros((gridSize, gridSize), dtype=np.int64),
+            "bounds": bounds or (0.0, 1.0, 0.0, 1.0),
+            "gridSize": gridSize,
+        }
+    resolved = resolveBounds(lats, lngs, bounds)
+    sums, counts = binPoints(lats, lngs, scores, gridSize, resolved)
+    return {
+        "grid": meanGrid(sums, counts),
+        "sums": sums,
+        "counts": counts,
+        "bounds": resolved,
+        "gridSize": gridSize,
+    }
+
+
+class HeatmapAccumulator:
+    """Live heatmap kept as running per-cell sums and counts.
+
+    Points are keyed by id so ``add`` and ``remove`` touch a single cell.
+    Cells follow ``binPoints`` exactly, so ``snapshot()`` equals
+    ``computeHeatmap`` run on the same points with the snapshot's bounds.
+
+    With configured ``bounds`` the grid is fixed and points outside it are
+    clipped into the edge cells, as ``computeHeatmap`` does. Without bounds
+    the grid starts ``initialSpanDeg`` wide around the first point and a
+    point beyond its cells doubles the extent towards it, merging 2x2 blocks
+    of old cells into the new ones, so earlier points never need rescanning.
+    Each point remembers the cell it was added to and the rebin it was added
+    after; ``remove`` replays the (few) later merges to find its cell.
+    """
+
+    # 0.01 degrees doubled 40 times spans the globe many times over.
+    MAX_REBINS = 40
+
+    def __init__(
+        self,
+        gridSize: int,
+        bounds: Optional[Bounds] = None,
+        initialSpanDeg: float = 0.01,
+        grow: Optional[bool] = None,
+    ) -> None:
+        self.grow = bounds is None if grow is None else bool(grow)
+        if gridSize < 2 or (self.grow and gridSize % 2):
+            raise ValueError("gridSize must be >= 2, and even for a growing heatmap")
+        if initialSpanDeg <= 0:
+            raise ValueError("initialSpanDeg must be positive")
+        self.gridSize = gridSize
+        self.initialSpanDeg = float(initialSpanDeg)
+        self.bounds: Optional[Bounds] = None if bounds is None else resolveBounds(np.zeros(0), np.zeros(0), bounds)
+        self.sums = np.zeros((gridSize, gridSize), dtype=float)
+        self.counts = np.zeros((gridSize, gridSize), dtype=np.int64)
+        self.version = 0
+        self._points: Dict[str, Tuple[int, int, int, float]] = {}
+        self._mergeOffsets: List[Tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, pointId: object) -> bool:
+        return pointId in self._points
+
+    @property
+    def rebins(self) -> int:
+        return len(self._mergeOffsets)
+
+    def _positions(self, lat: float, lng: float, bounds: Optional[Bounds] = None) -> Tuple[float, float]:
+        # Same expression as binPoints, so both truncate to the same cell.
+        minLat, maxLat, minLng, maxLng = bounds or self.bounds
+        return (
+            (lat - minLat) / (maxLat - minLat) * (self.gridSize - 1),
+            (lng - minLng) / (maxLng - minLng) * (self.gridSize - 1),
+        )
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        rowPosition, colPosition = self._positions(lat, lng)
+        return min(max(int(rowPosition), 0), self.gridSize - 1), min(max(int(colPosition), 0), self.gridSize - 1)
+
+    def _contains(self, lat: float, lng: float, bounds: Optional[Bounds] = None) -> bool:
+        """Whether (lat, lng) falls in a cell without clipping.
+
+        The cells are ``span / (gridSize - 1)`` wide from the minimum edge, so
+        they reach one cell past the nominal maximum.
+        """
+        rowPosition, colPosition = self._positions(lat, lng, bounds)
+        return 0 <= rowPosition < self.gridSize and 0 <= colPosition < self.gridSize
+
+    def _grownBounds(self, lat: float, lng: float, bounds: Bounds) -> Tuple[Bounds, int, int]:
+        """Bounds doubled towards (lat, lng) plus the row and column offset of the old cells.
+
+        Growing towards the minimum moves it back by ``gridSize`` old cells,
+        so each old cell lands inside one new cell: old row ``r`` becomes
+        ``r // 2`` plus the offset.
+        """
+        minLat, maxLat, minLng, maxLng = bounds
+        half = self.gridSize // 2
+        latSpan, lngSpan = maxLat - minLat, maxLng - minLng
+        rowPosition, colPosition = self._positions(lat, lng, bounds)
+        rowOffset = half if rowPosition < 0 else 0
+        colOffset = half if colPosition < 0 else 0
+        if rowOffset:
+            minLat -= latSpan * self.gridSize / (self.gridSize - 1)
+        maxLat = minLat + 2.0 * latSpan
+        if colOffset:
+            minLng -= lngSpan * self.gridSize / (self.gridSize - 1)
+        maxLng = minLng + 2.0 * lngSpan
+        return (minLat, maxLat, minLng, maxLng), rowOffset, colOffset
+
+    def _rebinsNeeded(self, lat: float, lng: float) -> int:
+        """Doublings needed to cover (lat, lng), checked before any state changes."""
+        if not self.grow:
+            return 0
+        bounds = self.bounds
+        for steps in range(self.MAX_REBINS + 1):
+            if self._contains(lat, lng, bounds):
+                return steps
+            bounds = self._grownBounds(lat, lng, bounds)[0]
+        raise ValueError(f"Point ({lat}, {lng}) is more than {self.MAX_REBINS} doublings outside the heatmap bounds")
+
+    def _grow(self, lat: float, lng: float) -> None:
+        """Double the extent towards (lat, lng), merging 2x2 cell blocks."""
+        half = self.gridSize // 2
+        bounds, rowOffset, colOffset = self._grownBounds(lat, lng, self.bounds)
+
+        def merge(cells: np.ndarray) -> np.ndarray:
+            merged = np.zeros_like(cells)
+            blocks = cells.reshape(half, 2, half, 2).sum(axis=(1, 3))
+            merged[rowOffset:rowOffset + half, colOffset:colOffset + half] = blocks
+            return merged
+
+        self.sums = merge(self.sums)
+        self.counts = merge(self.counts)
+        self.bounds = bounds
+        self._mergeOffsets.append((rowOffset, colOffset))
+
+    def add(self, pointId: str, lat: float, lng: float, score: float) -> None:
+        """Add a point, replacing any earlier point with the same id.
+
+        Raises ValueError for a non-finite coordinate or score, or a point
+        more than ``MAX_REBINS`` doublings away from the current bounds.
+        """
+        pointId = str(pointId)
+        lat, lng, score = float(lat), float(lng), float(score)
+        if not (math.isfinite(lat) and math.isfinite(lng) and math.isfinite(score)):
+            raise ValueError(f"Heatmap point {pointId!r} has a non-finite lat, lng or score")
+        if self.bounds is None:
+            halfSpan = self.initialSpanDeg / 2.0
+            self.bounds = (lat - halfSpan, lat + halfSpan, lng - halfSpan, lng + halfSpan)
+        rebins = self._rebinsNeeded(lat, lng)
+        if pointId in self._points:
+            self.remove(pointId)
+        for _ in range(rebins):
+            self._grow(lat, lng)
+        row, col = self._cell(lat, lng)
+        self.sums[row, col] += score
+        self.counts[row, col] += 1
+        self._points[pointId] = (row, col, self.rebins, float(score))
+        self.version += 1
+
+    def remove(self, pointId: str) -> bool:
+        point = self._points.pop(str(pointId), None)
+        if point is None:
+            return False
+        row, col, addedAfter, score = point
+        for rowOffset, colOffset in self._mergeOffsets[addedAfter:]:
+            row, col = row // 2 + rowOffset, col // 2 + colOffset
+        self.sums[row, col] -= score
+        self.counts[row, col] -= 1
+        if self.counts[row, col] == 0:
+            self.sums[row, col] = 0.0
+        self.version += 1
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of the current state in the ``computeHeatmap`` layout."""
+        sums = self.sums.copy()
+        counts = self.counts.copy()
+        return {
+            "grid": meanGrid(sums, counts),
+            "sums": sums,
+            "counts": counts,
+            "bounds": self.bounds or (0.0, 1.0, 0.0, 1.0),
+            "gridSize": self.gridSize,
+            "version": self.version,
+        }
+
+
+def exportHeatmapImage(heatmap: Dict[str, Any], path: Path, colorMap: str = "hot") -> Path:
+    """Render a heatmap grid to an image file. Needs matplotlib."""
+    import matplotlib.pyplot as plt
+
+    minLat, maxLat, minLng, maxLng = heatmap["bounds"]
+    figure, axis = plt.subplots()
+    try:
+        axis.imshow(
+            np.asarray(heatmap["grid"], dtype=float),
+            origin="lower",
+            cmap=colorMap,
+            extent=(minLng, maxLng, minLat, maxLat),
+        )
+        axis.set_xlabel("lng")
+        axis.set_ylabel("lat")
+        figure.savefig(path)
+    finally:
+        plt.close(figure)
+    return Path(path)
@@ -1,30 +1,136 @@
 import datetime as dt
-from typing import Any, Dict, Optional
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
+from .memo import LruCache
+from .score_grid import UnsafeScoreGrid, loadUnsafeScoreGrid
 from .sos_risk_model import (
     loadSosRiskModel,
     predictSosRisk,
+    predictSosRisksBatch,
 )
 from .unsafe_zone_model import (
     loadUnsafeZoneModel,
     predictUnsafeScore,
+    predictUnsafeScoresBatch,
 )
 
 
+_severityCodes = {"low": 0, "medium": 1, "high": 2}
+
+
 _unsafeModel = None
 _sosModel = None
+_unsafeGrid: Optional[UnsafeScoreGrid] = None
+_unsafeGridModel = None
+
+# The unsafe-zone tree is piecewise constant, so nearby repeated queries share
+# an answer. Coordinates are snapped to this many degrees before scoring.
+_unsafeScorePrecision = float(os.getenv("UNSAFE_SCORE_CACHE_PRECISION", "0.0001"))
+_unsafeScoreCache = LruCache(int(os.getenv("UNSAFE_SCORE_CACHE_SIZE", "65536")))
+_unsafeScoreCacheModel = None
+
+
+def _loadUnsafeModelAndGrid() -> None:
+    global _unsafeModel, _unsafeGrid, _unsafeGridModel
+    _unsafeModel = loadUnsafeZoneModel()
+    _unsafeGrid = loadUnsafeScoreGrid()
+    _unsafeGridModel = _unsafeModel
 
 
 def _ensureModelsLoaded() -> None:
-    global _unsafeModel, _sosModel
+    global _sosModel
     if _unsafeModel is None:
-        _unsafeModel = loadUnsafeZoneModel()
+        _loadUnsafeModelAndGrid()
     if _sosModel is None:
         _sosModel = loadSosRiskModel()
 
 
+def loadModels() -> None:
+    """Load both models now instead of on the first request."""
+    _ensureModelsLoaded()
+
+
+def warmUp() -> None:
+    """Run one synthetic prediction through each serving path.
+
+    This pays the first-call costs (sklearn code paths, grid page faults)
+    before real traffic arrives.
+    """
+    _ensureModelsLoaded()
+    grid = _activeGrid()
+    if grid is not None:
+        lat = (grid.bounds[0] + grid.bounds[1]) / 2.0
+        lng = (grid.bounds[2] + grid.bounds[3]) / 2.0
+        # A valid point just outside the grid exercises the model fallback.
+        outsideLat = grid.bounds[1] + 0.01 if grid.bounds[1] <= 89.99 else grid.bounds[0] - 0.01
+    else:
+        lat, lng = 0.0, 0.0
+        outsideLat = lat
+    timestamp = "2025-01-01T22:00:00"
+    getUnsafeZoneScore(lat, lng, timestamp, "medium")
+    getUnsafeZoneScoresBatch([(lat, lng, timestamp, "medium"), (outsideLat, lng, timestamp, "high")])
+    getSosRiskScore("warm-up", lat, lng, timestamp, "high")
+    getSosRiskScoresBatch([("warm-up", lat, lng, timestamp, "high")])
+
+
+def reloadModels() -> None:
+    """Load both model files again; memoized scores from the old model are dropped."""
+    global _sosModel
+    _loadUnsafeModelAndGrid()
+    _sosModel = loadSosRiskModel()
+    _unsafeScoreCache.clear()
+
+
+def _activeGrid() -> Optional[UnsafeScoreGrid]:
+    # Only trust the grid that was built for the model currently in use.
+    if _unsafeGrid is not None and _unsafeGridModel is _unsafeModel:
+        return _unsafeGrid
+    return None
+
+
+def configureUnsafeScoreCache(precision: Optional[float] = None, maxSize: Optional[int] = None) -> None:
+    global _unsafeScorePrecision
+    if precision is not None:
+        if precision <= 0:
+            raise ValueError("precision must be positive")
+        _unsafeScorePrecision = float(precision)
+        _unsafeScoreCache.clear()
+    if maxSize is not None:
+        _unsafeScoreCache.resize(maxSize)
+
+
+def getUnsafeScoreCacheStats() -> Dict[str, Any]:
+    return {**_unsafeScoreCache.stats(), "precision": _unsafeScorePrecision}
+
+
+def _memoizedUnsafeScore(lat: float, lng: float, hour: int, dayOfWeek: int, severityCode: int) -> float:
+    global _unsafeScoreCacheModel
+    if _unsafeScoreCacheModel is not _unsafeModel:
+        # A different model object is in use (reload, retrain, test double).
+        _unsafeScoreCache.clear()
+        _unsafeScoreCacheModel = _unsafeModel
+    latKey = int(round(lat / _unsafeScorePrecision))
+    lngKey = int(round(lng / _unsafeScorePrecision))
+    key = (latKey, lngKey, hour, dayOfWeek, severityCode)
+    score = _unsafeScoreCache.get(key)
+    if score is None:
+        score = float(
+            predictUnsafeScore(
+                _unsafeModel,
+                latKey * _unsafeScorePrecision,
+                lngKey * _unsafeScorePrecision,
+                hour,
+                dayOfWeek,
+                severityCode,
+            )
+        )
+        _unsafeScoreCache.put(key, score)
+    return score
+
+
 def _parseTimestamp(timestamp: str) -> dt.datetime:
     try:
         value = dt.datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
@@ -33,19 +139,49 @@ def _parseTimestamp(timestamp: str) -> dt.datetime:
     return value
 
 
+def _parseTimestampsBulk(timestamps: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return (hour, dayOfWeek, valid) arrays for a batch of ISO timestamps.
+
+    Every value goes through ``_parseTimestamp`` so the batch endpoints accept
+    and reject exactly what the single-point ones do (numpy's parser would
+    also take ``"now"`` or a bare year). Hours are wall-clock hours in the
+    timestamp's own offset. Unparseable entries are flagged in ``valid`` and
+    get hour/day 0.
+    """
+    hours = np.zeros(len(timestamps), dtype=int)
+    dayOfWeek = np.zeros(len(timestamps), dtype=int)
+    valid = np.zeros(len(timestamps), dtype=bool)
+    for index, timestamp in enumerate(timestamps):
+        try:
+            value = _parseTimestamp(timestamp)
+        except ValueError:
+            continue
+        hours[index] = value.hour
+        dayOfWeek[index] = value.weekday()
+        valid[index] = True
+    return hours, dayOfWeek, valid
+
+
+def validTimestamps(timestamps: Sequence[Any]) -> List[bool]:
+    """Whether each value would be accepted by the scoring functions."""
+    return _parseTimestampsBulk(timestamps)[2].tolist()
+
+
+def _severityCode(severity: str) -> int:
+    return _severityCodes.get(str(severity).lower(), 1)
+
+
 def getUnsafeZoneScore(lat: float, lng: float, timestamp: str, severity: str = "medium") -> Dict[str, Any]:
     _ensureModelsLoaded()
     dtValue = _parseTimestamp(timestamp)
     hour = dtValue.hour
     dayOfWeek = dtValue.weekday()
-    sev = str(severity).lower()
-    if sev == "high":
-        severityCode = 2
-    elif sev == "low":
-        severityCode = 0
+    severityCode = _severityCode(severity)
+    grid = _activeGrid()
+    if grid is not None and grid.contains(lat, lng):
+        score = grid.lookup(lat, lng, hour, dayOfWeek, severityCode)
     else:
-        severityCode = 1
-    score = predictUnsafeScore(_unsafeModel, lat, lng, hour, dayOfWeek, severityCode)
+        score = _memoizedUnsafeScore(float(lat), float(lng), hour, dayOfWeek, severityCode)
     return {
         "unsafeScore": float(score),
         "lat": float(lat),
@@ -55,6 +191,69 @@ def getUnsafeZoneScore(lat: float, lng: float, timestamp: str, severity: str = "
     }
 
 
+def getUnsafeZoneScoresBatch(
+    points: Sequence[Tuple[float, float, str, Optional[str]]],
+) -> List[Dict[str, Any]]:
+    """Score many (lat, lng, timestamp, severity) points with one model call.
+
+    Results are returned in input order with the same shape as
+    ``getUnsafeZoneScore``. A missing severity defaults to ``"medium"``.
+    """
+    if not points:
+        return []
+    _ensureModelsLoaded()
+    lats = np.array([point[0] for point in points], dtype=float)
+    lngs = np.array([point[1] for point in points], dtype=float)
+    timestamps = [point[2] for point in points]
+    severities = [point[3] or "medium" for point in points]
+    hours, dayOfWeek, valid = _parseTimestampsBulk(timestamps)
+    if not valid.all():
+        index = int(np.flatnonzero(~valid)[0])
+        raise ValueError(f"Invalid ISO timestamp at index {index}: {timestamps[index]}")
+    severityCodes = np.array([_severityCode(value) for value in severities], dtype=float)
+
+    # Snap coordinates the same way the memoized single-point path does.
+    snappedLats = np.round(lats / _unsafeScorePrecision) * _unsafeScorePrecision
+    snappedLngs = np.round(lngs / _unsafeScorePrecision) * _unsafeScorePrecision
+    features = np.column_stack([snappedLats, snappedLngs, hours, dayOfWeek, severityCodes])
+    grid = _activeGrid()
+    if grid is None:
+        scores = predictUnsafeScoresBatch(_unsafeModel, features)
+    else:
+        gridFeatures = np.column_stack([lats, lngs, hours, dayOfWeek, severityCodes])
+        scores, inside = grid.lookupBatch(gridFeatures)
+        if not inside.all():
+            scores[~inside] = predictUnsafeScoresBatch(_unsafeModel, features[~inside])
+    return [
+        {
+            "unsafeScore": float(scores[index]),
+            "lat": float(lats[index]),
+            "lng": float(lngs[index]),
+            "timestamp": timestamps[index],
+            "severity": severities[index],
+        }
+        for index in range(len(points))
+    ]
+
+
+def scoreUnsafeFeatures(features: np.ndarray) -> np.ndarray:
+    """Unsafe scores for an (N, 5) [lat, lng, hour, dayOfWeek, severityCode] matrix.
+
+    Array-in, array-out counterpart of ``getUnsafeZoneScoresBatch`` for bulk
+    callers such as the route risk layer: rows inside the precomputed grid are
+    looked up, the rest go through the model.
+    """
+    _ensureModelsLoaded()
+    features = np.asarray(features, dtype=float)
+    grid = _activeGrid()
+    if grid is None:
+        return predictUnsafeScoresBatch(_unsafeModel, features)
+    scores, inside = grid.lookupBatch(features)
+    if not inside.all():
+        scores[~inside] = predictUnsafeScoresBatch(_unsafeModel, features[~inside])
+    return scores
+
+
 def getSosRiskScore(
     description: str,
     lat: float,
@@ -67,13 +266,7 @@ def getSosRiskScore(
     hour = dtValue.hour
     messageLength = len(description or "")
     isNight = int(hour >= 20 or hour <= 5)
-    sev = str(severity).lower()
-    if sev == "high":
-        severityCode = 2
-    elif sev == "low":
-        severityCode = 0
-    else:
-        severityCode = 1
+    severityCode = _severityCode(severity)
     risk = predictSosRisk(_sosModel, hour, messageLength, isNight, severityCode)
     return {
         "riskScore": float(risk),
@@ -83,3 +276,46 @@ def getSosRiskScore(
         "severity": severity,
         "messageLength": messageLength,
     }
+
+
+def getSosRiskScoresBatch(
+    reports: Sequence[Tuple[str, float, float, str, Optional[str]]],
+) -> List[Dict[str, Any]]:
+    """Score many (description, lat, lng, timestamp, severity) reports at once.
+
+    Feature columns are computed over the whole batch and the model runs once.
+    Results keep input order; a report with an invalid timestamp yields an
+    ``{"index", "error"}`` entry instead of failing the batch.
+    """
+    if not reports:
+        return []
+    _ensureModelsLoaded()
+    descriptions = [report[0] or "" for report in reports]
+    timestamps = [report[3] for report in reports]
+    severities = [report[4] or "high" for report in reports]
+    hours, _, valid = _parseTimestampsBulk(timestamps)
+    messageLengths = np.array([len(value) for value in descriptions], dtype=int)
+    isNight = ((hours >= 20) | (hours <= 5)).astype(int)
+    severityCodes = np.array([_severityCode(value) for value in severities], dtype=int)
+
+    validIndexes = np.flatnonzero(valid)
+    features = np.column_stack([hours, messageLengths, isNight, severityCodes])[validIndexes]
+    risks = np.empty(len(reports), dtype=float)
+    risks[validIndexes] = predictSosRisksBatch(_sosModel, features)
+
+    results: List[Dict[str, Any]] = []
+    for index, report in enumerate(reports):
+        if not valid[index]:
+            results.append({"index": index, "error": f"Invalid ISO timestamp: {timestamps[index]}"})
+            continue
+        results.append(
+            {
+                "riskScore": float(risks[index]),
+                "lat": float(report[1]),
+                "lng": float(report[2]),
+                "timestamp": timestamps[index],
+                "severity": severities[index],
+                "messageLength": int(messageLengths[index]),
+            }
+        )
+    return results
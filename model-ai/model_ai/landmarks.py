@@ -0,0 +1,186 @@
+import json
+import os
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from .road_graph import RoadGraph, defaultRoadGraphPath
+from .shortest_path import PathResult, heuristicSearch, shortestPathTree
+
+
+FLOAT32_EPSILON = float(np.finfo(np.float32).eps)
+
+
+def _distanceArray(graph: RoadGraph, source: int) -> np.ndarray:
+    distances, _ = shortestPathTree(graph, source)
+    result = np.full(graph.nodeCount, np.inf)
+    result[np.fromiter(distances.keys(), dtype=np.int64, count=len(distances))] = np.fromiter(
+        distances.values(), dtype=float, count=len(distances)
+    )
+    return result
+
+
+class LandmarkTable:
+    """Exact distances from and to a few landmark nodes (ALT preprocessing).
+
+    ``fromLandmark[v, i]`` is the cost from landmark ``i`` to node ``v`` and
+    ``toLandmark[v, i]`` the cost back; both are float32 and node-major so a
+    query reads one short row per node it touches, which keeps a
+    memory-mapped table cheap to use. By the triangle inequality either
+    difference below bounds the cost from ``v`` to ``t``:
+
+        fromLandmark[t, i] - fromLandmark[v, i]
+        toLandmark[v, i] - toLandmark[t, i]
+
+    The bounds only hold for the edge weights the table was built on; its
+    ``profile`` is that graph's ``profileHash``.
+    """
+
+    def __init__(
+        self,
+        landmarks: np.ndarray,
+        fromLandmark: np.ndarray,
+        toLandmark: np.ndarray,
+        profile: str,
+        slack: float = 0.0,
+    ) -> None:
+        if fromLandmark.shape != toLandmark.shape or fromLandmark.shape[1] != len(landmarks):
+            raise ValueError("landmark tables must be nodeCount x landmarkCount")
+        self.landmarks = landmarks
+        self.fromLandmark = fromLandmark
+        self.toLandmark = toLandmark
+        self.profile = profile
+        # Covers float32 rounding so a bound never overestimates.
+        self.slack = slack
+
+    @property
+    def landmarkCount(self) -> int:
+        return int(self.fromLandmark.shape[1])
+
+    def matches(self, graph: RoadGraph) -> bool:
+        """Whether the table was built for exactly this topology and weights."""
+        return graph.nodeCount == self.fromLandmark.shape[0] and graph.profileHash == self.profile
+
+    def heuristic(self, source: int, target: int, activeCount: int = 4) -> Callable[[int], float]:
+        """Lower bound on the cost to ``target``, using the landmarks best for this pair.
+
+        Landmarks are ranked by the bound they give at ``source``; only the
+        top ``activeCount`` are consulted per node.
+        """
+        sourceFrom = self.fromLandmark[source].astype(float)
+        sourceTo = self.toLandmark[source].astype(float)
+        targetFrom = self.fromLandmark[target].astype(float)
+        targetTo = self.toLandmark[target].astype(float)
+        with np.errstate(invalid="ignore"):
+            bounds = np.fmax(targetFrom - sourceFrom, sourceTo - targetTo)
+        active = np.argsort(-np.nan_to_num(bounds, nan=-np.inf))[:activeCount].tolist()
+        targetFromList = targetFrom.tolist()
+        targetToList = targetTo.tolist()
+        # Plain ndarray views: indexing an np.memmap row costs several times more.
+        fromLandmark = self.fromLandmark.view(np.ndarray)
+        toLandmark = self.toLandmark.view(np.ndarray)
+        slack = self.slack
+
+        def bound(node: int) -> float:
+            fromRow = fromLandmark[node].tolist()
+            toRow = toLandmark[node].tolist()
+            best = 0.0
+            for index in active:
+                # Comparisons skip the NaN of inf - inf (both sides unreachable).
+                estimate = targetFromList[index] - fromRow[index]
+                if estimate > best:
+                    best = estimate
+                estimate = toRow[index] - targetToList[index]
+                if estimate > best:
+                    best = estimate
+            return best - slack if best > slack else 0.0
+
+        return bound
+
+
+def buildLandmarkTable(graph: RoadGraph, count: int = 16, seed: int = 0) -> LandmarkTable:
+    """Pick ``count`` landmarks by farthest-point selection and tabulate distances.
+
+    Each landmark is the node furthest from all landmarks chosen so far
+    (unreachable nodes first, so every component gets one), which places them
+    around the edge of the network where their bounds are tightest. Costs two
+    full Dijkstra runs per landmark.
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    count = min(count, graph.nodeCount)
+    reverseGraph, _ = graph.reverse()
+    fromLandmark = np.empty((graph.nodeCount, count), dtype=np.float32)
+    toLandmark = np.empty((graph.nodeCount, count), dtype=np.float32)
+    landmarks: List[int] = []
+    start = int(np.random.default_rng(seed).integers(graph.nodeCount))
+    nearest = _distanceArray(graph, start)
+    maxDistance = 0.0
+    for index in range(count):
+        candidates = nearest.copy()
+        candidates[landmarks] = -np.inf
+        landmark = int(np.argmax(candidates))
+        landmarks.append(landmark)
+        forward = _distanceArray(graph, landmark)
+        backward = _distanceArray(reverseGraph, landmark)
+        fromLandmark[:, index] = forward
+        toLandmark[:, index] = backward
+        for distances in (forward, backward):
+            finite = distances[np.isfinite(distances)]
+            if finite.size:
+                maxDistance = max(maxDistance, float(finite.max()))
+        nearest = forward if index == 0 else np.minimum(nearest, forward)
+    slack = 4.0 * FLOAT32_EPSILON * maxDistance
+    return LandmarkTable(np.array(landmarks, dtype=np.int64), fromLandmark, toLandmark, graph.profileHash, slack)
+
+
+def altSearch(graph: RoadGraph, table: LandmarkTable, source: int, target: int, activeCount: int = 4) -> PathResult:
+    """A* guided by landmark bounds; ``table`` must match ``graph``.
+
+    The bounds follow the road network rather than a straight line, so far
+    fewer nodes are settled than with the great-circle heuristic.
+    """
+    if source == target:
+        return 0.0, [source]
+    return heuristicSearch(graph, source, target, table.heuristic(source, target, activeCount))
+
+
+def defaultLandmarkPath(graphPath: Optional[Path] = None) -> Path:
+    """Directory holding the landmark table for the graph at ``graphPath``."""
+    if graphPath is None and os.getenv("ROAD_LANDMARKS_PATH"):
+        return Path(os.environ["ROAD_LANDMARKS_PATH"])
+    return Path(graphPath or defaultRoadGraphPath()).with_suffix(".landmarks")
+
+
+def saveLandmarkTable(table: LandmarkTable, path: Optional[Path] = None) -> Path:
+    """Write the table as ``.npy`` arrays (so it can be memory-mapped) plus ``meta.json``."""
+    path = Path(path or defaultLandmarkPath())
+    path.mkdir(parents=True, exist_ok=True)
+    np.save(path / "landmarks.npy", np.asarray(table.landmarks, dtype=np.int64))
+    np.save(path / "from_landmark.npy", np.asarray(table.fromLandmark, dtype=np.float32))
+    np.save(path / "to_landmark.npy", np.asarray(table.toLandmark, dtype=np.float32))
+    meta = {"profile": table.profile, "slack": table.slack, "landmarkCount": table.landmarkCount}
+    (path / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return path
+
+
+def loadLandmarkTable(path: Optional[Path] = None, mmap: bool = True) -> Optional[LandmarkTable]:
+    """Read a table written by ``saveLandmarkTable``; None when it is missing.
+
+    With ``mmap`` the distance arrays stay on disk and pages are read as
+    queries touch them, so loading is instant and workers share the memory.
+    """
+    path = Path(path or defaultLandmarkPath())
+    metaPath = path / "meta.json"
+    if not metaPath.exists():
+        return None
+    meta = json.loads(metaPath.read_text(encoding="utf-8"))
+    mmapMode = "r" if mmap else None
+    return LandmarkTable(
+        np.load(path / "landmarks.npy"),
+        np.load(path / "from_landmark.npy", mmap_mode=mmapMode),
+        np.load(path / "to_landmark.npy", mmap_mode=mmapMode),
+        str(meta["profile"]),
+        float(meta.get("slack", 0.0)),
+    )
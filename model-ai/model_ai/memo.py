@@ -0,0 +1,52 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class LruCache:
+    """Small bounded mapping with least-recently-used eviction."""
+
+    def __init__(self, maxSize: int) -> None:
+        self.maxSize = max(0, int(maxSize))
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxSize == 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxSize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def resize(self, maxSize: int) -> None:
+        self.maxSize = max(0, int(maxSize))
+        while len(self._entries) > self.maxSize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "maxSize": self.maxSize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,203 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .geo import haversineDistanceKm
+
+
+class RoadGraph:
+    """Directed road graph in compressed sparse row (CSR) form.
+
+    Nodes are integers ``0..nodeCount-1`` with coordinates in ``lats`` and
+    ``lngs``. The out-edges of node ``u`` are the slice
+    ``offsets[u]:offsets[u + 1]`` of ``targets``/``weights``; that slice index
+    is the edge id. ``lengthsKm`` holds the great-circle length of each edge.
+    """
+
+    def __init__(
+        self,
+        lats: np.ndarray,
+        lngs: np.ndarray,
+        offsets: np.ndarray,
+        targets: np.ndarray,
+        weights: np.ndarray,
+        lengthsKm: Optional[np.ndarray] = None,
+    ) -> None:
+        self.lats = np.asarray(lats, dtype=float)
+        self.lngs = np.asarray(lngs, dtype=float)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int64)
+        self.weights = np.asarray(weights, dtype=float)
+        if self.offsets.size != self.lats.size + 1:
+            raise ValueError("offsets must have nodeCount + 1 entries")
+        if lengthsKm is None:
+            lengthsKm = haversineDistanceKm(
+                self.lats[self.sources], self.lngs[self.sources], self.lats[self.targets], self.lngs[self.targets]
+            )
+        self.lengthsKm = np.asarray(lengthsKm, dtype=float)
+        self._lists: Optional[Tuple[List[int], List[int], List[float]]] = None
+        self._coordinateLists: Optional[Tuple[List[float], List[float]]] = None
+        self._reverse: Optional[Tuple["RoadGraph", np.ndarray]] = None
+        self._profileHash: Optional[str] = None
+        # Graph whose offsets/targets lists this one shares (set by withWeights).
+        self._topology: Optional["RoadGraph"] = None
+
+    @property
+    def nodeCount(self) -> int:
+        return int(self.lats.size)
+
+    @property
+    def edgeCount(self) -> int:
+        return int(self.targets.size)
+
+    @property
+    def sources(self) -> np.ndarray:
+        """Source node of every edge, in edge-id order."""
+        return np.repeat(np.arange(self.nodeCount, dtype=np.int64), np.diff(self.offsets))
+
+    @property
+    def profileHash(self) -> str:
+        """Digest of the topology and edge weights, cached.
+
+        Two graphs with equal hashes give the same shortest paths, so
+        preprocessed data can be checked against the graph it is used with.
+        """
+        if self._profileHash is None:
+            digest = hashlib.sha1()
+            for array in (self.offsets, self.targets, self.weights):
+                digest.update(np.ascontiguousarray(array).tobytes())
+            self._profileHash = digest.hexdigest()
+        return self._profileHash
+
+    @classmethod
+    def fromEdges(
+        cls,
+        lats: Sequence[float],
+        lngs: Sequence[float],
+        sources: Sequence[int],
+        targets: Sequence[int],
+        weights: Optional[Sequence[float]] = None,
+        undirected: bool = False,
+    ) -> "RoadGraph":
+        """Build from an edge list; weights default to edge length in km."""
+        lats = np.asarray(lats, dtype=float)
+        lngs = np.asarray(lngs, dtype=float)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        lengthsKm = haversineDistanceKm(lats[sources], lngs[sources], lats[targets], lngs[targets])
+        weights = lengthsKm if weights is None else np.asarray(weights, dtype=float)
+        if undirected:
+            sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+            weights = np.concatenate([weights, weights])
+            lengthsKm = np.concatenate([lengthsKm, lengthsKm])
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(lats.size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=lats.size), out=offsets[1:])
+        return cls(lats, lngs, offsets, targets[order], weights[order], lengthsKm[order])
+
+    def adjacencyLists(self) -> Tuple[List[int], List[int], List[float]]:
+        """(offsets, targets, weights) as Python lists, cached.
+
+        Search loops index these per edge; list indexing is several times
+        faster than indexing NumPy scalars.
+        """
+        if self._lists is None:
+            if self._topology is not None:
+                offsets, targets, _ = self._topology.adjacencyLists()
+            else:
+                offsets, targets = self.offsets.tolist(), self.targets.tolist()
+            self._lists = (offsets, targets, self.weights.tolist())
+        return self._lists
+
+    def coordinateLists(self) -> Tuple[List[float], List[float]]:
+        if self._coordinateLists is None:
+            self._coordinateLists = (self.lats.tolist(), self.lngs.tolist())
+        return self._coordinateLists
+
+    def reverse(self) -> Tuple["RoadGraph", np.ndarray]:
+        """Transposed graph plus, per reverse edge, the id of the forward edge."""
+        if self._reverse is None:
+            sources = self.sources
+            order = np.argsort(self.targets, kind="stable")
+            offsets = np.zeros(self.nodeCount + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.targets, minlength=self.nodeCount), out=offsets[1:])
+            reverseGraph = RoadGraph(
+                self.lats, self.lngs, offsets, sources[order], self.weights[order], self.lengthsKm[order]
+            )
+            self._reverse = (reverseGraph, order)
+        return self._reverse
+
+    def withWeights(self, weights: np.ndarray) -> "RoadGraph":
+        """Same topology with a different per-edge cost; adjacency lists are shared."""
+        weights = np.asarray(weights, dtype=float)
+        if weights.shape != self.weights.shape:
+            raise ValueError("weights must have one entry per edge")
+        graph = RoadGraph(self.lats, self.lngs, self.offsets, self.targets, weights, self.lengthsKm)
+        graph._topology = self._topology or self
+        return graph
+
+    def coordinates(self, nodes: Sequence[int]) -> List[Tuple[float, float]]:
+        return [(float(self.lats[node]), float(self.lngs[node])) for node in nodes]
+
+
+def graphFromPolylines(polylines: Sequence[Sequence[Dict[str, Any]]]) -> Tuple[RoadGraph, Dict[Tuple[float, float], int]]:
+    """Undirected graph over ``{"lat", "lng"}`` polylines, merging shared points.
+
+    Returns the graph and the node id of every distinct (lat, lng).
+    """
+    nodeIds: Dict[Tuple[float, float], int] = {}
+    sources: List[int] = []
+    targets: List[int] = []
+    for polyline in polylines:
+        previous: Optional[int] = None
+        for point in polyline:
+            key = (float(point["lat"]), float(point["lng"]))
+            node = nodeIds.setdefault(key, len(nodeIds))
+            if previous is not None and previous != node:
+                sources.append(previous)
+                targets.append(node)
+            previous = node
+    coordinates = np.array(list(nodeIds), dtype=float).reshape(-1, 2)
+    graph = RoadGraph.fromEdges(coordinates[:, 0], coordinates[:, 1], sources, targets, undirected=True)
+    return graph, nodeIds
+
+
+def defaultRoadGraphPath() -> Path:
+    from .unsafe_zone_model import getTrainedDir
+
+    return Path(os.getenv("ROAD_GRAPH_PATH", str(getTrainedDir() / "road_graph.npz")))
+
+
+def saveRoadGraph(graph: RoadGraph, path: Optional[Path] = None) -> Path:
+    """Write nodes, CSR edges and per-edge lengths/weights to an ``.npz`` file."""
+    path = Path(path or defaultRoadGraphPath())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(
+        path,
+        lats=graph.lats,
+        lngs=graph.lngs,
+        offsets=graph.offsets,
+        targets=graph.targets,
+        weights=graph.weights,
+        lengthsKm=graph.lengthsKm,
+    )
+    return path
+
+
+def loadRoadGraph(path: Optional[Path] = None) -> Optional[RoadGraph]:
+    """Read a graph written by ``saveRoadGraph``; None when the file is missing."""
+    path = Path(path or defaultRoadGraphPath())
+    if not path.exists():
+        return None
+    with np.load(path) as arrays:
+        return RoadGraph(
+            arrays["lats"],
+            arrays["lngs"],
+            arrays["offsets"],
+            arrays["targets"],
+            arrays["weights"],
+            arrays["lengthsKm"],
+        )
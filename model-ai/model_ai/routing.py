@@ -0,0 +1,268 @@
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .edge_risk import EdgeRiskLayer, Scorer
+from .geo import greatCircleKm, haversineDistanceKm
+from .landmarks import LandmarkTable, altSearch, defaultLandmarkPath, loadLandmarkTable
+from .road_graph import RoadGraph, loadRoadGraph
+from .shortest_path import aStar, kShortestPaths
+from .spatial_index import SpatialIndex
+
+
+SNAP_MAX_DISTANCE_KM = float(os.getenv("ROAD_SNAP_MAX_KM", "0.5"))
+HOUR_BUCKETS = int(os.getenv("ROUTE_HOUR_BUCKETS", "24"))
+# Risk weights a costed graph is built for; any other value is snapped to the nearest.
+RISK_WEIGHT_LEVELS = tuple(
+    sorted(float(level) for level in os.getenv("ROUTE_RISK_WEIGHT_LEVELS", "0.5,1,2,4,8").split(","))
+)
+
+
+def snapRiskWeight(riskWeight: float) -> float:
+    """Nearest of ``RISK_WEIGHT_LEVELS``, or 0 for a non-positive weight.
+
+    Each (hour bucket, weight) pair costs a full reweighted graph, so only a
+    fixed set of weights is served, whatever clients send.
+    """
+    if not riskWeight > 0.0:
+        return 0.0
+    return min(RISK_WEIGHT_LEVELS, key=lambda level: abs(level - riskWeight))
+
+
+def _unroutable() -> Dict[str, Any]:
+    return {"distance": float("inf"), "lengthKm": float("inf"), "nodes": [], "path": [], "riskWeighted": False}
+
+
+class RoadNetwork:
+    """A city road graph plus a nearest-node index for snapping coordinates.
+
+    Built once and shared by every request, so a route query only pays for
+    two snaps and one search. With a ``landmarks`` table built for the same
+    weights, that search is ALT instead of great-circle A*.
+    """
+
+    def __init__(
+        self,
+        graph: RoadGraph,
+        snapCellDeg: float = 0.005,
+        scorer: Optional[Scorer] = None,
+        hourBuckets: int = HOUR_BUCKETS,
+        landmarks: Optional[LandmarkTable] = None,
+    ) -> None:
+        self.graph = graph
+        self.landmarks = landmarks
+        self.hourBuckets = hourBuckets
+        self._scorer = scorer
+        self._alertLats = np.zeros(0)
+        self._alertLngs = np.zeros(0)
+        self._riskLayer: Optional[EdgeRiskLayer] = None
+        self._snapIndex = SpatialIndex(cellSizeDeg=snapCellDeg, initialCapacity=graph.nodeCount)
+        lats, lngs = graph.coordinateLists()
+        for node in range(graph.nodeCount):
+            self._snapIndex.upsert(str(node), lats[node], lngs[node])
+
+    def snap(self, lat: float, lng: float, maxDistanceKm: Optional[float] = SNAP_MAX_DISTANCE_KM) -> Optional[int]:
+        """Nearest node id, or None if none lies within ``maxDistanceKm``."""
+        nearest = self._snapIndex.nearest(lat, lng, k=1, maxRadiusKm=maxDistanceKm)
+        if not nearest:
+            return None
+        return int(nearest[0][0])
+
+    def setAlertLocations(self, lats: np.ndarray, lngs: np.ndarray) -> None:
+        """Replace the alerts behind the risk layer; cached risk is rebuilt lazily."""
+        self._alertLats = np.asarray(lats, dtype=float)
+        self._alertLngs = np.asarray(lngs, dtype=float)
+        self._riskLayer = None
+
+    @property
+    def riskLayer(self) -> EdgeRiskLayer:
+        if self._riskLayer is None:
+            self._riskLayer = EdgeRiskLayer(
+                self.graph, self._alertLats, self._alertLngs, scorer=self._scorer, bucketCount=self.hourBuckets
+            )
+        return self._riskLayer
+
+    def _costedGraph(self, hour: Optional[int], riskWeight: float) -> Tuple[RoadGraph, bool]:
+        """The graph to search and whether its weights include risk.
+
+        Without trained unsafe-zone models the risk layer cannot be filled,
+        so the search falls back to plain length. ``riskWeight`` is snapped
+        with ``snapRiskWeight``.
+        """
+        riskWeight = snapRiskWeight(riskWeight)
+        if hour is not None and riskWeight > 0.0:
+            try:
+                return self.riskLayer.weightedGraph(hour, riskWeight), True
+            except FileNotFoundError:
+                pass
+        return self.graph, False
+
+    def _search(self, graph: RoadGraph, source: int, target: int) -> Tuple[float, List[int]]:
+        # Landmark bounds are only valid for the weights they were built on;
+        # risk-weighted graphs and stale tables fall back to A*.
+        if self.landmarks is not None and self.landmarks.matches(graph):
+            return altSearch(graph, self.landmarks, source, target)
+        return aStar(graph, source, target)
+
+    def _routeResult(self, distance: float, nodes: List[int], riskWeighted: bool) -> Dict[str, Any]:
+        return {
+            "distance": distance,
+            "lengthKm": self.pathLengthKm(nodes) if nodes else float("inf"),
+            "nodes": nodes,
+            "path": self.graph.coordinates(nodes),
+            "riskWeighted": riskWeighted,
+        }
+
+    def route(
+        self,
+        startLat: float,
+        startLng: float,
+        endLat: float,
+        endLng: float,
+        hour: Optional[int] = None,
+        riskWeight: float = 0.0,
+    ) -> Dict[str, Any]:
+        """Cheapest path between the nodes nearest to two coordinates.
+
+        With a departure ``hour`` and a positive ``riskWeight`` edges cost
+        ``length + riskWeight * risk`` for that hour's bucket; otherwise plain
+        length. ``distance`` is that cost and ``lengthKm`` the path length;
+        both are inf and ``path`` empty when either end cannot be snapped or
+        the ends are not connected. ``riskWeighted`` says whether risk was
+        actually applied.
+        """
+        source = self.snap(startLat, startLng)
+        target = self.snap(endLat, endLng)
+        if source is None or target is None:
+            return _unroutable()
+        graph, riskWeighted = self._costedGraph(hour, riskWeight)
+        distance, nodes = self._search(graph, source, target)
+        return self._routeResult(distance, nodes, riskWeighted)
+
+    def polylineCost(
+        self,
+        points: List[Dict[str, Any]],
+        hour: Optional[int] = None,
+        riskWeight: float = 0.0,
+    ) -> Dict[str, Any]:
+        """Cost of following a ``{"lat", "lng"}`` polyline itself, costed like ``route``.
+
+        Each point is snapped and consecutive nodes are joined by their edge,
+        or by the cheapest path when they are not adjacent, so the result is
+        the sum of ``length * (1 + riskWeight * rate)`` over the edges the
+        polyline runs along. A segment with an unsnappable or unconnected end
+        costs its plain great-circle length.
+        """
+        graph, riskWeighted = self._costedGraph(hour, riskWeight)
+        offsets, targets, weights = graph.adjacencyLists()
+
+        def segmentCost(source: Optional[int], target: Optional[int]) -> float:
+            if source is None or target is None:
+                return math.inf
+            if source == target:
+                return 0.0
+            for edge in range(offsets[source], offsets[source + 1]):
+                if targets[edge] == target:
+                    return weights[edge]
+            return self._search(graph, source, target)[0]
+
+        cost = 0.0
+        previous: Optional[Tuple[float, float, Optional[int]]] = None
+        for point in points:
+            lat, lng = float(point["lat"]), float(point["lng"])
+            node = self.snap(lat, lng)
+            if previous is not None:
+                segment = segmentCost(previous[2], node)
+                cost += segment if math.isfinite(segment) else greatCircleKm(previous[0], previous[1], lat, lng)
+            previous = (lat, lng, node)
+        return {"cost": cost, "riskWeighted": riskWeighted}
+
+    def alternatives(
+        self,
+        startLat: float,
+        startLng: float,
+        endLat: float,
+        endLng: float,
+        k: int = 3,
+        hour: Optional[int] = None,
+        riskWeight: float = 0.0,
+        maxStretch: float = 1.5,
+    ) -> List[Dict[str, Any]]:
+        """Up to ``k`` distinct routes, cheapest first, costed like ``route``.
+
+        Routes costing more than ``maxStretch`` times the best are dropped;
+        the list is empty when either end cannot be snapped.
+        """
+        source = self.snap(startLat, startLng)
+        target = self.snap(endLat, endLng)
+        if source is None or target is None:
+            return []
+        graph, riskWeighted = self._costedGraph(hour, riskWeight)
+        return [
+            self._routeResult(distance, nodes, riskWeighted)
+            for distance, nodes in kShortestPaths(graph, source, target, k, maxStretch=maxStretch)
+        ]
+
+    def pathLengthKm(self, nodes: List[int]) -> float:
+        lats = self.graph.lats[nodes]
+        lngs = self.graph.lngs[nodes]
+        return float(haversineDistanceKm(lats[:-1], lngs[:-1], lats[1:], lngs[1:]).sum())
+
+
+_roadNetwork: Optional[RoadNetwork] = None
+_roadNetworkLoaded = False
+
+
+def loadRoadNetwork(path: Optional[Path] = None) -> Optional[RoadNetwork]:
+    """Load the serialized road graph now; None if no graph file exists.
+
+    A landmark table saved next to the graph is memory-mapped along with it.
+    """
+    global _roadNetwork, _roadNetworkLoaded
+    graph = loadRoadGraph(path)
+    if graph is None:
+        _roadNetwork = None
+    else:
+        _roadNetwork = RoadNetwork(graph, landmarks=loadLandmarkTable(defaultLandmarkPath(path)))
+    _roadNetworkLoaded = True
+    return _roadNetwork
+
+
+def getRoadNetwork(load: bool = True) -> Optional[RoadNetwork]:
+    """The shared road network, loaded on first use unless ``load`` is False."""
+    if load and not _roadNetworkLoaded:
+        loadRoadNetwork()
+    return _roadNetwork
+
+
+def setRoadNetwork(network: Optional[RoadNetwork]) -> None:
+    """Install a network built in-process, e.g. from ``graphFromPolylines``."""
+    global _roadNetwork, _roadNetworkLoaded
+    _roadNetwork = network
+    _roadNetworkLoaded = True
+
+
+def routeEndpoints(
+    network: RoadNetwork,
+    routes: List[List[Dict[str, Any]]],
+    hour: Optional[int] = None,
+    riskWeight: float = 0.0,
+) -> List[Dict[str, Any]]:
+    """Graph distance and path between the ends of each candidate route.
+
+    Routes sharing both ends share one search.
+    """
+    results: Dict[tuple, Dict[str, Any]] = {}
+    summaries = []
+    for route in routes:
+        if len(route) < 2:
+            summaries.append(_unroutable())
+            continue
+        key = (float(route[0]["lat"]), float(route[0]["lng"]), float(route[-1]["lat"]), float(route[-1]["lng"]))
+        if key not in results:
+            results[key] = network.route(*key, hour=hour, riskWeight=riskWeight)
+        summaries.append(results[key])
+    return summaries
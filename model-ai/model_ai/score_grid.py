@@ -0,0 +1,150 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .unsafe_zone_model import getTrainedDir
+
+
+Bounds = Tuple[float, float, float, float]
+
+HOURS = 24
+DAYS = 7
+SEVERITIES = 3
+
+
+def _modelStamp(modelPath: Path) -> Dict[str, Any]:
+    stat = os.stat(modelPath)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+
+class UnsafeScoreGrid:
+    """Precomputed unsafe scores over lat/lng cells x hour x day x severity.
+
+    ``cells`` has shape (days, hours, severities, latSteps, lngSteps) and holds
+    the tree leaf reached by each cell centre; ``leafScores`` maps a leaf to its
+    probability. A lookup is pure index arithmetic.
+    """
+
+    def __init__(self, cells: np.ndarray, leafScores: np.ndarray, bounds: Bounds) -> None:
+        self.cells = cells
+        self.leafScores = np.asarray(leafScores, dtype=float)
+        self.bounds = tuple(float(value) for value in bounds)
+        minLat, maxLat, minLng, maxLng = self.bounds
+        self.latSteps = cells.shape[3]
+        self.lngSteps = cells.shape[4]
+        self._latScale = self.latSteps / (maxLat - minLat)
+        self._lngScale = self.lngSteps / (maxLng - minLng)
+
+    def contains(self, lat: float, lng: float) -> bool:
+        minLat, maxLat, minLng, maxLng = self.bounds
+        return minLat <= lat < maxLat and minLng <= lng < maxLng
+
+    def lookup(self, lat: float, lng: float, hour: int, dayOfWeek: int, severityCode: int) -> float:
+        row = min(int((lat - self.bounds[0]) * self._latScale), self.latSteps - 1)
+        col = min(int((lng - self.bounds[2]) * self._lngScale), self.lngSteps - 1)
+        return float(self.leafScores[self.cells[dayOfWeek, hour, severityCode, row, col]])
+
+    def lookupBatch(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Score [lat, lng, hour, dayOfWeek, severityCode] rows that fall inside the grid.
+
+        Returns (scores, inside); scores for rows outside the grid are NaN.
+        """
+        features = np.asarray(features, dtype=float)
+        lats, lngs = features[:, 0], features[:, 1]
+        minLat, maxLat, minLng, maxLng = self.bounds
+        inside = (lats >= minLat) & (lats < maxLat) & (lngs >= minLng) & (lngs < maxLng)
+        scores = np.full(features.shape[0], np.nan)
+        if inside.any():
+            rows = ((lats[inside] - minLat) * self._latScale).astype(int)
+            cols = ((lngs[inside] - minLng) * self._lngScale).astype(int)
+            rows = np.minimum(rows, self.latSteps - 1)
+            cols = np.minimum(cols, self.lngSteps - 1)
+            hours = features[inside, 2].astype(int)
+            days = features[inside, 3].astype(int)
+            severities = features[inside, 4].astype(int)
+            scores[inside] = self.leafScores[self.cells[days, hours, severities, rows, cols]]
+        return scores, inside
+
+
+def buildUnsafeScoreGrid(model: Any, bounds: Bounds, latSteps: int = 128, lngSteps: int = 128) -> UnsafeScoreGrid:
+    """Evaluate a fitted tree at every cell centre of a uniform lat/lng grid."""
+    minLat, maxLat, minLng, maxLng = bounds
+    if minLat >= maxLat or minLng >= maxLng:
+        raise ValueError("Grid bounds must satisfy minLat < maxLat and minLng < maxLng")
+    if not hasattr(model, "apply") or not hasattr(model, "tree_"):
+        raise TypeError("Score grid requires a fitted decision tree")
+    if model.tree_.node_count > 256:
+        raise ValueError("Score grid stores leaf ids as uint8; tree has too many nodes")
+
+    latCentres = minLat + (np.arange(latSteps) + 0.5) * (maxLat - minLat) / latSteps
+    lngCentres = minLng + (np.arange(lngSteps) + 0.5) * (maxLng - minLng) / lngSteps
+    latGrid, lngGrid = np.meshgrid(latCentres, lngCentres, indexing="ij")
+    hourGrid, severityGrid = np.meshgrid(np.arange(HOURS), np.arange(SEVERITIES), indexing="ij")
+    cellCount = latSteps * lngSteps
+    comboCount = HOURS * SEVERITIES
+
+    cells = np.empty((DAYS, HOURS, SEVERITIES, latSteps, lngSteps), dtype=np.uint8)
+    leafScores = np.zeros(model.tree_.node_count, dtype=float)
+    for day in range(DAYS):
+        features = np.column_stack(
+            [
+                np.tile(latGrid.ravel(), comboCount),
+                np.tile(lngGrid.ravel(), comboCount),
+                np.repeat(hourGrid.ravel(), cellCount),
+                np.full(cellCount * comboCount, day),
+                np.repeat(severityGrid.ravel(), cellCount),
+            ]
+        ).astype(float)
+        leaves = model.apply(features)
+        uniqueLeaves, firstRows = np.unique(leaves, return_index=True)
+        leafScores[uniqueLeaves] = model.predict_proba(features[firstRows])[:, 1]
+        cells[day] = leaves.reshape(HOURS, SEVERITIES, latSteps, lngSteps)
+    return UnsafeScoreGrid(cells, leafScores, bounds)
+
+
+def saveUnsafeScoreGrid(
+    grid: UnsafeScoreGrid,
+    modelFileName: str = "unsafe_zone_model.pkl",
+    fileName: str = "unsafe_zone_grid",
+) -> Path:
+    trainedDir = getTrainedDir()
+    trainedDir.mkdir(parents=True, exist_ok=True)
+    arrayPath = trainedDir / f"{fileName}.npy"
+    np.save(arrayPath, np.ascontiguousarray(grid.cells))
+    meta = {
+        "bounds": list(grid.bounds),
+        "leafScores": grid.leafScores.tolist(),
+        "model": _modelStamp(trainedDir / modelFileName),
+    }
+    (trainedDir / f"{fileName}.json").write_text(json.dumps(meta), encoding="utf-8")
+    return arrayPath
+
+
+def loadUnsafeScoreGrid(
+    modelFileName: str = "unsafe_zone_model.pkl",
+    fileName: str = "unsafe_zone_grid",
+) -> Optional[UnsafeScoreGrid]:
+    """Memory-map a saved grid, or return None if missing or built for another model file."""
+    trainedDir = getTrainedDir()
+    arrayPath = trainedDir / f"{fileName}.npy"
+    metaPath = trainedDir / f"{fileName}.json"
+    modelPath = trainedDir / modelFileName
+    if not arrayPath.exists() or not metaPath.exists() or not modelPath.exists():
+        return None
+    meta = json.loads(metaPath.read_text(encoding="utf-8"))
+    if meta.get("model") != _modelStamp(modelPath):
+        return None
+    cells = np.load(arrayPath, mmap_mode="r")
+    return UnsafeScoreGrid(cells, np.array(meta["leafScores"]), tuple(meta["bounds"]))
+
+
+def alertBounds(lats: np.ndarray, lngs: np.ndarray, padding: float = 0.01) -> Bounds:
+    return (
+        float(np.min(lats)) - padding,
+        float(np.max(lats)) + padding,
+        float(np.min(lngs)) - padding,
+        float(np.max(lngs)) + padding,
+    )
@@ -0,0 +1,312 @@
+import heapq
+import math
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .geo import greatCircleKm
+from .road_graph import RoadGraph
+
+
+PathResult = Tuple[float, List[int]]
+NO_PATH: PathResult = (math.inf, [])
+
+
+def reconstructPath(predecessors: Dict[int, int], source: int, target: int) -> List[int]:
+    """Walk predecessor links back from ``target``; empty if unreachable."""
+    if target != source and target not in predecessors:
+        return []
+    path = [target]
+    node = target
+    while node != source:
+        node = predecessors[node]
+        path.append(node)
+    path.reverse()
+    return path
+
+
+def shortestPathTree(
+    graph: RoadGraph,
+    source: int,
+    maxDistance: float = math.inf,
+    untilNode: Optional[int] = None,
+    stretch: float = math.inf,
+) -> Tuple[Dict[int, float], Dict[int, int]]:
+    """Dijkstra from ``source`` to every node within ``maxDistance``.
+
+    If ``untilNode`` is given, the search also stops beyond ``stretch`` times
+    that node's distance. Returns (distances, predecessors) for the settled
+    nodes. State lives in dicts so a search that settles few nodes costs
+    little on a large graph.
+    """
+    offsets, targets, weights = graph.adjacencyLists()
+    distances: Dict[int, float] = {source: 0.0}
+    predecessors: Dict[int, int] = {}
+    settled = set()
+    queue: List[Tuple[float, int]] = [(0.0, source)]
+    while queue:
+        distance, node = heapq.heappop(queue)
+        if node in settled:
+            continue
+        if distance > maxDistance:
+            break
+        settled.add(node)
+        if node == untilNode:
+            maxDistance = min(maxDistance, distance * stretch)
+        for edge in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[edge]
+            candidate = distance + weights[edge]
+            if candidate < distances.get(neighbor, math.inf):
+                distances[neighbor] = candidate
+                predecessors[neighbor] = node
+                heapq.heappush(queue, (candidate, neighbor))
+    return {node: distances[node] for node in settled}, predecessors
+
+
+def dijkstra(graph: RoadGraph, source: int, target: int) -> PathResult:
+    """Plain Dijkstra that stops as soon as ``target`` is settled."""
+    return aStar(graph, source, target, heuristicScale=0.0)
+
+
+def aStar(graph: RoadGraph, source: int, target: int, heuristicScale: float = 1.0) -> PathResult:
+    """A* with a great-circle heuristic.
+
+    The heuristic is ``heuristicScale`` times the haversine distance (km) to
+    the target, which stays admissible while every edge weight is at least
+    ``heuristicScale`` times its length. With a scale of 0 this is Dijkstra.
+    """
+    if heuristicScale <= 0.0:
+        return heuristicSearch(graph, source, target, None)
+    lats, lngs = graph.coordinateLists()
+    targetLat, targetLng = lats[target], lngs[target]
+
+    def heuristic(node: int) -> float:
+        return heuristicScale * greatCircleKm(lats[node], lngs[node], targetLat, targetLng)
+
+    return heuristicSearch(graph, source, target, heuristic)
+
+
+def heuristicSearch(
+    graph: RoadGraph,
+    source: int,
+    target: int,
+    heuristic: Optional[Callable[[int], float]],
+) -> PathResult:
+    """A* with any consistent lower bound on the cost to ``target``.
+
+    Each node's heuristic is evaluated once; ``None`` means Dijkstra.
+    """
+    if source == target:
+        return 0.0, [source]
+    offsets, targets, weights = graph.adjacencyLists()
+    heuristics: Dict[int, float] = {}
+    distances: Dict[int, float] = {source: 0.0}
+    predecessors: Dict[int, int] = {}
+    settled = set()
+    queue: List[Tuple[float, float, int]] = [(0.0, 0.0, source)]
+    while queue:
+        _, distance, node = heapq.heappop(queue)
+        if node in settled:
+            continue
+        if node == target:
+            return distance, reconstructPath(predecessors, source, target)
+        settled.add(node)
+        for edge in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[edge]
+            candidate = distance + weights[edge]
+            if candidate < distances.get(neighbor, math.inf):
+                distances[neighbor] = candidate
+                predecessors[neighbor] = node
+                priority = candidate
+                if heuristic is not None:
+                    estimate = heuristics.get(neighbor)
+                    if estimate is None:
+                        estimate = heuristics[neighbor] = heuristic(neighbor)
+                    priority += estimate
+                heapq.heappush(queue, (priority, candidate, neighbor))
+    return NO_PATH
+
+
+def bidirectionalDijkstra(graph: RoadGraph, source: int, target: int) -> PathResult:
+    """Dijkstra grown from both ends, alternating on the smaller frontier.
+
+    Stops once the two queue minima together reach the best meeting cost,
+    which usually settles far fewer nodes than a one-sided search.
+    """
+    if source == target:
+        return 0.0, [source]
+    reverseGraph, _ = graph.reverse()
+    sides = []
+    for searchGraph, origin in ((graph, source), (reverseGraph, target)):
+        offsets, targets, weights = searchGraph.adjacencyLists()
+        sides.append(
+            {
+                "offsets": offsets,
+                "targets": targets,
+                "weights": weights,
+                "distances": {origin: 0.0},
+                "predecessors": {},
+                "settled": set(),
+                "queue": [(0.0, origin)],
+            }
+        )
+    forward, backward = sides
+    best = math.inf
+    meeting: Optional[int] = None
+    while forward["queue"] and backward["queue"]:
+        if forward["queue"][0][0] + backward["queue"][0][0] >= best:
+            break
+        side, other = (forward, backward) if len(forward["queue"]) <= len(backward["queue"]) else (backward, forward)
+        distance, node = heapq.heappop(side["queue"])
+        if node in side["settled"]:
+            continue
+        side["settled"].add(node)
+        offsets, targets, weights = side["offsets"], side["targets"], side["weights"]
+        distances, predecessors, queue = side["distances"], side["predecessors"], side["queue"]
+        otherDistances = other["distances"]
+        for edge in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[edge]
+            candidate = distance + weights[edge]
+            if candidate < distances.get(neighbor, math.inf):
+                distances[neighbor] = candidate
+                predecessors[neighbor] = node
+                heapq.heappush(queue, (candidate, neighbor))
+            otherDistance = otherDistances.get(neighbor)
+            if otherDistance is not None and distances[neighbor] + otherDistance < best:
+                best = distances[neighbor] + otherDistance
+                meeting = neighbor
+    if meeting is None:
+        return NO_PATH
+    head = reconstructPath(forward["predecessors"], source, meeting)
+    tail = reconstructPath(backward["predecessors"], target, meeting)
+    return best, head + tail[::-1][1:]
+
+
+def _edgeWeight(graph: RoadGraph, node: int, neighbor: int) -> float:
+    offsets, targets, weights = graph.adjacencyLists()
+    return min(weights[edge] for edge in range(offsets[node], offsets[node + 1]) if targets[edge] == neighbor)
+
+
+def _spurSearch(
+    graph: RoadGraph,
+    source: int,
+    target: int,
+    toTarget: Dict[int, float],
+    nextHop: Dict[int, int],
+    blockedNodes: Set[int],
+    blockedEdges: Set[Tuple[int, int]],
+) -> PathResult:
+    """A* avoiding the given nodes and edges, guided by exact distances to ``target``.
+
+    ``toTarget``/``nextHop`` are the reverse shortest-path tree of the
+    unrestricted graph, so ``toTarget`` is a lower bound here. Once a popped
+    node's tree path avoids every blocked node (blocked edges all leave
+    ``source``), that bound is met and the rest of the path is read off the
+    tree instead of searched.
+    """
+    offsets, targets, weights = graph.adjacencyLists()
+    blockedTails = {edge[0] for edge in blockedEdges}
+    treeClean: Dict[int, bool] = {target: True}
+
+    def followsTree(node: int) -> bool:
+        walked = []
+        clean = True
+        while True:
+            known = treeClean.get(node)
+            if known is not None:
+                clean = known
+                break
+            if node in blockedNodes or node == source:
+                clean = False
+                break
+            walked.append(node)
+            node = nextHop[node]
+        for visited in walked:
+            treeClean[visited] = clean
+        return clean
+
+    distances: Dict[int, float] = {source: 0.0}
+    predecessors: Dict[int, int] = {}
+    settled = set()
+    queue: List[Tuple[float, float, int]] = [(toTarget[source], 0.0, source)]
+    while queue:
+        _, distance, node = heapq.heappop(queue)
+        if node in settled:
+            continue
+        if node != source and followsTree(node):
+            path = reconstructPath(predecessors, source, node)
+            while path[-1] != target:
+                path.append(nextHop[path[-1]])
+            return distance + toTarget[node], path
+        settled.add(node)
+        checkEdges = node in blockedTails
+        for edge in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[edge]
+            remaining = toTarget.get(neighbor)
+            if remaining is None or neighbor in blockedNodes:
+                continue
+            if checkEdges and (node, neighbor) in blockedEdges:
+                continue
+            candidate = distance + weights[edge]
+            if candidate < distances.get(neighbor, math.inf):
+                distances[neighbor] = candidate
+                predecessors[neighbor] = node
+                heapq.heappush(queue, (candidate + remaining, candidate, neighbor))
+    return NO_PATH
+
+
+def kShortestPaths(
+    graph: RoadGraph,
+    source: int,
+    target: int,
+    k: int,
+    maxStretch: float = 1.5,
+) -> List[PathResult]:
+    """Up to ``k`` loopless paths in increasing cost (Yen's algorithm).
+
+    One reverse Dijkstra from ``target`` is shared by every step: it yields
+    the first path directly and gives each spur search an exact heuristic,
+    so the spur searches settle few nodes instead of each being a full
+    Dijkstra. Only paths costing at most ``maxStretch`` times the best are
+    returned, which bounds that reverse search too: a node further than that
+    from ``target`` cannot lie on such a path.
+    """
+    if k <= 0:
+        return []
+    if source == target:
+        return [(0.0, [source])]
+    reverseGraph, _ = graph.reverse()
+    toTarget, nextHop = shortestPathTree(reverseGraph, target, untilNode=source, stretch=maxStretch)
+    if source not in toTarget:
+        return []
+    firstPath = [source]
+    while firstPath[-1] != target:
+        firstPath.append(nextHop[firstPath[-1]])
+
+    paths: List[PathResult] = [(toTarget[source], firstPath)]
+    costLimit = toTarget[source] * maxStretch
+    seen = {tuple(firstPath)}
+    candidates: List[Tuple[float, Tuple[int, ...]]] = []
+    while len(paths) < k:
+        lastPath = paths[-1][1]
+        rootCost = 0.0
+        for index in range(len(lastPath) - 1):
+            spurNode = lastPath[index]
+            root = lastPath[: index + 1]
+            blockedEdges = {
+                (path[index], path[index + 1])
+                for _, path in paths
+                if len(path) > index + 1 and path[: index + 1] == root
+            }
+            spurCost, spurPath = _spurSearch(
+                graph, spurNode, target, toTarget, nextHop, set(root[:-1]), blockedEdges
+            )
+            if spurPath and rootCost + spurCost <= costLimit:
+                candidate = tuple(root[:-1] + spurPath)
+                if candidate not in seen:
+                    seen.add(candidate)
+                    heapq.heappush(candidates, (rootCost + spurCost, candidate))
+            rootCost += _edgeWeight(graph, spurNode, lastPath[index + 1])
+        if not candidates:
+            break
+        cost, path = heapq.heappop(candidates)
+        paths.append((cost, list(path)))
+    return paths
@@ -1,13 +1,15 @@
+from __future__ import annotations
+
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import joblib
 import numpy as np
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import classification_report
-from sklearn.model_selection import train_test_split
 
-from .features import buildSosRiskFeatures, loadAlerts
+if TYPE_CHECKING:
+    from sklearn.linear_model import LogisticRegression
+
+# sklearn, pandas and joblib are imported inside the functions that need
+# them so the serving path (predict*) only pays for NumPy at import time.
 
 
 def getTrainedDir() -> Path:
@@ -15,6 +17,12 @@ def getTrainedDir() -> Path:
 
 
 def trainSosRiskModel(alertsCsvDir: Optional[Path] = None) -> LogisticRegression:
+    from sklearn.metrics import classification_report
+    from sklearn.model_selection import train_test_split
+    from sklearn.linear_model import LogisticRegression
+
+    from .features import buildSosRiskFeatures, loadAlerts
+
     alerts = loadAlerts(alertsCsvDir)
     X, y = buildSosRiskFeatures(alerts)
     if len(np.unique(y)) < 2:
@@ -31,6 +39,8 @@ def trainSosRiskModel(alertsCsvDir: Optional[Path] = None) -> LogisticRegression
 
 
 def saveSosRiskModel(model: LogisticRegression, fileName: str = "sos_risk_model.pkl") -> Path:
+    import joblib
+
     trainedDir = getTrainedDir()
     trainedDir.mkdir(parents=True, exist_ok=True)
     path = trainedDir / fileName
@@ -39,6 +49,8 @@ def saveSosRiskModel(model: LogisticRegression, fileName: str = "sos_risk_model.
 
 
 def loadSosRiskModel(fileName: str = "sos_risk_model.pkl") -> LogisticRegression:
+    import joblib
+
     path = getTrainedDir() / fileName
     if not path.exists():
         raise FileNotFoundError(f"SOS risk model file not found: {path}")
@@ -56,3 +68,11 @@ def predictSosRisk(
     features = np.array([[hour, messageLength, isNight, severityCode]], dtype=float)
     proba = model.predict_proba(features)[0, 1]
     return float(proba)
+
+
+def predictSosRisksBatch(model: LogisticRegression, features: np.ndarray) -> np.ndarray:
+    """Score an (N, 4) matrix of [hour, messageLength, isNight, severityCode] rows."""
+    features = np.asarray(features, dtype=float)
+    if features.shape[0] == 0:
+        return np.zeros(0, dtype=float)
+    return model.predict_proba(features)[:, 1].astype(float)
@@ -0,0 +1,300 @@
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .geo import KM_PER_DEGREE, haversineDistanceKm
+
+
+Cell = Tuple[int, int]
+Neighbor = Tuple[str, float, Any]
+
+
+class SpatialIndex:
+    """In-memory grid index for k-nearest and radius lookups.
+
+    Points are bucketed into square ``cellSizeDeg`` lat/lng cells and their
+    coordinates live in flat NumPy arrays, so a query only visits the cells
+    that can contain an answer and computes all candidate distances in one
+    vectorized haversine call. Insert, move and remove are O(1), which lets
+    the index be refreshed incrementally instead of rebuilt.
+    """
+
+    def __init__(self, cellSizeDeg: float = 0.01, initialCapacity: int = 1024) -> None:
+        if cellSizeDeg <= 0:
+            raise ValueError("cellSizeDeg must be positive")
+        self.cellSizeDeg = float(cellSizeDeg)
+        capacity = max(1, int(initialCapacity))
+        self._lats = np.zeros(capacity, dtype=float)
+        self._lngs = np.zeros(capacity, dtype=float)
+        self._ids: List[Optional[str]] = []
+        self._payloads: List[Any] = []
+        self._cellOfSlot: List[Optional[Cell]] = []
+        self._cells: Dict[Cell, Set[int]] = {}
+        self._slotById: Dict[str, int] = {}
+        self._freeSlots: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._slotById)
+
+    def __contains__(self, pointId: object) -> bool:
+        return pointId in self._slotById
+
+    def _cellKey(self, lat: float, lng: float) -> Cell:
+        return (math.floor(lat / self.cellSizeDeg), math.floor(lng / self.cellSizeDeg))
+
+    def _allocateSlot(self) -> int:
+        if self._freeSlots:
+            return self._freeSlots.pop()
+        slot = len(self._ids)
+        if slot >= len(self._lats):
+            newCapacity = len(self._lats) * 2
+            self._lats = np.resize(self._lats, newCapacity)
+            self._lngs = np.resize(self._lngs, newCapacity)
+        self._ids.append(None)
+        self._payloads.append(None)
+        self._cellOfSlot.append(None)
+        return slot
+
+    def upsert(self, pointId: str, lat: float, lng: float, payload: Any = None) -> None:
+        pointId = str(pointId)
+        cell = self._cellKey(lat, lng)
+        slot = self._slotById.get(pointId)
+        if slot is None:
+            slot = self._allocateSlot()
+            self._slotById[pointId] = slot
+            self._ids[slot] = pointId
+        else:
+            previousCell = self._cellOfSlot[slot]
+            if previousCell != cell and previousCell is not None:
+                self._discardFromCell(previousCell, slot)
+        self._lats[slot] = lat
+        self._lngs[slot] = lng
+        self._payloads[slot] = payload
+        self._cellOfSlot[slot] = cell
+        self._cells.setdefault(cell, set()).add(slot)
+
+    def remove(self, pointId: str) -> bool:
+        slot = self._slotById.pop(str(pointId), None)
+        if slot is None:
+            return False
+        cell = self._cellOfSlot[slot]
+        if cell is not None:
+            self._discardFromCell(cell, slot)
+        self._ids[slot] = None
+        self._payloads[slot] = None
+        self._cellOfSlot[slot] = None
+        self._freeSlots.append(slot)
+        return True
+
+    def _discardFromCell(self, cell: Cell, slot: int) -> None:
+        members = self._cells.get(cell)
+        if members is None:
+            return
+        members.discard(slot)
+        if not members:
+            del self._cells[cell]
+
+    def ids(self) -> List[str]:
+        return list(self._slotById)
+
+    def copy(self) -> "SpatialIndex":
+        """Independent copy of the index; payloads are shared, not copied."""
+        clone = SpatialIndex(cellSizeDeg=self.cellSizeDeg, initialCapacity=1)
+        clone._lats = self._lats.copy()
+        clone._lngs = self._lngs.copy()
+        clone._ids = list(self._ids)
+        clone._payloads = list(self._payloads)
+        clone._cellOfSlot = list(self._cellOfSlot)
+        clone._cells = {cell: set(members) for cell, members in self._cells.items()}
+        clone._slotById = dict(self._slotById)
+        clone._freeSlots = list(self._freeSlots)
+        return clone
+
+    def payload(self, pointId: str) -> Any:
+        return self._payloads[self._slotById[str(pointId)]]
+
+    def _slotsInCells(self, cells: Iterable[Cell]) -> List[int]:
+        slots: List[int] = []
+        for cell in cells:
+            members = self._cells.get(cell)
+            if members:
+                slots.extend(members)
+        return slots
+
+    def _ringCells(self, origin: Cell, ring: int) -> List[Cell]:
+        row, col = origin
+        if ring == 0:
+            return [origin]
+        cells = [(row - ring, col + offset) for offset in range(-ring, ring + 1)]
+        cells += [(row + ring, col + offset) for offset in range(-ring, ring + 1)]
+        cells += [(row + offset, col - ring) for offset in range(-ring + 1, ring)]
+        cells += [(row + offset, col + ring) for offset in range(-ring + 1, ring)]
+        return cells
+
+    def _minRingDistanceKm(self, lat: float, ring: int) -> float:
+        """Lower bound on the distance to any point outside ``ring`` rings."""
+        furthestLat = min(89.999, abs(lat) + (ring + 1) * self.cellSizeDeg)
+        cellKm = self.cellSizeDeg * KM_PER_DEGREE
+        return ring * cellKm * math.cos(math.radians(furthestLat))
+
+    def _neighbors(self, slots: np.ndarray, distances: np.ndarray, order: np.ndarray) -> List[Neighbor]:
+        return [
+            (self._ids[int(slots[index])], float(distances[index]), self._payloads[int(slots[index])])
+            for index in order
+        ]
+
+    def nearest(self, lat: float, lng: float, k: int = 5, maxRadiusKm: Optional[float] = None) -> List[Neighbor]:
+        """Return up to ``k`` (id, distanceKm, payload) tuples, nearest first."""
+        total = len(self._slotById)
+        if k <= 0 or total == 0:
+            return []
+        origin = self._cellKey(lat, lng)
+        slotChunks: List[np.ndarray] = []
+        distanceChunks: List[np.ndarray] = []
+        found = 0
+        ring = 0
+        while True:
+            if 8 * ring > len(self._cells):
+                # Rings now cost more than a scan of what is left.
+                seen = set(np.concatenate(slotChunks).tolist()) if slotChunks else set()
+                remaining = [slot for slot in self._slotById.values() if slot not in seen]
+                ringSlots = np.array(remaining, dtype=int)
+            else:
+                ringSlots = np.array(self._slotsInCells(self._ringCells(origin, ring)), dtype=int)
+            if ringSlots.size:
+                slotChunks.append(ringSlots)
+                distanceChunks.append(haversineDistanceKm(lat, lng, self._lats[ringSlots], self._lngs[ringSlots]))
+                found += ringSlots.size
+            if found >= total or 8 * ring > len(self._cells):
+                break
+            lowerBound = self._minRingDistanceKm(lat, ring)
+            if maxRadiusKm is not None and lowerBound > maxRadiusKm:
+                break
+            if found >= k:
+                distances = np.concatenate(distanceChunks)
+                kth = np.partition(distances, k - 1)[k - 1]
+                if kth <= lowerBound:
+                    break
+            ring += 1
+
+        if not slotChunks:
+            return []
+        slots = np.concatenate(slotChunks)
+        distances = np.concatenate(distanceChunks)
+        if maxRadiusKm is not None:
+            keep = distances <= maxRadiusKm
+            slots, distances = slots[keep], distances[keep]
+        count = min(k, distances.size)
+        if count == 0:
+            return []
+        order = np.argpartition(distances, count - 1)[:count]
+        order = order[np.argsort(distances[order], kind="stable")]
+        return self._neighbors(slots, distances, order)
+
+    def withinRadius(self, lat: float, lng: float, radiusKm: float, limit: Optional[int] = None) -> List[Neighbor]:
+        """Return every point within ``radiusKm``, nearest first."""
+        if radiusKm < 0 or not self._slotById:
+            return []
+        cellKm = self.cellSizeDeg * KM_PER_DEGREE
+        latRings = int(math.ceil(radiusKm / cellKm))
+        lngScale = max(math.cos(math.radians(min(89.999, abs(lat) + (latRings + 1) * self.cellSizeDeg))), 1e-6)
+        lngRings = int(math.ceil(radiusKm / (cellKm * lngScale)))
+        row, col = self._cellKey(lat, lng)
+        if (2 * latRings + 1) * (2 * lngRings + 1) > len(self._cells):
+            cells: Iterable[Cell] = [
+                cell for cell in self._cells
+                if abs(cell[0] - row) <= latRings and abs(cell[1] - col) <= lngRings
+            ]
+        else:
+            cells = [
+                (row + rowOffset, col + colOffset)
+                for rowOffset in range(-latRings, latRings + 1)
+                for colOffset in range(-lngRings, lngRings + 1)
+            ]
+        slots = np.array(self._slotsInCells(cells), dtype=int)
+        if not slots.size:
+            return []
+        distances = haversineDistanceKm(lat, lng, self._lats[slots], self._lngs[slots])
+        keep = distances <= radiusKm
+        slots, distances = slots[keep], distances[keep]
+        order = np.argsort(distances, kind="stable")
+        if limit is not None:
+            order = order[:limit]
+        return self._neighbors(slots, distances, order)
+
+
+def _documentLatLng(doc: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    location = doc.get("location")
+    if not isinstance(location, dict):
+        return None
+    try:
+        if location.get("type") == "Point":
+            lng, lat = location["coordinates"][:2]
+            return float(lat), float(lng)
+        return float(location["lat"]), float(location["lng"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def applyDocuments(index: SpatialIndex, documents: Iterable[Dict[str, Any]], prune: bool = True) -> Tuple[int, int]:
+    """Upsert located documents keyed by ``id``; optionally drop missing ids.
+
+    Returns (upserted, removed) counts.
+    """
+    seen: Set[str] = set()
+    upserted = 0
+    for doc in documents:
+        if not isinstance(doc, dict) or doc.get("id") is None:
+            continue
+        latLng = _documentLatLng(doc)
+        if latLng is None:
+            continue
+        pointId = str(doc["id"])
+        seen.add(pointId)
+        if pointId in index and index.payload(pointId) == doc:
+            continue
+        index.upsert(pointId, latLng[0], latLng[1], doc)
+        upserted += 1
+    removed = 0
+    if prune:
+        for pointId in index.ids():
+            if pointId not in seen:
+                index.remove(pointId)
+                removed += 1
+    return upserted, removed
+
+
+class JsonSpatialIndex:
+    """A ``SpatialIndex`` kept in sync with a clean-data JSON file.
+
+    ``refresh`` re-reads the file only when its mtime changes and applies the
+    difference, so unchanged points are never re-inserted. The difference is
+    applied to a copy that then replaces ``index``, so ``refresh`` can run on
+    a worker thread while readers keep querying the previous index.
+    """
+
+    def __init__(self, path: Path, cellSizeDeg: float = 0.01) -> None:
+        self.path = Path(path)
+        self.index = SpatialIndex(cellSizeDeg=cellSizeDeg)
+        self._loadedMtime: Optional[float] = None
+
+    def refresh(self) -> bool:
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return False
+        if mtime == self._loadedMtime:
+            return False
+        with self.path.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        if not isinstance(data, list):
+            raise ValueError(f"Expected list in {self.path}, got {type(data)}")
+        index = self.index.copy()
+        applyDocuments(index, data)
+        self.index = index
+        self._loadedMtime = mtime
+        return True
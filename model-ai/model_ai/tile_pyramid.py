@@ -0,0 +1,137 @@
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+MAX_MERCATOR_LAT = 85.05112878
+
+
+def lngLatToTileFraction(lats: np.ndarray, lngs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Web-Mercator position of each point as a fraction of the world, in [0, 1)."""
+    lats = np.clip(np.asarray(lats, dtype=float), -MAX_MERCATOR_LAT, MAX_MERCATOR_LAT)
+    lngs = np.asarray(lngs, dtype=float)
+    xFraction = (lngs + 180.0) / 360.0
+    latRadians = np.radians(lats)
+    yFraction = (1.0 - np.log(np.tan(latRadians) + 1.0 / np.cos(latRadians)) / math.pi) / 2.0
+    return xFraction, yFraction
+
+
+def tileBounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """(minLat, maxLat, minLng, maxLng) covered by slippy-map tile z/x/y."""
+    scale = 2 ** z
+
+    def tileLat(tileY: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1.0 - 2.0 * tileY / scale))))
+
+    return tileLat(y + 1), tileLat(y), x / scale * 360.0 - 180.0, (x + 1) / scale * 360.0 - 180.0
+
+
+class _Level:
+    """Sparse sum/count cells of one zoom level, ordered by tile."""
+
+    def __init__(self, zoom: int, tileSize: int, pixelX: np.ndarray, pixelY: np.ndarray, sums: np.ndarray, counts: np.ndarray) -> None:
+        self.zoom = zoom
+        self.tileSize = tileSize
+        tilesPerSide = 2 ** zoom
+        tileKeys = (pixelX // tileSize) * tilesPerSide + (pixelY // tileSize)
+        order = np.argsort(tileKeys, kind="stable")
+        self.pixelX = pixelX[order]
+        self.pixelY = pixelY[order]
+        self.sums = sums[order]
+        self.counts = counts[order]
+        self.tileKeys, self.starts, tileCellCounts = np.unique(tileKeys[order], return_index=True, return_counts=True)
+        self.ends = self.starts + tileCellCounts
+
+    def coarsen(self) -> "_Level":
+        """Aggregate 2x2 pixel blocks into the level above."""
+        parentX = self.pixelX // 2
+        parentY = self.pixelY // 2
+        side = 2 ** (self.zoom - 1) * self.tileSize
+        keys, inverse = np.unique(parentX * side + parentY, return_inverse=True)
+        sums = np.bincount(inverse, weights=self.sums, minlength=keys.size)
+        counts = np.bincount(inverse, weights=self.counts, minlength=keys.size).astype(np.int64)
+        return _Level(self.zoom - 1, self.tileSize, keys // side, keys % side, sums, counts)
+
+    def tile(self, x: int, y: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        key = x * 2 ** self.zoom + y
+        position = int(np.searchsorted(self.tileKeys, key))
+        if position >= self.tileKeys.size or self.tileKeys[position] != key:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0), empty
+        start, end = self.starts[position], self.ends[position]
+        return (
+            self.pixelX[start:end] - x * self.tileSize,
+            self.pixelY[start:end] - y * self.tileSize,
+            self.sums[start:end],
+            self.counts[start:end],
+        )
+
+
+class TilePyramid:
+    """Heatmap aggregates for every slippy-map tile from zoom 0 to ``maxZoom``.
+
+    Each tile is split into ``tileSize`` x ``tileSize`` cells holding a score
+    sum and a point count. The points are binned once at ``maxZoom``; every
+    lower zoom is derived from the one below by merging 2x2 cells, so the raw
+    points are never rescanned.
+    """
+
+    def __init__(self, levels: List[_Level], tileSize: int, maxZoom: int, pointCount: int) -> None:
+        self._levels = levels
+        self.tileSize = tileSize
+        self.maxZoom = maxZoom
+        self.pointCount = pointCount
+
+    @classmethod
+    def build(
+        cls,
+        lats: np.ndarray,
+        lngs: np.ndarray,
+        scores: Optional[np.ndarray] = None,
+        maxZoom: int = 16,
+        tileSize: int = 32,
+    ) -> "TilePyramid":
+        if maxZoom < 0:
+            raise ValueError("maxZoom must be non-negative")
+        lats = np.asarray(lats, dtype=float)
+        lngs = np.asarray(lngs, dtype=float)
+        scores = np.ones(lats.size) if scores is None else np.asarray(scores, dtype=float)
+
+        side = 2 ** maxZoom * tileSize
+        xFraction, yFraction = lngLatToTileFraction(lats, lngs)
+        pixelX = np.clip((xFraction * side).astype(np.int64), 0, side - 1)
+        pixelY = np.clip((yFraction * side).astype(np.int64), 0, side - 1)
+        keys, inverse = np.unique(pixelX * side + pixelY, return_inverse=True)
+        sums = np.bincount(inverse, weights=scores, minlength=keys.size)
+        counts = np.bincount(inverse, minlength=keys.size).astype(np.int64)
+
+        level = _Level(maxZoom, tileSize, keys // side, keys % side, sums, counts)
+        levels = [level]
+        for _ in range(maxZoom):
+            level = level.coarsen()
+            levels.append(level)
+        levels.reverse()
+        return cls(levels, tileSize, maxZoom, int(lats.size))
+
+    def tile(self, z: int, x: int, y: int) -> Dict[str, Any]:
+        """Sparse cells of tile z/x/y as [col, row, sum, count] rows (row 0 is north)."""
+        if not 0 <= z <= self.maxZoom:
+            raise ValueError(f"zoom must be between 0 and {self.maxZoom}")
+        tilesPerSide = 2 ** z
+        if not (0 <= x < tilesPerSide and 0 <= y < tilesPerSide):
+            raise ValueError(f"tile {z}/{x}/{y} is outside the world")
+        cols, rows, sums, counts = self._levels[z].tile(x, y)
+        return {
+            "z": z,
+            "x": x,
+            "y": y,
+            "tileSize": self.tileSize,
+            "bounds": tileBounds(z, x, y),
+            "sum": float(sums.sum()),
+            "count": int(counts.sum()),
+            "cells": [
+                [int(cols[index]), int(rows[index]), float(sums[index]), int(counts[index])]
+                for index in range(cols.size)
+            ],
+        }
@@ -1,5 +1,8 @@
+import os
 from pathlib import Path
 
+from .features import loadAlerts
+from .score_grid import alertBounds, buildUnsafeScoreGrid, saveUnsafeScoreGrid
 from .sos_risk_model import (
     saveSosRiskModel,
     trainSosRiskModel,
@@ -16,6 +19,18 @@ def main() -> None:
     unsafePath = saveUnsafeZoneModel(unsafeModel)
     print(f"Saved unsafe zone model to {unsafePath}")
 
+    print("Building unsafe score grid...")
+    alerts = loadAlerts()
+    bounds = alertBounds(alerts["lat"].to_numpy(), alerts["lng"].to_numpy())
+    grid = buildUnsafeScoreGrid(
+        unsafeModel,
+        bounds,
+        latSteps=int(os.getenv("UNSAFE_GRID_LAT_STEPS", "128")),
+        lngSteps=int(os.getenv("UNSAFE_GRID_LNG_STEPS", "128")),
+    )
+    gridPath = saveUnsafeScoreGrid(grid)
+    print(f"Saved unsafe score grid {grid.cells.shape} to {gridPath}")
+
     print("Training SOS risk model...")
     sosModel = trainSosRiskModel()
     sosPath = saveSosRiskModel(sosModel)
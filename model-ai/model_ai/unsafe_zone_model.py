@@ -1,13 +1,15 @@
+from __future__ import annotations
+
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import joblib
 import numpy as np
-from sklearn.metrics import classification_report
-from sklearn.model_selection import train_test_split
-from sklearn.tree import DecisionTreeClassifier
 
-from .features import buildUnsafeZoneFeatures, loadAlerts
+if TYPE_CHECKING:
+    from sklearn.tree import DecisionTreeClassifier
+
+# sklearn, pandas and joblib are imported inside the functions that need
+# them so the serving path (predict*) only pays for NumPy at import time.
 
 
 def getTrainedDir() -> Path:
@@ -15,6 +17,12 @@ def getTrainedDir() -> Path:
 
 
 def trainUnsafeZoneModel(alertsCsvDir: Optional[Path] = None) -> DecisionTreeClassifier:
+    from sklearn.metrics import classification_report
+    from sklearn.model_selection import train_test_split
+    from sklearn.tree import DecisionTreeClassifier
+
+    from .features import buildUnsafeZoneFeatures, loadAlerts
+
     alerts = loadAlerts(alertsCsvDir)
     X, y = buildUnsafeZoneFeatures(alerts)
     if len(np.unique(y)) < 2:
@@ -31,6 +39,8 @@ def trainUnsafeZoneModel(alertsCsvDir: Optional[Path] = None) -> DecisionTreeCla
 
 
 def saveUnsafeZoneModel(model: DecisionTreeClassifier, fileName: str = "unsafe_zone_model.pkl") -> Path:
+    import joblib
+
     trainedDir = getTrainedDir()
     trainedDir.mkdir(parents=True, exist_ok=True)
     path = trainedDir / fileName
@@ -39,6 +49,8 @@ def saveUnsafeZoneModel(model: DecisionTreeClassifier, fileName: str = "unsafe_z
 
 
 def loadUnsafeZoneModel(fileName: str = "unsafe_zone_model.pkl") -> DecisionTreeClassifier:
+    import joblib
+
     path = getTrainedDir() / fileName
     if not path.exists():
         raise FileNotFoundError(f"Unsafe zone model file not found: {path}")
@@ -60,3 +72,13 @@ def predictUnsafeScore(
         return float(proba)
     prediction = model.predict(features)[0]
     return float(prediction)
+
+
+def predictUnsafeScoresBatch(model: DecisionTreeClassifier, features: np.ndarray) -> np.ndarray:
+    """Score an (N, 5) matrix of [lat, lng, hour, dayOfWeek, severityCode] rows."""
+    features = np.asarray(features, dtype=float)
+    if features.shape[0] == 0:
+        return np.zeros(0, dtype=float)
+    if hasattr(model, "predict_proba"):
+        return model.predict_proba(features)[:, 1].astype(float)
+    return model.predict(features).astype(float)
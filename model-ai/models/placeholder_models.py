@@ -1,6 +1,8 @@
 import math
 from typing import Sequence
 
+import numpy as np
+
 
 class LogisticSafetyModel:
     """Lightweight placeholder for a logistic regression-style safety model.
@@ -24,6 +26,13 @@ class LogisticSafetyModel:
             zValue += features[index] * self.weights[index]
         return 1.0 / (1.0 + math.exp(-zValue))
 
+    def predictProbaBatch(self, features: np.ndarray) -> np.ndarray:
+        """``predictProba`` for every row of an (N, k) feature matrix."""
+        features = np.atleast_2d(np.asarray(features, dtype=float))
+        weights = np.asarray(self.weights, dtype=float)
+        size = min(features.shape[1], weights.size)
+        return _sigmoid(features[:, :size] @ weights[:size] + self.bias)
+
 
 class RandomForestSafetyModel:
     """Lightweight placeholder for a random forest-style safety model.
@@ -33,10 +42,12 @@ class RandomForestSafetyModel:
     """
 
     def __init__(self) -> None:
+        # Feature order: speed, sudden stop, unsafe probability, time in app,
+        # dwell time, distance from the last safe spot.
         self.trees: list[tuple[list[float], float]] = [
-            ([0.3, 0.1, -0.1], 0.05),
-            ([0.1, 0.25, 0.05], -0.05),
-            ([0.05, 0.05, 0.2], 0.0),
+            ([0.3, 0.1, -0.1, 0.0, 0.1, 0.2], 0.05),
+            ([0.1, 0.25, 0.05, 0.0, 0.15, 0.1], -0.05),
+            ([0.05, 0.05, 0.2, 0.0, 0.05, 0.3], 0.0),
         ]
 
     @staticmethod
@@ -52,3 +63,25 @@ class RandomForestSafetyModel:
             return 0.5
         probabilities = [self._treeProba(features, weights, bias) for (weights, bias) in self.trees]
         return sum(probabilities) / len(probabilities)
+
+    def predictProbaBatch(self, features: np.ndarray) -> np.ndarray:
+        """``predictProba`` for every row of an (N, k) feature matrix.
+
+        Tree weights are stacked into one zero-padded matrix so every tree is
+        evaluated for every row in a single ``X @ W.T + b``.
+        """
+        features = np.atleast_2d(np.asarray(features, dtype=float))
+        if not self.trees:
+            return np.full(features.shape[0], 0.5)
+        width = max(len(weights) for weights, _ in self.trees)
+        # Zero padding matches _treeProba, which ignores missing weights.
+        weightMatrix = np.zeros((len(self.trees), width), dtype=float)
+        for index, (weights, _) in enumerate(self.trees):
+            weightMatrix[index, : len(weights)] = weights
+        biases = np.array([bias for _, bias in self.trees], dtype=float)
+        size = min(features.shape[1], width)
+        return _sigmoid(features[:, :size] @ weightMatrix[:, :size].T + biases).mean(axis=1)
+
+
+def _sigmoid(values: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-values))
@@ -1,6 +1,13 @@
 import unittest
 
-from inference.night_mode_predictor import getMockNightModeInput, predictNightMode
+import numpy as np
+
+from inference.night_mode_predictor import (
+    getMockNightModeInput,
+    nightWindowMask,
+    predictNightMode,
+    predictNightModeBatch,
+)
 
 
 class NightModePredictorTests(unittest.TestCase):
@@ -13,6 +20,42 @@ class NightModePredictorTests(unittest.TestCase):
         self.assertIn("shouldEnable", result)
         self.assertIn("threshold", result)
 
+    def test_night_window_wraps_midnight(self) -> None:
+        mask = nightWindowMask(np.arange(24))
+        self.assertEqual(np.flatnonzero(mask).tolist(), [0, 1, 2, 3, 4, 22, 23])
+
+    def test_batch_matches_single_contexts(self) -> None:
+        generator = np.random.default_rng(11)
+        columns = {
+            "unsafeProbability": generator.random(48),
+            "incidentScore": generator.random(48) * 3.0,
+            "userPreference": generator.random(48),
+            "hour": np.arange(48) % 24,
+        }
+        result = predictNightModeBatch(columns)
+
+        for index in range(48):
+            single = predictNightMode({name: values[index].item() for name, values in columns.items()})
+            self.assertAlmostEqual(float(result["score"][index]), single["score"], places=12)
+            self.assertEqual(bool(result["shouldEnable"][index]), single["shouldEnable"])
+
+    def test_batch_defaults_missing_columns(self) -> None:
+        result = predictNightModeBatch({"hour": [23, 12]})
+        expected = [predictNightMode({"hour": hour})["score"] for hour in (23, 12)]
+        np.testing.assert_allclose(result["score"], expected)
+
+    def test_batch_accepts_scalars_and_missing_hours(self) -> None:
+        scalar = predictNightModeBatch({"hour": 23, "unsafeProbability": 0.9})
+        self.assertEqual(scalar["score"].shape, (1,))
+        self.assertAlmostEqual(
+            float(scalar["score"][0]), predictNightMode({"hour": 23, "unsafeProbability": 0.9})["score"]
+        )
+
+        result = predictNightModeBatch({"hour": [None, 12, 23]})
+        expected = [predictNightMode({"hour": hour})["score"] for hour in (None, 12, 23)]
+        np.testing.assert_allclose(result["score"], expected)
+        np.testing.assert_allclose(predictNightModeBatch({"hour": np.array([np.nan, 12.0])})["score"], expected[:2])
+
 
 if __name__ == "__main__":
     unittest.main()
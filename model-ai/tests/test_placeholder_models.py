@@ -0,0 +1,37 @@
+import unittest
+
+import numpy as np
+
+from models.placeholder_models import LogisticSafetyModel, RandomForestSafetyModel
+
+
+class PlaceholderModelBatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        generator = np.random.default_rng(5)
+        self.features = generator.uniform(-2.0, 2.0, (64, 4))
+
+    def assertBatchMatches(self, model, features: np.ndarray) -> None:
+        batch = model.predictProbaBatch(features)
+        self.assertEqual(batch.shape, (features.shape[0],))
+        expected = [model.predictProba(row.tolist()) for row in features]
+        np.testing.assert_allclose(batch, expected, rtol=0.0, atol=1e-12)
+
+    def test_logistic_batch_matches_single_rows(self) -> None:
+        self.assertBatchMatches(LogisticSafetyModel(), self.features)
+        self.assertBatchMatches(LogisticSafetyModel(weights=[0.5, -1.0], bias=0.2), self.features)
+        self.assertBatchMatches(LogisticSafetyModel(weights=[0.5, -1.0, 0.3, 0.1, 0.9]), self.features[:, :3])
+
+    def test_forest_batch_matches_single_rows(self) -> None:
+        model = RandomForestSafetyModel()
+        self.assertBatchMatches(model, self.features)
+        model.trees.append(([0.7], -0.3))
+        self.assertBatchMatches(model, self.features[:, :2])
+
+    def test_forest_without_trees_is_neutral(self) -> None:
+        model = RandomForestSafetyModel()
+        model.trees = []
+        np.testing.assert_array_equal(model.predictProbaBatch(self.features), np.full(64, 0.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
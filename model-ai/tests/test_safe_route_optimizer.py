@@ -1,6 +1,10 @@
 import unittest
 
-from inference.safe_route_optimizer import getMockRoutesInput, optimizeSafeRoute
+import numpy as np
+
+from inference.safe_route_optimizer import _fallbackNetwork, getMockRoutesInput, optimizeSafeRoute
+from model_ai.road_graph import graphFromPolylines
+from model_ai.routing import RoadNetwork, setRoadNetwork
 from utils import buildRouteGraph, dijkstraShortestPath
 
 
@@ -14,6 +18,94 @@ class SafeRouteOptimizerTests(unittest.TestCase):
         self.assertIn("bestRoute", result)
         self.assertTrue(result["graphUsed"])
 
+    def test_optimize_safe_route_uses_loaded_road_network(self) -> None:
+        routes = getMockRoutesInput()
+        setRoadNetwork(RoadNetwork(graphFromPolylines(routes)[0]))
+        try:
+            result = optimizeSafeRoute(routes)
+        finally:
+            setRoadNetwork(None)
+
+        self.assertTrue(result["roadNetworkUsed"])
+        for summary in result["routes"]:
+            route = routes[summary["index"]]
+            self.assertEqual(summary["graphPath"][0], (route[0]["lat"], route[0]["lng"]))
+            self.assertEqual(summary["graphPath"][-1], (route[-1]["lat"], route[-1]["lng"]))
+
+    def test_departure_time_switches_to_risk_weighted_costs(self) -> None:
+        routes = getMockRoutesInput()
+        network = RoadNetwork(graphFromPolylines(routes)[0], scorer=lambda features: features[:, 2] / 23.0)
+        setRoadNetwork(network)
+        try:
+            result = optimizeSafeRoute(routes, departureTime="2025-01-01T23:15:00", riskWeight=1.0)
+        finally:
+            setRoadNetwork(None)
+
+        self.assertTrue(result["riskWeighted"])
+        for summary in result["routes"]:
+            self.assertGreater(summary["graphDistance"], summary["graphLengthKm"])
+
+    def test_risk_weighted_ranking_uses_graph_cost(self) -> None:
+        routes = getMockRoutesInput()
+        # Everything north of 12.965 is risky, which only the shorter first route enters.
+        network = RoadNetwork(
+            graphFromPolylines(routes)[0], scorer=lambda features: (features[:, 0] > 12.965).astype(float)
+        )
+        setRoadNetwork(network)
+        try:
+            plain = optimizeSafeRoute(routes)
+            weighted = optimizeSafeRoute(routes, departureTime="2025-01-01T23:15:00", riskWeight=5.0)
+        finally:
+            setRoadNetwork(None)
+
+        self.assertEqual(plain["bestRouteIndex"], 0)
+        self.assertEqual(weighted["bestRouteIndex"], 1)
+
+    def test_risk_weighted_ranking_separates_routes_with_shared_endpoints(self) -> None:
+        start, end = {"lat": 12.94, "lng": 77.58}, {"lat": 12.94, "lng": 77.62}
+        safe = [start, {"lat": 12.92, "lng": 77.60}, end]
+        risky = [start, {"lat": 12.96, "lng": 77.60}, end]
+        routes = [risky, safe]
+        # Edges north of 12.945 are risky; the detour south is no longer than the one north.
+        network = RoadNetwork(
+            graphFromPolylines(routes)[0], scorer=lambda features: (features[:, 0] > 12.945).astype(float)
+        )
+        setRoadNetwork(network)
+        try:
+            result = optimizeSafeRoute(routes, departureTime="2025-01-01T23:15:00", riskWeight=50.0)
+        finally:
+            setRoadNetwork(None)
+
+        summaries = {summary["index"]: summary for summary in result["routes"]}
+        self.assertEqual(summaries[0]["graphDistance"], summaries[1]["graphDistance"])
+        self.assertGreater(summaries[0]["riskCost"], summaries[1]["riskCost"])
+        self.assertEqual(result["bestRouteIndex"], 1)
+
+    def test_missing_models_fall_back_to_length_routing(self) -> None:
+        def missingModel(features: np.ndarray) -> np.ndarray:
+            raise FileNotFoundError("Unsafe zone model file not found")
+
+        routes = getMockRoutesInput()
+        network = RoadNetwork(graphFromPolylines(routes)[0], scorer=missingModel)
+        setRoadNetwork(network)
+        try:
+            result = optimizeSafeRoute(routes, departureTime="2025-01-01T23:15:00", riskWeight=1.0)
+            alternatives = network.alternatives(12.9716, 77.5946, 12.9750, 77.6200, k=2, hour=23, riskWeight=1.0)
+        finally:
+            setRoadNetwork(None)
+
+        self.assertNotIn("error", result)
+        self.assertFalse(result["riskWeighted"])
+        for summary in result["routes"]:
+            self.assertAlmostEqual(summary["graphDistance"], summary["graphLengthKm"])
+        self.assertTrue(alternatives)
+        self.assertFalse(any(route["riskWeighted"] for route in alternatives))
+
+    def test_fallback_network_is_reused_for_the_same_candidates(self) -> None:
+        routes = getMockRoutesInput()
+        self.assertIs(_fallbackNetwork(routes), _fallbackNetwork(getMockRoutesInput()))
+        self.assertIsNot(_fallbackNetwork(routes), _fallbackNetwork(routes[:1]))
+
     def test_graph_and_dijkstra_consistency(self) -> None:
         routes = getMockRoutesInput()
         graph = buildRouteGraph(routes)
@@ -1,6 +1,27 @@
+import asyncio
 import unittest
 
-from inference.sos_risk_model import getMockSosRiskInput, predictSosRisk
+from inference.sos_risk_model import (
+    _sampleTime,
+    getMockSosRiskInput,
+    predictSosRisk,
+    predictSosRiskBatch,
+    recordSosSample,
+    streamSosRisk,
+    streamSosRiskAsync,
+)
+from utils import getDeviceStateStore
+
+
+def _contexts(count: int):
+    for index in range(count):
+        yield {
+            "deviceId": f"device-{index}",
+            "speedKmh": float(index % 60),
+            "suddenStop": index % 3 == 0,
+            "unsafeProbability": (index % 10) / 10.0,
+            "timeInAppSeconds": index % 900,
+        }
 
 
 class SosRiskModelTests(unittest.TestCase):
@@ -13,6 +34,113 @@ class SosRiskModelTests(unittest.TestCase):
         self.assertIn("riskLevel", result)
         self.assertIn("shouldPromptSos", result)
 
+    def test_batch_matches_single_predictions(self) -> None:
+        contexts = list(_contexts(20)) + [{"speedKmh": "fast"}]
+        results = predictSosRiskBatch(contexts)
+
+        for context, result in zip(contexts[:-1], results):
+            expected = predictSosRisk(context)
+            self.assertAlmostEqual(result["riskScore"], expected["riskScore"], places=12)
+            self.assertEqual(result["riskLevel"], expected["riskLevel"])
+            self.assertEqual(result["deviceId"], context["deviceId"])
+        self.assertIn("error", results[-1])
+
+    def test_device_history_derives_sudden_stop(self) -> None:
+        base = {"unsafeProbability": 0.5, "timeInAppSeconds": 120}
+        recordSosSample({**base, "deviceId": "braking-phone", "timestamp": 1000.0, "speedKmh": 45.0})
+        stopped = {**base, "deviceId": "braking-phone", "timestamp": 1002.0, "speedKmh": 1.0}
+        recordSosSample(stopped)
+        result = predictSosRisk(stopped)
+
+        explicit = predictSosRisk({**base, "speedKmh": 1.0, "suddenStop": True})
+        self.assertAlmostEqual(result["riskScore"], explicit["riskScore"])
+        self.assertGreater(result["riskScore"], predictSosRisk({**base, "speedKmh": 1.0})["riskScore"])
+        # Scoring again reads the same history instead of appending to it.
+        self.assertEqual(predictSosRisk(stopped), result)
+        self.assertEqual(getDeviceStateStore().features("braking-phone")["sampleCount"], 2.0)
+
+    def test_dwell_and_distance_from_safe_spot_raise_risk(self) -> None:
+        base = {"speedKmh": 1.0, "unsafeProbability": 0.6, "timeInAppSeconds": 120}
+        safeSpot = {"lat": 12.0, "lng": 77.0}
+        recordSosSample(
+            {**base, "deviceId": "lost-phone", "timestamp": 0.0, "unsafeProbability": 0.1, "location": safeSpot}
+        )
+        stranded = {**base, "deviceId": "lost-phone", "timestamp": 3600.0, "location": {"lat": 13.0, "lng": 77.0}}
+        recordSosSample(stranded)
+        recordSosSample({**base, "deviceId": "waiting-phone", "timestamp": 0.0})
+        waiting = {**base, "deviceId": "waiting-phone", "timestamp": 3600.0}
+        recordSosSample(waiting)
+
+        baseline = predictSosRisk(base)["riskScore"]
+        self.assertGreater(predictSosRisk(waiting)["riskScore"], baseline)
+        self.assertGreater(predictSosRisk(stranded)["riskScore"], predictSosRisk(waiting)["riskScore"])
+
+    def test_millisecond_timestamps_match_seconds(self) -> None:
+        self.assertEqual(_sampleTime(1_700_000_002_500), 1_700_000_002.5)
+        self.assertEqual(_sampleTime(1_700_000_002.5), 1_700_000_002.5)
+        self.assertIsNone(_sampleTime("not a time"))
+        self.assertIsNone(_sampleTime(None))
+
+    def test_stream_yields_results_in_order(self) -> None:
+        results = list(streamSosRisk(_contexts(50), batchSize=16, maxDelaySeconds=60.0))
+
+        self.assertEqual([result["deviceId"] for result in results], [f"device-{index}" for index in range(50)])
+        self.assertEqual(results, predictSosRiskBatch(list(_contexts(50))))
+
+    def test_async_stream_bounds_read_ahead(self) -> None:
+        batchSize = 8
+        produced = []
+
+        async def source():
+            for context in _contexts(200):
+                produced.append(context)
+                yield context
+
+        async def consume():
+            results = []
+            async for result in streamSosRiskAsync(source(), batchSize=batchSize, maxDelaySeconds=0.01):
+                results.append(result)
+                if len(results) == 1:
+                    await asyncio.sleep(0.05)
+                    # One batch being yielded, a full queue and one pending put.
+                    self.assertLessEqual(len(produced), 2 * batchSize + 1)
+            return results
+
+        results = asyncio.run(consume())
+        self.assertEqual([result["deviceId"] for result in results], [f"device-{index}" for index in range(200)])
+
+    def test_async_stream_flushes_partial_batch_on_timer(self) -> None:
+        async def source():
+            yield getMockSosRiskInput()
+            await asyncio.sleep(0.2)
+            yield getMockSosRiskInput()
+
+        async def firstResultDelay() -> float:
+            loop = asyncio.get_running_loop()
+            startedAt = loop.time()
+            async for _ in streamSosRiskAsync(source(), batchSize=64, maxDelaySeconds=0.01):
+                return loop.time() - startedAt
+            return float("inf")
+
+        self.assertLess(asyncio.run(firstResultDelay()), 0.15)
+
+    def test_async_stream_closes_early_with_a_full_queue(self) -> None:
+        async def source():
+            index = 0
+            while True:
+                yield {"deviceId": f"device-{index}", "speedKmh": 10.0}
+                index += 1
+
+        async def closeAfterFirstResult() -> None:
+            tasksBefore = asyncio.all_tasks()
+            stream = streamSosRiskAsync(source(), batchSize=4, maxDelaySeconds=0.01)
+            await stream.__anext__()
+            await asyncio.sleep(0.05)
+            await stream.aclose()
+            self.assertEqual(asyncio.all_tasks(), tasksBefore)
+
+        asyncio.run(asyncio.wait_for(closeAfterFirstResult(), 1.0))
+
 
 if __name__ == "__main__":
     unittest.main()
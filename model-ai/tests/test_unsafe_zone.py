@@ -1,6 +1,16 @@
 import unittest
 
-from inference.unsafe_zone_detector import getMockUnsafeZoneInput, predictUnsafeZones
+import numpy as np
+
+from inference.unsafe_zone_detector import (
+    _extractFeatures,
+    addUnsafeZonesToHeatmap,
+    createUnsafeZoneHeatmap,
+    getMockUnsafeZoneInput,
+    predictUnsafeZones,
+    predictUnsafeZonesBatch,
+)
+from utils import getUnsafeZoneModel
 
 
 class UnsafeZonePredictorTests(unittest.TestCase):
@@ -19,6 +29,59 @@ class UnsafeZonePredictorTests(unittest.TestCase):
         self.assertEqual(len(alerts), len(locations))
         self.assertEqual(len(scores), len(locations))
 
+    def test_batch_columns_match_per_item_model(self) -> None:
+        locations = getMockUnsafeZoneInput() + [
+            {"id": "custom", "location": {"lat": 12.95, "lng": 77.6}, "features": [0.9, 2.0]},
+            {"location": {"lat": 12.96, "lng": 77.61}, "hour": 3},
+        ]
+        model = getUnsafeZoneModel()
+        expected = [model.predictProba(_extractFeatures(item)) for item in locations]
+        scores = predictUnsafeZones(locations)["scores"]
+        for score, probability in zip(scores, expected):
+            self.assertAlmostEqual(score["unsafeProbability"], probability, places=12)
+        self.assertEqual(scores[-1]["id"], "unsafe-3")
+
+        batch = predictUnsafeZonesBatch(
+            {
+                "lat": np.array([12.9716, 12.9352]),
+                "lng": np.array([77.5946, 77.6245]),
+                "hour": np.array([23, 20]),
+                "recentIncidents": np.array([5, 1]),
+                "crowdScore": np.array([0.3, 0.7]),
+            }
+        )
+        np.testing.assert_allclose(batch.probabilities, expected[:2])
+        self.assertIsNone(batch._alerts)
+        self.assertEqual(batch.alerts[0]["location"], {"lat": 12.9716, "lng": 77.5946})
+
+    def test_live_heatmap_matches_batch_scores(self) -> None:
+        locations = getMockUnsafeZoneInput()
+        heatmap = createUnsafeZoneHeatmap()
+        scores = addUnsafeZonesToHeatmap(heatmap, locations)
+        batchScores = predictUnsafeZones(locations)["scores"]
+
+        self.assertEqual(scores, batchScores)
+        self.assertEqual(len(heatmap), len(locations))
+        self.assertAlmostEqual(
+            float(heatmap.snapshot()["sums"].sum()),
+            sum(item["unsafeProbability"] for item in scores),
+        )
+        heatmap.remove(locations[0]["id"])
+        self.assertEqual(int(heatmap.snapshot()["counts"].sum()), len(locations) - 1)
+
+    def test_live_heatmap_skips_missing_locations_and_keeps_unnamed_points(self) -> None:
+        heatmap = createUnsafeZoneHeatmap()
+        unnamed = {"location": {"lat": 12.96, "lng": 77.61}, "hour": 3}
+        broken = [{"hour": 3}, {"location": {"lat": None, "lng": 77.6}}, {"location": {"lat": float("nan"), "lng": 1.0}}]
+
+        first = addUnsafeZonesToHeatmap(heatmap, broken[:1] + [unnamed] + broken[1:])
+        second = addUnsafeZonesToHeatmap(heatmap, [unnamed])
+
+        self.assertEqual([score is None for score in first], [True, False, True, True])
+        self.assertNotEqual(first[1]["id"], second[0]["id"])
+        self.assertEqual(len(heatmap), 2)
+        self.assertTrue(heatmap.remove(first[1]["id"]))
+
 
 if __name__ == "__main__":
     unittest.main()
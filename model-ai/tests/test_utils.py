@@ -1,6 +1,6 @@
 import unittest
 
-from utils import haversineDistanceKm, normalizeScore
+from utils import generateDummyHeatmap, haversineDistanceKm, normalizeScore
 
 
 class UtilsTests(unittest.TestCase):
@@ -15,6 +15,26 @@ class UtilsTests(unittest.TestCase):
         self.assertGreaterEqual(middle, 0.0)
         self.assertLessEqual(middle, 1.0)
 
+    def test_heatmap_matches_cell_means(self) -> None:
+        points = [
+            (12.90, 77.50, 0.2),
+            (12.90, 77.50, 0.6),
+            (13.00, 77.60, 1.0),
+            (12.96, 77.56, 0.5),
+        ]
+        heatmap = generateDummyHeatmap(points, gridSize=3)
+
+        self.assertEqual(heatmap["bounds"], (12.90, 13.00, 77.50, 77.60))
+        self.assertAlmostEqual(heatmap["grid"][0][0], 0.4)
+        self.assertAlmostEqual(heatmap["grid"][1][1], 0.5)
+        self.assertAlmostEqual(heatmap["grid"][2][2], 1.0)
+        self.assertEqual(heatmap["grid"][0][2], 0.0)
+
+    def test_heatmap_empty_points(self) -> None:
+        heatmap = generateDummyHeatmap([], gridSize=4)
+        self.assertEqual(heatmap["grid"], [[0.0] * 4 for _ in range(4)])
+        self.assertEqual(heatmap["bounds"], (0.0, 1.0, 0.0, 1.0))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,15 +1,19 @@
 import math
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
-import matplotlib.pyplot as plt
+import numpy as np
 
 from models.placeholder_models import LogisticSafetyModel, RandomForestSafetyModel
-from config import safeRouteConfig, unsafeZoneConfig
+from config import safeRouteConfig, sosRiskConfig, unsafeZoneConfig
+from model_ai.device_state import DeviceStateStore
+from model_ai.geo import greatCircleKm
+from model_ai.heatmap import computeHeatmap
 
 
 unsafeZoneModelInstance: Optional[LogisticSafetyModel] = None
 sosRiskModelInstance: Optional[RandomForestSafetyModel] = None
+deviceStateStoreInstance: Optional[DeviceStateStore] = None
 
 
 def getUnsafeZoneModel() -> LogisticSafetyModel:
@@ -26,6 +30,18 @@ def getSosRiskModel() -> RandomForestSafetyModel:
     return sosRiskModelInstance
 
 
+def getDeviceStateStore() -> DeviceStateStore:
+    global deviceStateStoreInstance
+    if deviceStateStoreInstance is None:
+        deviceStateStoreInstance = DeviceStateStore(
+            windowSize=sosRiskConfig.deviceWindowSize,
+            ttlSeconds=sosRiskConfig.deviceTtlSeconds,
+            stopSpeedKmh=sosRiskConfig.stopSpeedKmh,
+            suddenStopDecelKmhPerS=sosRiskConfig.suddenStopDecelKmhPerS,
+        )
+    return deviceStateStoreInstance
+
+
 def parseTimestamp(value: Any) -> Optional[datetime]:
     if value is None:
         return None
@@ -38,14 +54,7 @@ def parseTimestamp(value: Any) -> Optional[datetime]:
 
 
 def haversineDistanceKm(latOne: float, lngOne: float, latTwo: float, lngTwo: float) -> float:
-    radiusKm = 6371.0
-    phiOne, phiTwo = math.radians(latOne), math.radians(latTwo)
-    deltaPhi = math.radians(latTwo - latOne)
-    deltaLambda = math.radians(lngTwo - lngOne)
-
-    valueA = math.sin(deltaPhi / 2.0) ** 2 + math.cos(phiOne) * math.cos(phiTwo) * math.sin(deltaLambda / 2.0) ** 2
-    valueC = 2.0 * math.atan2(math.sqrt(valueA), math.sqrt(1.0 - valueA))
-    return radiusKm * valueC
+    return greatCircleKm(latOne, lngOne, latTwo, lngTwo)
 
 
 def normalizeScore(value: float, minValue: float = 0.0, maxValue: float = 1.0) -> float:
@@ -56,58 +65,25 @@ def normalizeScore(value: float, minValue: float = 0.0, maxValue: float = 1.0) -
 
 
 def generateDummyHeatmap(
-    points: List[Tuple[float, float, float]],
+    points: Union[Sequence[Tuple[float, float, float]], np.ndarray],
     gridSize: Optional[int] = None,
     bounds: Optional[Tuple[float, float, float, float]] = None,
 ) -> Dict[str, Any]:
+    """Mean unsafe score per grid cell for (lat, lng, score) points.
+
+    Binning is vectorized in ``model_ai.heatmap``; pass an (N, 3) array to
+    skip the tuple-to-array conversion. Drawing lives in
+    ``model_ai.heatmap.exportHeatmapImage``.
+    """
     if gridSize is None:
         gridSize = unsafeZoneConfig.heatmapGridSize
 
-    if not points:
-        emptyGrid = [[0.0 for _ in range(gridSize)] for _ in range(gridSize)]
-        return {
-            "grid": emptyGrid,
-            "bounds": bounds or (0.0, 1.0, 0.0, 1.0),
-            "gridSize": gridSize,
-        }
-
-    latValues = [point[0] for point in points]
-    lngValues = [point[1] for point in points]
-
-    if bounds is None:
-        minLat, maxLat = min(latValues), max(latValues)
-        minLng, maxLng = min(lngValues), max(lngValues)
-    else:
-        minLat, maxLat, minLng, maxLng = bounds
-
-    if maxLat == minLat:
-        maxLat += 1e-6
-    if maxLng == minLng:
-        maxLng += 1e-6
-
-    grid = [[0.0 for _ in range(gridSize)] for _ in range(gridSize)]
-    counts = [[0 for _ in range(gridSize)] for _ in range(gridSize)]
-
-    for latValue, lngValue, score in points:
-        rowIndex = int((latValue - minLat) / (maxLat - minLat) * (gridSize - 1))
-        colIndex = int((lngValue - minLng) / (maxLng - minLng) * (gridSize - 1))
-        rowIndex = max(0, min(gridSize - 1, rowIndex))
-        colIndex = max(0, min(gridSize - 1, colIndex))
-        grid[rowIndex][colIndex] += score
-        counts[rowIndex][colIndex] += 1
-
-    for rowIndex in range(gridSize):
-        for colIndex in range(gridSize):
-            if counts[rowIndex][colIndex] > 0:
-                grid[rowIndex][colIndex] /= counts[rowIndex][colIndex]
-
-    figure, axis = plt.subplots()
-    axis.imshow(grid, origin="lower")
-    plt.close(figure)
+    values = np.asarray(points, dtype=float).reshape(-1, 3)
+    heatmap = computeHeatmap(values[:, 0], values[:, 1], values[:, 2], gridSize, bounds)
 
     return {
-        "grid": grid,
-        "bounds": (minLat, maxLat, minLng, maxLng),
+        "grid": heatmap["grid"].tolist(),
+        "bounds": heatmap["bounds"],
         "gridSize": gridSize,
     }
 
@@ -122,24 +98,38 @@ def addUndirectedEdge(graph: Graph, nodeA: Node, nodeB: Node, weight: float) ->
 
 
 def dijkstraShortestPath(graph: Graph, source: Node, target: Node) -> Tuple[float, List[Node]]:
+    """Dijkstra over the coordinate-keyed graph from ``buildRouteGraph``.
+
+    Kept for small ad-hoc graphs; routing on real road networks goes through
+    ``model_ai.road_graph`` and ``model_ai.shortest_path``.
+    """
     import heapq
 
-    queue: List[Tuple[float, Node, List[Node]]] = [(0.0, source, [])]
+    queue: List[Tuple[float, Node]] = [(0.0, source)]
+    distances: Dict[Node, float] = {source: 0.0}
+    predecessors: Dict[Node, Node] = {}
     visited: set[Node] = set()
 
     while queue:
-        distance, node, path = heapq.heappop(queue)
+        distance, node = heapq.heappop(queue)
         if node in visited:
             continue
         visited.add(node)
-        path = path + [node]
 
         if node == target:
+            path = [node]
+            while node != source:
+                node = predecessors[node]
+                path.append(node)
+            path.reverse()
             return distance, path
 
         for neighbor, weight in graph.get(node, []):
-            if neighbor not in visited:
-                heapq.heappush(queue, (distance + weight, neighbor, path))
+            candidate = distance + weight
+            if neighbor not in visited and candidate < distances.get(neighbor, math.inf):
+                distances[neighbor] = candidate
+                predecessors[neighbor] = node
+                heapq.heappush(queue, (candidate, neighbor))
 
     return float("inf"), []
 
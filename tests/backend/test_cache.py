@@ -0,0 +1,195 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+projectRoot = Path(__file__).resolve().parents[2]
+backendRoot = projectRoot / "backend"
+if str(backendRoot) not in sys.path:
+    sys.path.insert(0, str(backendRoot))
+
+import main
+from cache import ResponseCache, buildCacheKey
+from config import MAX_BATCH_SIZE
+from models import ApiResponse
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRequest:
+    def __init__(self, headers=None) -> None:
+        self.headers = headers or {}
+
+
+def test_hit_and_miss_are_counted() -> None:
+    cache = ResponseCache(maxEntries=4, ttlSeconds=10.0, clock=FakeClock())
+    assert cache.get("/alerts?limit=1") is None
+    entry = cache.set("/alerts?limit=1", b'{"ok":true}')
+
+    assert cache.get("/alerts?limit=1") is entry
+    assert entry.etag.startswith('"') and entry.etag.endswith('"')
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hitRate"]) == (1, 1, 0.5)
+
+
+def test_entries_expire_after_ttl() -> None:
+    clock = FakeClock()
+    cache = ResponseCache(maxEntries=4, ttlSeconds=10.0, clock=clock)
+    cache.set("key", b"body")
+
+    clock.now = 9.9
+    assert cache.get("key") is not None
+    clock.now = 10.0
+    assert cache.get("key") is None
+    assert len(cache) == 0
+    assert cache.stats()["expirations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = ResponseCache(maxEntries=2, ttlSeconds=10.0, clock=FakeClock())
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")
+    cache.set("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_by_prefix() -> None:
+    cache = ResponseCache(maxEntries=8, ttlSeconds=10.0)
+    for key in ("/heatmap/1/0/0", "/heatmap/2/1/1", "/nearest?k=5"):
+        cache.set(key, b"x")
+
+    assert cache.invalidate("/heatmap") == 2
+    assert len(cache) == 1
+    assert buildCacheKey("/nearest", {"k": 5, "radius": None, "lat": 1.0}) == "/nearest?k=5&lat=1.0"
+
+
+def test_cached_response_returns_304_for_matching_etag(monkeypatch) -> None:
+    monkeypatch.setattr(main, "responseCache", ResponseCache(maxEntries=4, ttlSeconds=60.0))
+    builds = []
+
+    async def build() -> ApiResponse:
+        builds.append(1)
+        return ApiResponse(success=True, message="ok", data={"value": 1})
+
+    first = asyncio.run(main._cachedResponse(FakeRequest(), "/test", build, checkDataVersion=False))
+    etag = first.headers["etag"]
+    second = asyncio.run(
+        main._cachedResponse(FakeRequest({"if-none-match": etag}), "/test", build, checkDataVersion=False)
+    )
+    stale = asyncio.run(
+        main._cachedResponse(FakeRequest({"if-none-match": '"old"'}), "/test", build, checkDataVersion=False)
+    )
+
+    assert first.status_code == 200
+    assert second.status_code == 304 and second.body == b""
+    assert stale.status_code == 200 and stale.body == first.body
+    assert len(builds) == 1
+
+
+@pytest.mark.parametrize(
+    "configuredToken, sentToken, expectedStatus",
+    [("", "anything", 404), ("secret", None, 403), ("secret", "wrong", 403), ("secret", "secret", 200)],
+)
+def test_invalidate_route_requires_admin_token(monkeypatch, configuredToken, sentToken, expectedStatus) -> None:
+    monkeypatch.setattr(main, "CACHE_ADMIN_TOKEN", configuredToken)
+    monkeypatch.setattr(main, "responseCache", ResponseCache(maxEntries=4, ttlSeconds=60.0))
+    main.responseCache.set("/alerts?limit=1", b"x")
+    headers = {"X-Admin-Token": sentToken} if sentToken is not None else {}
+
+    response = TestClient(main.app).post("/cache/invalidate", headers=headers)
+
+    assert response.status_code == expectedStatus
+    assert len(main.responseCache) == (0 if expectedStatus == 200 else 1)
+
+
+def test_refresh_updates_safe_spots_when_alerts_change(monkeypatch) -> None:
+    refreshed = []
+
+    class FakeIndex:
+        def __init__(self, name: str, changed: bool) -> None:
+            self.name = name
+            self.changed = changed
+
+        def refresh(self) -> bool:
+            refreshed.append(self.name)
+            return self.changed
+
+    monkeypatch.setattr(main, "alertIndex", FakeIndex("alerts", True))
+    monkeypatch.setattr(main, "safeSpotIndex", FakeIndex("safeSpots", True))
+    monkeypatch.setattr(main, "_resetHeatmapPyramid", lambda: None)
+    monkeypatch.setattr(main, "_setRoadNetworkAlerts", lambda: None)
+
+    main._refreshSpatialIndexes(force=True)
+
+    assert refreshed == ["alerts", "safeSpots"]
+
+
+def test_request_path_refresh_reloads_off_the_event_loop(monkeypatch) -> None:
+    threads = []
+
+    class FakeIndex:
+        def refresh(self) -> bool:
+            threads.append(threading.get_ident())
+            return True
+
+    invalidated = []
+    monkeypatch.setattr(main, "alertIndex", FakeIndex())
+    monkeypatch.setattr(main, "safeSpotIndex", FakeIndex())
+    monkeypatch.setattr(main, "_setRoadNetworkAlerts", lambda: None)
+    monkeypatch.setattr(main, "_resetHeatmapPyramid", lambda: invalidated.append("/heatmap"))
+    monkeypatch.setattr(main, "_lastSpatialRefresh", 0.0)
+
+    async def refreshTwice() -> int:
+        await main._refreshSpatialIndexesAsync()
+        await main._refreshSpatialIndexesAsync()
+        return threading.get_ident()
+
+    loopThread = asyncio.run(refreshTwice())
+
+    assert len(threads) == 2 and loopThread not in threads
+    assert invalidated == ["/heatmap"]
+
+
+def test_batch_requests_over_the_cap_are_rejected() -> None:
+    point = {"lat": 12.97, "lng": 77.59, "timestamp": "2025-01-01T23:00:00"}
+    response = TestClient(main.app).post("/unsafe-score/batch", json={"points": [point] * (MAX_BATCH_SIZE + 1)})
+
+    assert response.status_code == 422
+
+
+def test_sos_risk_batches_over_the_cap_are_rejected() -> None:
+    report = {"description": "followed", "lat": 12.97, "lng": 77.59, "timestamp": "2025-01-01T23:00:00"}
+    response = TestClient(main.app).post("/sos-risk/batch", json={"reports": [report] * (MAX_BATCH_SIZE + 1)})
+
+    assert response.status_code == 422
+
+
+def test_route_departure_time_accepts_utc_suffix(monkeypatch) -> None:
+    hours = []
+
+    class FakeNetwork:
+        def alternatives(self, fromLat, fromLng, toLat, toLng, k, hour, riskWeight):
+            hours.append(hour)
+            return []
+
+    monkeypatch.setattr(main, "getRoadNetwork", lambda load=False: FakeNetwork())
+    monkeypatch.setattr(main, "responseCache", ResponseCache(maxEntries=16, ttlSeconds=60.0))
+    client = TestClient(main.app)
+    query = "/routes/alternatives?fromLat=12.97&fromLng=77.59&toLat=12.97&toLng=77.61&departureTime="
+
+    assert client.get(query + "2025-01-01T23:15:00Z").status_code == 200
+    assert client.get(query + "not-a-time").status_code == 400
+    assert hours == [23]
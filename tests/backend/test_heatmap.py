@@ -0,0 +1,94 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+projectRoot = Path(__file__).resolve().parents[2]
+backendRoot = projectRoot / "backend"
+if str(backendRoot) not in sys.path:
+    sys.path.insert(0, str(backendRoot))
+
+import main
+from cache import ResponseCache
+
+
+class FakeIndex:
+    def __init__(self, docs) -> None:
+        self._docs = {str(index): doc for index, doc in enumerate(docs)}
+
+    def ids(self):
+        return list(self._docs)
+
+    def payload(self, pointId):
+        return self._docs[pointId]
+
+
+class FakeAlertIndex:
+    def __init__(self, docs) -> None:
+        self.index = FakeIndex(docs)
+
+    def refresh(self) -> bool:
+        return False
+
+
+ALERTS = [
+    {"location": {"lat": 12.97, "lng": 77.59}, "timestamp": "2025-01-01T23:00:00", "severity": "high"},
+    {"location": {"lat": 12.98, "lng": 77.60}, "timestamp": "2025-01-02T08:00:00"},
+    {"location": {"lat": 12.99, "lng": 77.61}},
+    {"location": {"lat": 12.99, "lng": 77.61}, "timestamp": "now"},
+    {"timestamp": "2025-01-01T23:00:00"},
+]
+
+
+def _install(monkeypatch, docs, scorer) -> None:
+    monkeypatch.setattr(main, "alertIndex", FakeAlertIndex(docs))
+    monkeypatch.setattr(main, "responseCache", ResponseCache(maxEntries=16, ttlSeconds=60.0))
+    monkeypatch.setattr(main, "getUnsafeZoneScoresBatch", scorer)
+    monkeypatch.setattr(main, "_heatmapPyramid", None)
+
+
+def test_pyramid_skips_alerts_that_cannot_be_scored(monkeypatch) -> None:
+    scored = []
+
+    def scorer(points):
+        scored.extend(points)
+        return [{"unsafeScore": 0.5} for _ in points]
+
+    _install(monkeypatch, ALERTS, scorer)
+    pyramid = main._buildHeatmapPyramid()
+
+    assert [point[2] for point in scored] == ["2025-01-01T23:00:00", "2025-01-02T08:00:00"]
+    assert [point[3] for point in scored] == ["high", None]
+    assert pyramid.tile(0, 0, 0)["count"] == 2
+
+
+def test_heatmap_tile_is_503_without_models(monkeypatch) -> None:
+    def scorer(points):
+        raise FileNotFoundError("Unsafe zone model file not found")
+
+    _install(monkeypatch, ALERTS, scorer)
+    response = TestClient(main.app).get("/heatmap/0/0/0")
+
+    assert response.status_code == 503
+
+
+def test_concurrent_builds_share_one_pass(monkeypatch) -> None:
+    calls = []
+
+    def scorer(points):
+        calls.append(len(points))
+        time.sleep(0.05)
+        return [{"unsafeScore": 1.0} for _ in points]
+
+    _install(monkeypatch, ALERTS, scorer)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(main._buildHeatmapPyramid())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [2]
+    assert all(result is results[0] for result in results)
@@ -0,0 +1,142 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+projectRoot = Path(__file__).resolve().parents[2]
+modelAiRoot = projectRoot / "model-ai"
+if str(modelAiRoot) not in sys.path:
+    sys.path.insert(0, str(modelAiRoot))
+
+from model_ai import inference
+
+
+def _trainUnsafeModel() -> DecisionTreeClassifier:
+    rng = np.random.default_rng(7)
+    X = np.column_stack(
+        [
+            rng.uniform(26.8, 27.0, 400),
+            rng.uniform(75.7, 75.9, 400),
+            rng.integers(0, 24, 400),
+            rng.integers(0, 7, 400),
+            rng.integers(0, 3, 400),
+        ]
+    ).astype(float)
+    y = ((X[:, 2] >= 20) | (X[:, 4] == 2)).astype(int)
+    return DecisionTreeClassifier(max_depth=5, random_state=42).fit(X, y)
+
+
+def _trainSosModel() -> LogisticRegression:
+    rng = np.random.default_rng(11)
+    hours = rng.integers(0, 24, 300)
+    X = np.column_stack(
+        [
+            hours,
+            rng.integers(5, 120, 300),
+            ((hours >= 20) | (hours <= 5)).astype(int),
+            rng.integers(0, 3, 300),
+        ]
+    ).astype(float)
+    y = (X[:, 2] + (X[:, 3] == 2) >= 1).astype(int)
+    return LogisticRegression(max_iter=1000).fit(X, y)
+
+
+def test_unsafe_batch_matches_single_scores(monkeypatch) -> None:
+    monkeypatch.setattr(inference, "_unsafeModel", _trainUnsafeModel())
+    monkeypatch.setattr(inference, "_sosModel", object())
+    points = [
+        (26.9124, 75.7873, "2025-01-01T23:21:00Z", "high"),
+        (26.8500, 75.8000, "2025-01-04T08:05:00+05:30", "low"),
+        (26.9900, 75.7100, "2025-01-05", None),
+    ]
+
+    batch = inference.getUnsafeZoneScoresBatch(points)
+
+    assert len(batch) == len(points)
+    for point, result in zip(points, batch):
+        single = inference.getUnsafeZoneScore(point[0], point[1], point[2], point[3] or "medium")
+        assert result == single
+
+
+def test_unsafe_batch_reports_invalid_timestamp_index(monkeypatch) -> None:
+    monkeypatch.setattr(inference, "_unsafeModel", _trainUnsafeModel())
+    monkeypatch.setattr(inference, "_sosModel", object())
+    points = [
+        (26.9124, 75.7873, "2025-01-01T23:21:00Z", "high"),
+        (26.9124, 75.7873, "not-a-time", "high"),
+    ]
+    try:
+        inference.getUnsafeZoneScoresBatch(points)
+    except ValueError as exc:
+        assert "index 1" in str(exc)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_batch_timestamp_parsing_matches_single_path(monkeypatch) -> None:
+    monkeypatch.setattr(inference, "_unsafeModel", _trainUnsafeModel())
+    monkeypatch.setattr(inference, "_sosModel", _trainSosModel())
+    timestamps = ["now", "today", "2025", "20250101T232100", "2025-01-04T08:05:00+05:30", "", None]
+
+    for timestamp in timestamps:
+        try:
+            single = inference.getUnsafeZoneScore(26.9124, 75.7873, timestamp, "high")
+        except ValueError:
+            single = None
+        try:
+            batch = inference.getUnsafeZoneScoresBatch([(26.9124, 75.7873, timestamp, "high")])[0]
+        except ValueError:
+            batch = None
+        assert batch == single, timestamp
+
+        sosBatch = inference.getSosRiskScoresBatch([("help", 26.9124, 75.7873, timestamp, "high")])[0]
+        if single is None:
+            assert "error" in sosBatch, timestamp
+        else:
+            assert sosBatch == inference.getSosRiskScore("help", 26.9124, 75.7873, timestamp, "high")
+
+    assert inference.getUnsafeZoneScoresBatch([(26.9124, 75.7873, "20250101T232100", "high")])
+
+
+def test_sos_batch_matches_single_and_isolates_errors(monkeypatch) -> None:
+    monkeypatch.setattr(inference, "_unsafeModel", object())
+    monkeypatch.setattr(inference, "_sosModel", _trainSosModel())
+    reports = [
+        ("help, harassment at main road", 26.9124, 75.7873, "2025-01-01T23:21:00Z", "high"),
+        ("bag snatched", 26.9150, 75.7890, "bad-timestamp", "medium"),
+        ("", 26.9000, 75.8000, "2025-01-02T14:00:00", None),
+    ]
+
+    batch = inference.getSosRiskScoresBatch(reports)
+
+    assert len(batch) == len(reports)
+    assert batch[1]["index"] == 1
+    assert "error" in batch[1]
+    for index in (0, 2):
+        description, lat, lng, timestamp, severity = reports[index]
+        single = inference.getSosRiskScore(description, lat, lng, timestamp, severity or "high")
+        assert batch[index] == single
+
+
+def test_unsafe_score_memo_hits_and_resets_on_new_model(monkeypatch) -> None:
+    monkeypatch.setattr(inference, "_unsafeModel", _trainUnsafeModel())
+    monkeypatch.setattr(inference, "_sosModel", object())
+    first = inference.getUnsafeZoneScore(26.91240, 75.78730, "2025-01-01T23:21:00Z", "high")
+    before = inference.getUnsafeScoreCacheStats()
+    second = inference.getUnsafeZoneScore(26.91241, 75.78731, "2025-01-01T23:59:00Z", "high")
+    after = inference.getUnsafeScoreCacheStats()
+
+    assert second["unsafeScore"] == first["unsafeScore"]
+    assert after["hits"] == before["hits"] + 1
+
+    monkeypatch.setattr(inference, "_unsafeModel", _trainUnsafeModel())
+    inference.getUnsafeZoneScore(26.91240, 75.78730, "2025-01-01T23:21:00Z", "high")
+    assert inference.getUnsafeScoreCacheStats()["size"] == 1
+
+
+def test_warm_up_runs_every_serving_path(monkeypatch) -> None:
+    monkeypatch.setattr(inference, "_unsafeModel", _trainUnsafeModel())
+    monkeypatch.setattr(inference, "_sosModel", _trainSosModel())
+    inference.warmUp()
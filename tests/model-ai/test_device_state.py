@@ -0,0 +1,116 @@
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+projectRoot = Path(__file__).resolve().parents[2]
+modelAiRoot = projectRoot / "model-ai"
+if str(modelAiRoot) not in sys.path:
+    sys.path.insert(0, str(modelAiRoot))
+
+from model_ai.device_state import DeviceStateStore
+from model_ai.geo import greatCircleKm
+
+
+def test_ring_buffer_keeps_latest_window() -> None:
+    store = DeviceStateStore(windowSize=4, initialCapacity=1)
+    for second, speed in enumerate([10.0, 20.0, 30.0, 40.0, 50.0, 60.0]):
+        store.addSample("phone", float(second), speed)
+
+    np.testing.assert_array_equal(store.recentSpeeds("phone"), [30.0, 40.0, 50.0, 60.0])
+    features = store.features("phone")
+    assert features["meanSpeedKmh"] == pytest.approx(45.0)
+    assert features["sampleCount"] == 4.0
+    assert store.features("unknown") is None
+
+
+def test_sudden_stop_dwell_and_safe_distance() -> None:
+    store = DeviceStateStore(stopSpeedKmh=3.0, suddenStopDecelKmhPerS=8.0)
+    store.addSample("phone", 0.0, 40.0, lat=12.97, lng=77.59, unsafeProbability=0.1)
+    store.addSample("phone", 2.0, 1.0, lat=12.98, lng=77.59, unsafeProbability=0.9)
+
+    features = store.features("phone")
+    assert features["decelerationKmhPerS"] == pytest.approx(19.5)
+    assert features["suddenStop"] == 1.0
+    assert features["distanceFromSafeKm"] == pytest.approx(greatCircleKm(12.98, 77.59, 12.97, 77.59))
+
+    store.addSample("phone", 32.0, 0.5)
+    features = store.features("phone")
+    assert features["dwellSeconds"] == pytest.approx(30.0)
+    assert features["suddenStop"] == 0.0
+    # A sample without a position keeps the last known one.
+    assert features["distanceFromSafeKm"] == pytest.approx(greatCircleKm(12.98, 77.59, 12.97, 77.59))
+
+    store.addSample("phone", 40.0, 25.0)
+    assert store.features("phone")["dwellSeconds"] == 0.0
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_idle_devices_are_evicted_and_slots_reused() -> None:
+    clock = FakeClock()
+    store = DeviceStateStore(ttlSeconds=60.0, initialCapacity=2, clock=clock)
+    for index in range(5):
+        store.addSample(f"device-{index}", 0.0, 10.0)
+    assert len(store) == 5
+
+    clock.now = 50.0
+    store.addSample("device-0", 50.0, 12.0)
+    clock.now = 100.0
+    assert store.evictIdle() == 4
+    assert list(store._slotById) == ["device-0"]
+
+    store.addSample("late", 100.0, 5.0)
+    assert len(store) == 2
+    assert store.features("late")["sampleCount"] == 1.0
+    assert store.features("late")["meanSpeedKmh"] == 5.0
+
+
+def test_eviction_ignores_device_clocks() -> None:
+    clock = FakeClock()
+    store = DeviceStateStore(ttlSeconds=60.0, clock=clock)
+    store.addSample("seconds", 1_700_000_000.0, 10.0)
+    store.addSample("millis", 1_700_000_000_000.0, 10.0)
+    store.addSample("skewed", 5.0, 10.0)
+
+    clock.now = 30.0
+    store.addSample("seconds", 1_700_000_030.0, 10.0)
+    assert len(store) == 3
+    clock.now = 61.0
+    assert store.evictIdle() == 2
+    assert "seconds" in store
+
+
+def test_missing_timestamps_advance_by_server_time() -> None:
+    clock = FakeClock()
+    store = DeviceStateStore(stopSpeedKmh=3.0, clock=clock)
+    store.addSample("phone", None, 1.0)
+    clock.now = 20.0
+    store.addSample("phone", None, 0.5)
+
+    assert store.features("phone")["dwellSeconds"] == pytest.approx(20.0)
+
+
+def test_concurrent_samples_are_all_recorded() -> None:
+    store = DeviceStateStore(windowSize=4, initialCapacity=1)
+
+    def report(worker: int) -> None:
+        for index in range(200):
+            store.addSample(f"device-{worker}-{index % 50}", float(index), 10.0)
+
+    threads = [threading.Thread(target=report, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(store) == 200
+    assert all(store.features(f"device-{worker}-0")["sampleCount"] == 4.0 for worker in range(4))
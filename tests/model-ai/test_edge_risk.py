@@ -0,0 +1,105 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+projectRoot = Path(__file__).resolve().parents[2]
+modelAiRoot = projectRoot / "model-ai"
+if str(modelAiRoot) not in sys.path:
+    sys.path.insert(0, str(modelAiRoot))
+
+from model_ai.edge_risk import EdgeRiskLayer, alertCountsNear
+from model_ai.geo import haversineDistanceKm
+from model_ai.road_graph import graphFromPolylines
+from model_ai.routing import RISK_WEIGHT_LEVELS, RoadNetwork, snapRiskWeight
+
+
+SHORT_ROUTE = [{"lat": 12.970, "lng": 77.590}, {"lat": 12.970, "lng": 77.600}, {"lat": 12.970, "lng": 77.610}]
+LONG_ROUTE = [{"lat": 12.970, "lng": 77.590}, {"lat": 12.985, "lng": 77.600}, {"lat": 12.970, "lng": 77.610}]
+
+
+class CountingScorer:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, features: np.ndarray) -> np.ndarray:
+        self.calls += 1
+        # Riskier at night, flat in space.
+        return np.where(features[:, 2] >= 22, 0.8, 0.1)
+
+
+def test_alert_counts_cover_radius() -> None:
+    rng = np.random.default_rng(2)
+    alertLats = rng.uniform(12.90, 13.00, 400)
+    alertLngs = rng.uniform(77.50, 77.60, 400)
+    lats = rng.uniform(12.90, 13.00, 50)
+    lngs = rng.uniform(77.50, 77.60, 50)
+    counts = alertCountsNear(lats, lngs, alertLats, alertLngs, radiusKm=0.5)
+    for position in range(lats.size):
+        distances = haversineDistanceKm(lats[position], lngs[position], alertLats, alertLngs)
+        assert (distances <= 0.5).sum() <= counts[position] <= (distances <= 1.5).sum()
+    assert alertCountsNear(lats, lngs, np.zeros(0), np.zeros(0), 0.5).sum() == 0
+
+
+def test_risk_rates_cached_per_hour_and_never_below_length() -> None:
+    graph, _ = graphFromPolylines([SHORT_ROUTE, LONG_ROUTE])
+    scorer = CountingScorer()
+    layer = EdgeRiskLayer(graph, scorer=scorer)
+    night = layer.riskRates(23)
+    callsAfterNight = scorer.calls
+    np.testing.assert_array_equal(layer.riskRates(23), night)
+    assert scorer.calls == callsAfterNight
+    assert np.all(layer.riskRates(12) < night)
+    assert np.all(layer.weights(23, 2.0) >= graph.lengthsKm)
+    assert layer.weightedGraph(23, 2.0) is layer.weightedGraph(23, 2.0)
+
+
+def test_hour_buckets_share_one_float32_table() -> None:
+    graph, _ = graphFromPolylines([SHORT_ROUTE, LONG_ROUTE])
+    scorer = CountingScorer()
+    layer = EdgeRiskLayer(graph, scorer=scorer, bucketCount=4)
+    assert layer.riskTable.shape == (graph.edgeCount, 4)
+    assert layer.riskTable.dtype == np.float32
+    assert [list(layer.bucketHours(bucket)) for bucket in range(4)][3] == [18, 19, 20, 21, 22, 23]
+
+    layer.riskRates(19)
+    calls = scorer.calls
+    np.testing.assert_array_equal(layer.riskRates(23), layer.riskTable[:, 3])
+    assert scorer.calls == calls
+    # 18:00-23:59 averages two night hours (0.8) with four day hours (0.1).
+    assert layer.riskRates(23) == pytest.approx(np.full(graph.edgeCount, 0.7 * (2 * 0.8 + 4 * 0.1) / 6))
+    assert layer.weightedGraph(18, 1.0) is layer.weightedGraph(21, 1.0)
+    with pytest.raises(ValueError):
+        EdgeRiskLayer(graph, scorer=scorer, bucketCount=25)
+
+
+def test_risk_weighted_route_avoids_alert_cluster() -> None:
+    graph, _ = graphFromPolylines([SHORT_ROUTE, LONG_ROUTE])
+    network = RoadNetwork(graph, scorer=lambda features: np.zeros(features.shape[0]))
+    network.setAlertLocations(np.full(20, 12.970), np.linspace(77.592, 77.608, 20))
+
+    plain = network.route(12.970, 77.590, 12.970, 77.610)
+    safe = network.route(12.970, 77.590, 12.970, 77.610, hour=23, riskWeight=5.0)
+    assert (12.970, 77.600) in plain["path"]
+    assert (12.985, 77.600) in safe["path"]
+    assert safe["lengthKm"] > plain["lengthKm"]
+    assert safe["distance"] >= safe["lengthKm"]
+    assert plain["distance"] == pytest.approx(plain["lengthKm"])
+
+
+def test_client_risk_weights_map_to_a_fixed_set_of_graphs() -> None:
+    assert snapRiskWeight(0.0) == 0.0
+    assert snapRiskWeight(2.2) == 2.0
+    assert snapRiskWeight(1e9) == max(RISK_WEIGHT_LEVELS)
+
+    graph, _ = graphFromPolylines([SHORT_ROUTE, LONG_ROUTE])
+    network = RoadNetwork(graph, scorer=CountingScorer())
+    for riskWeight in np.linspace(0.1, 50.0, 200):
+        network.route(12.97, 77.59, 12.97, 77.61, hour=23, riskWeight=float(riskWeight))
+
+    cached = network.riskLayer._weightedGraphs
+    assert len(cached) <= len(RISK_WEIGHT_LEVELS)
+    weighted = network.riskLayer.weightedGraph(23, 2.0)
+    # Reweighted graphs share the base graph's offsets/targets lists.
+    assert weighted.adjacencyLists()[1] is graph.adjacencyLists()[1]
@@ -0,0 +1,86 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+projectRoot = Path(__file__).resolve().parents[2]
+modelAiRoot = projectRoot / "model-ai"
+if str(modelAiRoot) not in sys.path:
+    sys.path.insert(0, str(modelAiRoot))
+
+from model_ai.heatmap import HeatmapAccumulator, binPoints, computeHeatmap
+
+
+def _expectedCells(accumulator: HeatmapAccumulator, points: dict) -> tuple:
+    lats, lngs, scores = (np.array(column, dtype=float).reshape(-1) for column in zip(*points.values()))
+    return binPoints(lats, lngs, scores, accumulator.gridSize, accumulator.bounds)
+
+
+def test_add_remove_and_rebinning_match_full_rebuild() -> None:
+    rng = np.random.default_rng(5)
+    accumulator = HeatmapAccumulator(gridSize=16, bounds=(26.9, 26.91, 75.8, 75.81), grow=True)
+    points = {}
+    for position in range(400):
+        spread = 0.005 if position < 200 else 0.3
+        lat = 26.905 + rng.uniform(-spread, spread)
+        lng = 75.805 + rng.uniform(-spread, spread)
+        score = float(rng.uniform())
+        accumulator.add(f"p{position}", lat, lng, score)
+        points[f"p{position}"] = (lat, lng, score)
+    for position in range(0, 400, 3):
+        assert accumulator.remove(f"p{position}")
+        del points[f"p{position}"]
+
+    assert accumulator.rebins > 0
+    assert len(accumulator) == len(points)
+    sums, counts = _expectedCells(accumulator, points)
+    snapshot = accumulator.snapshot()
+    np.testing.assert_array_equal(snapshot["counts"], counts)
+    np.testing.assert_allclose(snapshot["sums"], sums, atol=1e-9)
+    assert not accumulator.remove("p0")
+
+
+def test_snapshot_is_isolated_and_re_add_moves_point() -> None:
+    accumulator = HeatmapAccumulator(gridSize=4, bounds=(0.0, 4.0, 0.0, 4.0))
+    accumulator.add("a", 0.5, 0.5, 1.0)
+    snapshot = accumulator.snapshot()
+    accumulator.add("a", 4.0, 4.0, 0.5)
+    assert snapshot["counts"][0, 0] == 1
+    assert accumulator.counts[0, 0] == 0
+    assert accumulator.snapshot()["grid"][3, 3] == pytest.approx(0.5)
+    with pytest.raises(ValueError):
+        HeatmapAccumulator(gridSize=5)
+
+
+def test_non_finite_and_unreachable_points_are_rejected() -> None:
+    accumulator = HeatmapAccumulator(gridSize=4, bounds=(0.0, 1.0, 0.0, 1.0), grow=True)
+    accumulator.add("a", 0.5, 0.5, 1.0)
+    for lat, lng, score in ((float("nan"), 0.5, 1.0), (0.5, float("inf"), 1.0), (0.5, 0.5, float("nan"))):
+        with pytest.raises(ValueError):
+            accumulator.add("a", lat, lng, score)
+    with pytest.raises(ValueError):
+        accumulator.add("a", 1e300, 0.5, 1.0)
+
+    assert accumulator.bounds == (0.0, 1.0, 0.0, 1.0)
+    assert accumulator.rebins == 0
+    assert "a" in accumulator and accumulator.counts.sum() == 1
+
+
+@pytest.mark.parametrize("bounds", [None, (26.9, 26.95, 75.8, 75.85)])
+def test_snapshot_matches_batch_binning(bounds) -> None:
+    rng = np.random.default_rng(9)
+    lats = 26.92 + rng.uniform(-0.2, 0.2, 300)
+    lngs = 75.82 + rng.uniform(-0.2, 0.2, 300)
+    scores = rng.uniform(size=300)
+    accumulator = HeatmapAccumulator(gridSize=8, bounds=bounds)
+    for index in range(300):
+        accumulator.add(f"p{index}", lats[index], lngs[index], scores[index])
+
+    snapshot = accumulator.snapshot()
+    sums, counts = binPoints(lats, lngs, scores, 8, snapshot["bounds"])
+    np.testing.assert_array_equal(snapshot["counts"], counts)
+    np.testing.assert_allclose(snapshot["sums"], sums, atol=1e-9)
+    if bounds is not None:
+        assert accumulator.rebins == 0
+        np.testing.assert_allclose(snapshot["grid"], computeHeatmap(lats, lngs, scores, 8, bounds)["grid"])
@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+projectRoot = Path(__file__).resolve().parents[2]
+modelAiRoot = projectRoot / "model-ai"
+if str(modelAiRoot) not in sys.path:
+    sys.path.insert(0, str(modelAiRoot))
+
+from model_ai import routing
+from model_ai.landmarks import altSearch, buildLandmarkTable, loadLandmarkTable, saveLandmarkTable
+from model_ai.road_graph import RoadGraph, saveRoadGraph
+from model_ai.routing import RoadNetwork, loadRoadNetwork
+from model_ai.shortest_path import dijkstra
+
+
+def _oneWayGrid(side: int = 12, seed: int = 3) -> RoadGraph:
+    generator = np.random.default_rng(seed)
+    rows, cols = np.divmod(np.arange(side * side), side)
+    lats = 12.90 + rows * 0.001
+    lngs = 77.50 + cols * 0.001
+    nodes = np.arange(side * side).reshape(side, side)
+    sources = np.concatenate([nodes[:, :-1].ravel(), nodes[:-1, :].ravel()])
+    targets = np.concatenate([nodes[:, 1:].ravel(), nodes[1:, :].ravel()])
+    # Every other street is one-way so forward and reverse distances differ.
+    twoWay = generator.random(sources.size) < 0.5
+    sources, targets = (
+        np.concatenate([sources, targets[twoWay]]),
+        np.concatenate([targets, sources[twoWay]]),
+    )
+    graph = RoadGraph.fromEdges(lats, lngs, sources, targets)
+    return graph.withWeights(graph.lengthsKm * generator.uniform(1.0, 2.0, graph.edgeCount))
+
+
+def test_alt_matches_dijkstra() -> None:
+    graph = _oneWayGrid()
+    table = buildLandmarkTable(graph, count=4)
+    assert table.matches(graph)
+    generator = np.random.default_rng(0)
+    for source, target in generator.integers(0, graph.nodeCount, (40, 2)):
+        expected, _ = dijkstra(graph, int(source), int(target))
+        distance, nodes = altSearch(graph, table, int(source), int(target))
+        assert distance == pytest.approx(expected)
+        if nodes:
+            assert nodes[0] == source and nodes[-1] == target
+
+
+def test_table_round_trips_memory_mapped(tmp_path: Path) -> None:
+    graph = _oneWayGrid()
+    table = buildLandmarkTable(graph, count=3)
+    saveLandmarkTable(table, tmp_path / "landmarks")
+    loaded = loadLandmarkTable(tmp_path / "landmarks")
+    assert isinstance(loaded.fromLandmark, np.memmap)
+    np.testing.assert_array_equal(loaded.toLandmark, table.toLandmark)
+    assert loaded.matches(graph)
+    assert not loaded.matches(graph.withWeights(graph.weights * 2.0))
+    assert loadLandmarkTable(tmp_path / "missing") is None
+
+
+def test_network_uses_landmarks_only_for_matching_weights(tmp_path: Path, monkeypatch) -> None:
+    graph = _oneWayGrid()
+    graphPath = saveRoadGraph(graph, tmp_path / "road_graph.npz")
+    saveLandmarkTable(buildLandmarkTable(graph, count=3), tmp_path / "road_graph.landmarks")
+    network = loadRoadNetwork(graphPath)
+    assert network.landmarks is not None
+
+    calls = []
+    monkeypatch.setattr(routing, "altSearch", lambda *args: calls.append(args) or altSearch(*args))
+    start, end = graph.coordinates([0, graph.nodeCount - 1])
+    plain = network.route(*start, *end)
+    assert len(calls) == 1
+    assert plain["distance"] == pytest.approx(dijkstra(graph, 0, graph.nodeCount - 1)[0])
+
+    stale = RoadNetwork(graph.withWeights(graph.lengthsKm), landmarks=network.landmarks)
+    assert stale.route(*start, *end)["path"]
+    assert len(calls) == 1
@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+projectRoot = Path(__file__).resolve().parents[2]
+modelAiRoot = projectRoot / "model-ai"
+if str(modelAiRoot) not in sys.path:
+    sys.path.insert(0, str(modelAiRoot))
+
+from model_ai.road_graph import graphFromPolylines, loadRoadGraph, saveRoadGraph
+from model_ai.routing import RoadNetwork, routeEndpoints
+
+
+STREETS = [
+    [{"lat": 12.9700, "lng": 77.5900}, {"lat": 12.9700, "lng": 77.6000}, {"lat": 12.9700, "lng": 77.6100}],
+    [{"lat": 12.9700, "lng": 77.5900}, {"lat": 12.9800, "lng": 77.6000}, {"lat": 12.9700, "lng": 77.6100}],
+]
+
+
+def test_saved_graph_round_trips(tmp_path: Path) -> None:
+    graph, _ = graphFromPolylines(STREETS)
+    path = saveRoadGraph(graph, tmp_path / "road_graph.npz")
+    loaded = loadRoadGraph(path)
+    for name in ("lats", "lngs", "offsets", "targets", "weights", "lengthsKm"):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(graph, name))
+    assert loadRoadGraph(tmp_path / "missing.npz") is None
+
+
+def test_network_snaps_and_shares_searches() -> None:
+    graph, nodeIds = graphFromPolylines(STREETS)
+    network = RoadNetwork(graph)
+    assert network.snap(12.9701, 77.5901) == nodeIds[(12.9700, 77.5900)]
+    assert network.snap(13.5, 77.5) is None
+
+    result = network.route(12.9701, 77.5899, 12.9699, 77.6101)
+    assert result["path"] == [(12.97, 77.59), (12.97, 77.60), (12.97, 77.61)]
+    assert network.route(13.5, 77.5, 12.97, 77.61)["path"] == []
+
+    summaries = routeEndpoints(network, STREETS + [[STREETS[0][0]]])
+    assert summaries[0] is summaries[1]
+    assert summaries[0]["distance"] == pytest.approx(result["distance"])
+    assert summaries[2]["path"] == []
+
+
+def test_network_alternatives_are_cheapest_first() -> None:
+    graph, _ = graphFromPolylines(STREETS)
+    network = RoadNetwork(graph)
+    routes = network.alternatives(12.97, 77.59, 12.97, 77.61, k=3, maxStretch=3.0)
+    assert [route["path"][1] for route in routes] == [(12.97, 77.60), (12.98, 77.60)]
+    assert routes[0]["distance"] < routes[1]["distance"]
+    assert network.alternatives(12.97, 77.59, 12.97, 77.61, k=3, maxStretch=1.1) == routes[:1]
+    assert network.alternatives(13.5, 77.5, 12.97, 77.61) == []
@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.tree import DecisionTreeClassifier
+
+projectRoot = Path(__file__).resolve().parents[2]
+modelAiRoot = projectRoot / "model-ai"
+if str(modelAiRoot) not in sys.path:
+    sys.path.insert(0, str(modelAiRoot))
+
+from model_ai import inference, score_grid
+
+
+BOUNDS = (26.8, 27.0, 75.7, 75.9)
+
+
+def _trainUnsafeModel() -> DecisionTreeClassifier:
+    rng = np.random.default_rng(5)
+    X = np.column_stack(
+        [
+            rng.uniform(26.8, 27.0, 500),
+            rng.uniform(75.7, 75.9, 500),
+            rng.integers(0, 24, 500),
+            rng.integers(0, 7, 500),
+            rng.integers(0, 3, 500),
+        ]
+    ).astype(float)
+    y = ((X[:, 0] > 26.9) & (X[:, 2] >= 20) | (X[:, 4] == 2)).astype(int)
+    return DecisionTreeClassifier(max_depth=5, random_state=42).fit(X, y)
+
+
+def test_grid_lookup_matches_model_at_cell_centres() -> None:
+    model = _trainUnsafeModel()
+    grid = score_grid.buildUnsafeScoreGrid(model, BOUNDS, latSteps=16, lngSteps=16)
+    step = (BOUNDS[1] - BOUNDS[0]) / 16
+    rows = []
+    for row, col, hour, day, severity in [(0, 0, 0, 0, 0), (15, 3, 22, 6, 2), (9, 12, 13, 3, 1)]:
+        lat = BOUNDS[0] + (row + 0.5) * step
+        lng = BOUNDS[2] + (col + 0.5) * step
+        rows.append([lat, lng, hour, day, severity])
+        expected = model.predict_proba(np.array([[lat, lng, hour, day, severity]], dtype=float))[0, 1]
+        assert grid.lookup(lat, lng, hour, day, severity) == expected
+
+    rows.append([28.0, 75.8, 1, 1, 1])
+    scores, inside = grid.lookupBatch(np.array(rows))
+    assert inside.tolist() == [True, True, True, False]
+    assert np.isnan(scores[3])
+
+
+def test_saved_grid_is_memory_mapped_and_served_by_inference(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(score_grid, "getTrainedDir", lambda: tmp_path)
+    model = _trainUnsafeModel()
+    joblib.dump(model, tmp_path / "unsafe_zone_model.pkl")
+    score_grid.saveUnsafeScoreGrid(score_grid.buildUnsafeScoreGrid(model, BOUNDS, latSteps=8, lngSteps=8))
+
+    grid = score_grid.loadUnsafeScoreGrid()
+    assert isinstance(grid.cells, np.memmap)
+
+    monkeypatch.setattr(inference, "_unsafeModel", model)
+    monkeypatch.setattr(inference, "_sosModel", object())
+    monkeypatch.setattr(inference, "_unsafeGrid", grid)
+    monkeypatch.setattr(inference, "_unsafeGridModel", model)
+    inside = inference.getUnsafeZoneScore(26.95, 75.85, "2025-01-01T23:00:00", "high")
+    assert inside["unsafeScore"] == grid.lookup(26.95, 75.85, 23, 2, 2)
+
+    outside = inference.getUnsafeZoneScoresBatch([(30.0, 75.85, "2025-01-01T23:00:00", "high")])
+    expected = model.predict_proba(np.array([[30.0, 75.85, 23, 2, 2]], dtype=float))[0, 1]
+    assert outside[0]["unsafeScore"] == expected
+
+
+def test_stale_grid_is_ignored(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(score_grid, "getTrainedDir", lambda: tmp_path)
+    model = _trainUnsafeModel()
+    modelPath = tmp_path / "unsafe_zone_model.pkl"
+    joblib.dump(model, modelPath)
+    score_grid.saveUnsafeScoreGrid(score_grid.buildUnsafeScoreGrid(model, BOUNDS, latSteps=4, lngSteps=4))
+    modelPath.write_bytes(modelPath.read_bytes() + b"\0")
+    assert score_grid.loadUnsafeScoreGrid() is None
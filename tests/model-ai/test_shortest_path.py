@@ -0,0 +1,96 @@
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+projectRoot = Path(__file__).resolve().parents[2]
+modelAiRoot = projectRoot / "model-ai"
+if str(modelAiRoot) not in sys.path:
+    sys.path.insert(0, str(modelAiRoot))
+
+from model_ai.geo import haversineDistanceKm
+from model_ai.road_graph import RoadGraph, graphFromPolylines
+from model_ai.shortest_path import aStar, bidirectionalDijkstra, dijkstra, kShortestPaths, shortestPathTree
+
+
+def _randomGraph(nodeCount: int = 300, edgeCount: int = 1200, seed: int = 7) -> RoadGraph:
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(12.90, 13.00, nodeCount)
+    lngs = rng.uniform(77.50, 77.60, nodeCount)
+    sources = rng.integers(0, nodeCount, edgeCount)
+    targets = rng.integers(0, nodeCount, edgeCount)
+    graph = RoadGraph.fromEdges(lats, lngs, sources, targets)
+    # Detours cost extra but never less than the straight-line length.
+    return graph.withWeights(graph.lengthsKm * rng.uniform(1.0, 2.0, graph.edgeCount))
+
+
+def _pathCost(graph: RoadGraph, path: list) -> float:
+    total = 0.0
+    for node, nextNode in zip(path, path[1:]):
+        edges = range(graph.offsets[node], graph.offsets[node + 1])
+        total += min(graph.weights[edge] for edge in edges if graph.targets[edge] == nextNode)
+    return total
+
+
+@pytest.mark.parametrize("search", [dijkstra, aStar, bidirectionalDijkstra])
+def test_searches_match_full_shortest_path_tree(search) -> None:
+    graph = _randomGraph()
+    for source in (0, 17, 123):
+        distances, _ = shortestPathTree(graph, source)
+        for target in (1, 42, 250, 299):
+            distance, path = search(graph, source, target)
+            if target not in distances:
+                assert distance == math.inf and path == []
+                continue
+            assert distance == pytest.approx(distances[target])
+            assert path[0] == source and path[-1] == target
+            assert _pathCost(graph, path) == pytest.approx(distance)
+
+
+def test_graph_from_polylines_merges_shared_points() -> None:
+    routes = [
+        [{"lat": 0.0, "lng": 0.0}, {"lat": 0.0, "lng": 0.01}, {"lat": 0.0, "lng": 0.02}],
+        [{"lat": 0.0, "lng": 0.0}, {"lat": 0.01, "lng": 0.01}, {"lat": 0.0, "lng": 0.02}],
+    ]
+    graph, nodeIds = graphFromPolylines(routes)
+    assert graph.nodeCount == 4
+    assert graph.edgeCount == 8
+    distance, path = aStar(graph, nodeIds[(0.0, 0.0)], nodeIds[(0.0, 0.02)])
+    assert graph.coordinates(path) == [(0.0, 0.0), (0.0, 0.01), (0.0, 0.02)]
+    assert distance == pytest.approx(2 * float(haversineDistanceKm(0.0, 0.0, 0.0, 0.01)))
+
+
+def _allSimplePathCosts(graph: RoadGraph, source: int, target: int) -> list:
+    """Cheapest cost of every loopless node sequence from source to target."""
+    costs: dict = {}
+
+    def walk(path: list, cost: float) -> None:
+        node = path[-1]
+        if node == target:
+            key = tuple(path)
+            costs[key] = min(cost, costs.get(key, math.inf))
+            return
+        for edge in range(graph.offsets[node], graph.offsets[node + 1]):
+            neighbor = int(graph.targets[edge])
+            if neighbor not in path:
+                walk(path + [neighbor], cost + float(graph.weights[edge]))
+
+    walk([source], 0.0)
+    return sorted(costs.values())
+
+
+def test_k_shortest_paths_match_enumeration() -> None:
+    graph = _randomGraph(nodeCount=8, edgeCount=24, seed=6)
+    expected = _allSimplePathCosts(graph, 0, 7)
+    assert len(expected) > 6
+    paths = kShortestPaths(graph, 0, 7, k=6, maxStretch=100.0)
+    assert [cost for cost, _ in paths] == pytest.approx(expected[:6])
+    assert len({tuple(path) for _, path in paths}) == len(paths)
+    for cost, path in paths:
+        assert len(set(path)) == len(path)
+        assert _pathCost(graph, path) == pytest.approx(cost)
+
+    limited = kShortestPaths(graph, 0, 7, k=6, maxStretch=1.2)
+    assert all(cost <= expected[0] * 1.2 + 1e-9 for cost, _ in limited)
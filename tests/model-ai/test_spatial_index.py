@@ -0,0 +1,73 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+projectRoot = Path(__file__).resolve().parents[2]
+modelAiRoot = projectRoot / "model-ai"
+if str(modelAiRoot) not in sys.path:
+    sys.path.insert(0, str(modelAiRoot))
+
+from model_ai.geo import haversineDistanceKm
+from model_ai.spatial_index import JsonSpatialIndex, SpatialIndex
+
+
+def _randomIndex(count: int = 500) -> tuple:
+    rng = np.random.default_rng(3)
+    lats = rng.uniform(26.80, 27.00, count)
+    lngs = rng.uniform(75.70, 75.90, count)
+    index = SpatialIndex(cellSizeDeg=0.01, initialCapacity=8)
+    for position in range(count):
+        index.upsert(f"p{position}", lats[position], lngs[position], {"position": position})
+    return index, lats, lngs
+
+
+def test_nearest_matches_brute_force() -> None:
+    index, lats, lngs = _randomIndex()
+    for queryLat, queryLng in [(26.9, 75.8), (26.81, 75.71), (27.2, 75.5)]:
+        distances = haversineDistanceKm(queryLat, queryLng, lats, lngs)
+        expected = [f"p{position}" for position in np.argsort(distances)[:7]]
+        result = index.nearest(queryLat, queryLng, k=7)
+        assert [item[0] for item in result] == expected
+
+
+def test_within_radius_matches_brute_force() -> None:
+    index, lats, lngs = _randomIndex()
+    distances = haversineDistanceKm(26.9, 75.8, lats, lngs)
+    expected = {f"p{position}" for position in np.flatnonzero(distances <= 2.5)}
+    result = index.withinRadius(26.9, 75.8, 2.5)
+    assert {item[0] for item in result} == expected
+    assert [item[1] for item in result] == sorted(item[1] for item in result)
+
+
+def test_upsert_moves_and_remove_frees_points() -> None:
+    index = SpatialIndex(cellSizeDeg=0.01)
+    index.upsert("a", 26.90, 75.80)
+    index.upsert("b", 26.95, 75.85)
+    index.upsert("a", 26.951, 75.851)
+    assert [item[0] for item in index.nearest(26.95, 75.85, k=2)] == ["b", "a"]
+    assert index.remove("b")
+    assert not index.remove("b")
+    assert [item[0] for item in index.nearest(26.90, 75.80, k=5)] == ["a"]
+
+
+def test_json_index_refreshes_incrementally(tmp_path: Path) -> None:
+    path = tmp_path / "alerts.json"
+    docs = [
+        {"id": "A1", "location": {"lat": 26.91, "lng": 75.78}},
+        {"id": "A2", "location": {"lat": 26.92, "lng": 75.79}},
+    ]
+    path.write_text(json.dumps(docs), encoding="utf-8")
+    store = JsonSpatialIndex(path)
+    assert store.refresh()
+    assert not store.refresh()
+    assert len(store.index) == 2
+
+    docs = [docs[0], {"id": "A3", "location": {"type": "Point", "coordinates": [75.80, 26.93]}}]
+    path.write_text(json.dumps(docs), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 5))
+    assert store.refresh()
+    assert sorted(store.index.ids()) == ["A1", "A3"]
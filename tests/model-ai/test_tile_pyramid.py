@@ -0,0 +1,62 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+projectRoot = Path(__file__).resolve().parents[2]
+modelAiRoot = projectRoot / "model-ai"
+if str(modelAiRoot) not in sys.path:
+    sys.path.insert(0, str(modelAiRoot))
+
+from model_ai.tile_pyramid import TilePyramid, lngLatToTileFraction
+
+
+def _randomPoints(count: int = 2000) -> tuple:
+    rng = np.random.default_rng(11)
+    lats = rng.uniform(26.80, 27.00, count)
+    lngs = rng.uniform(75.70, 75.90, count)
+    scores = rng.uniform(0.0, 1.0, count)
+    return lats, lngs, scores
+
+
+def _directTileTotals(lats: np.ndarray, lngs: np.ndarray, scores: np.ndarray, z: int) -> dict:
+    xFraction, yFraction = lngLatToTileFraction(lats, lngs)
+    tileX = (xFraction * 2 ** z).astype(int)
+    tileY = (yFraction * 2 ** z).astype(int)
+    totals: dict = {}
+    for x, y, score in zip(tileX, tileY, scores):
+        total = totals.setdefault((int(x), int(y)), [0.0, 0])
+        total[0] += score
+        total[1] += 1
+    return totals
+
+
+def test_derived_levels_match_direct_binning() -> None:
+    lats, lngs, scores = _randomPoints()
+    pyramid = TilePyramid.build(lats, lngs, scores, maxZoom=14, tileSize=16)
+    for z in (0, 6, 11, 14):
+        totals = _directTileTotals(lats, lngs, scores, z)
+        for (x, y), (expectedSum, expectedCount) in totals.items():
+            tile = pyramid.tile(z, x, y)
+            assert tile["count"] == expectedCount
+            assert tile["sum"] == pytest.approx(expectedSum)
+        assert sum(count for _, count in totals.values()) == len(lats)
+
+
+def test_tile_cells_cover_tile_and_empty_tiles() -> None:
+    lats, lngs, scores = _randomPoints(300)
+    pyramid = TilePyramid.build(lats, lngs, scores, maxZoom=12, tileSize=8)
+    xFraction, yFraction = lngLatToTileFraction(lats[:1], lngs[:1])
+    x, y = int(xFraction[0] * 2 ** 12), int(yFraction[0] * 2 ** 12)
+    tile = pyramid.tile(12, x, y)
+    assert tile["cells"]
+    for col, row, cellSum, count in tile["cells"]:
+        assert 0 <= col < 8 and 0 <= row < 8 and count > 0
+    assert tile["sum"] == pytest.approx(sum(cell[2] for cell in tile["cells"]))
+
+    assert pyramid.tile(12, 0, 0)["count"] == 0
+    with pytest.raises(ValueError):
+        pyramid.tile(13, 0, 0)
+    with pytest.raises(ValueError):
+        pyramid.tile(2, 4, 0)